@@ -1,116 +1,737 @@
-from fastapi import APIRouter, HTTPException, Query
+import asyncio
+import io
+import json
+import os
+import time
+from typing import Dict, List
+from fastapi import (
+    APIRouter, Depends, File, Header, HTTPException, Query, Request, Response, UploadFile, WebSocket, WebSocketDisconnect
+)
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from ..services.similarity_service import SimilarityService
-from ..utils.text_processor import parse_comma_separated_input
+from ..services.embedding_cache import EmbeddingCache, get_embedding_cache
+from ..services.synonym_index import get_synonym_index
+from ..services.batch_encoder import BatchingEncoder
+from ..services.scoring_executor import (
+    LANE_BATCH, LANE_INTERACTIVE, LANES, OUTCOMES, Schedule, ScoringExecutor, ServiceOverloadedError, lane_wait
+)
+from ..services.cancellation import ClientDisconnectedError, DeadlineExceededError
+from ..services.request_log import get_request_logger, comparison_event
+from ..services.response_format import FastJSONResponse, ResponseFormat, VIEWS, dumps
+from ..services.result_cache import ResultCache
+from ..services.answer_session import AnswerSession, get_answer_session_stats
+from ..services.prefork import is_primary_process
+from ..services.metrics import (
+    stage, stage_latency, request_latency, start_request_timings, format_server_timing, render_metric
+)
+from ..models.word_database import WordDatabase
+from ..models.card_registry import CardRegistry
+from ..models.auto_learner import AutoLearningSystem
+from ..models.word_import import IMPORT_FORMATS, WordImporter, guess_format, read_records
+from .. import config
+from ..utils.text_processor import get_morph_cache_stats
 
 router = APIRouter()
 
 # 전역 변수로 서비스들을 저장
 similarity_service = None
+encoder = None
+scoring_executor = None
+word_database = None
+result_cache = None
+card_registry = None
+auto_learner = None
 
 def init_services(model):
     """서비스들을 초기화합니다."""
-    global similarity_service
+    global similarity_service, encoder, scoring_executor, word_database, result_cache, card_registry, auto_learner
+    encoder = model
+    word_database = WordDatabase(model)
+    if config.WORD_DB_SNAPSHOT_DIR and os.path.exists(config.WORD_DB_SNAPSHOT_DIR):
+        word_database.load_snapshot(config.WORD_DB_SNAPSHOT_DIR)
+    scoring_executor = ScoringExecutor(
+        max_workers=config.SCORING_WORKERS,
+        max_in_flight=config.SCORING_MAX_IN_FLIGHT,
+        torch_threads=config.TORCH_THREADS,
+        batch_max_in_flight=config.SCORING_BATCH_MAX_IN_FLIGHT
+    )
+    # 학습한 단어와 사용 기록은 스냅샷을 저장하는 프로세스(0번 워커)에서만 모음 (다른 워커에서 배운 단어는 저장되지 않음)
+    if config.AUTO_LEARN_ENABLED and is_primary_process():
+        auto_learner = AutoLearningSystem(
+            word_database,
+            learning_threshold=config.AUTO_LEARN_THRESHOLD,
+            max_auto_words=config.AUTO_LEARN_MAX_WORDS,
+            eviction=config.AUTO_LEARN_EVICTION,
+            grace_seconds=config.AUTO_LEARN_GRACE_SECONDS,
+            batch_size=config.AUTO_LEARN_BATCH_SIZE,
+            queue_size=config.AUTO_LEARN_QUEUE_SIZE
+        )
+    card_registry = CardRegistry(model)
+    if config.CARDS_FILE and os.path.exists(config.CARDS_FILE):
+        card_registry.load_file(config.CARDS_FILE)
+    result_cache = ResultCache(max_entries=config.RESULT_CACHE_SIZE, ttl_seconds=config.RESULT_CACHE_TTL_SECONDS)
+    # 백그라운드 시작 중 들어온 요청이 준비 여부를 similarity_service로 판단하므로 마지막에 설정
     similarity_service = SimilarityService(model)
 
+def warmup_services(texts: List[str]):
+    """워밍업 말뭉치로 형태소 분석과 점수 계산 경로를 한 번씩 실행합니다."""
+    pairs = list(zip(texts, texts[1:] + texts[:1]))
+    similarity_service.analyze_batch(pairs)
+    similarity_service.analyze_with_comparisons(*pairs[0])
+
+def shutdown_services():
+    """서비스들이 사용하는 스레드를 정리합니다."""
+    if scoring_executor:
+        scoring_executor.shutdown()
+    if auto_learner:
+        auto_learner.close()
+    # prefork 워커들이 서로의 스냅샷을 덮어쓰지 않도록 한 프로세스(0번 워커)만 저장
+    if word_database and word_database.dirty and config.WORD_DB_SNAPSHOT_DIR and is_primary_process():
+        word_database.save_snapshot(config.WORD_DB_SNAPSHOT_DIR)
+
 class CompareRequest(BaseModel):
     meaning: str
     user_input: str
 
+class CompareBatchRequest(BaseModel):
+    items: List[CompareRequest]
+
+SCORING_MODE_FULL = "full"
+SCORING_MODE_TIERED = "tiered"
+
+def scoring_mode_param(
+    mode: str = Query(None, description="점수 계산 모드 (full/tiered), 없으면 설정값. tiered면 응답의 analysis.tier로 답한 단계를 반환")
+) -> str:
+    """점수 계산 모드 쿼리 파라미터를 읽습니다."""
+    mode = mode or config.SCORING_MODE
+    if mode not in (SCORING_MODE_FULL, SCORING_MODE_TIERED):
+        raise HTTPException(status_code=422, detail=f"mode는 {SCORING_MODE_FULL}, {SCORING_MODE_TIERED} 중 하나여야 합니다.")
+    return mode
+
+def schedule_params(default_lane: str):
+    """우선순위 레인과 마감 시간 헤더를 읽는 의존성을 만듭니다."""
+    def dependency(
+        priority: str = Header(None, alias="X-Priority", description=f"우선순위 레인 ({'/'.join(LANES)}), 없으면 {default_lane}"),
+        timeout_ms: float = Header(None, alias="X-Timeout-Ms", description="요청 마감 시간 (ms), 지나면 504")
+    ) -> Schedule:
+        lane = priority or default_lane
+        if lane not in LANES:
+            raise HTTPException(status_code=422, detail=f"X-Priority는 {', '.join(LANES)} 중 하나여야 합니다.")
+        if timeout_ms is None:
+            timeout_ms = config.INTERACTIVE_TIMEOUT_MS if lane == LANE_INTERACTIVE else config.BATCH_TIMEOUT_MS
+        return Schedule(lane, time.monotonic() + timeout_ms / 1000 if timeout_ms > 0 else None)
+    return dependency
+
+class CardRequest(BaseModel):
+    card_id: str
+    meaning: str
+
+class CardBulkRequest(BaseModel):
+    cards: List[CardRequest]
+
+class CompareByCardRequest(BaseModel):
+    card_id: str
+    user_input: str
+
+def response_format_params(
+    view: str = Query("full", description=f"응답 형식 ({'/'.join(VIEWS)}), 기본은 기존 형식"),
+    top_k: int = Query(None, description="개별 비교 결과를 유사도 상위 k개만 반환 (top_k 형식 기본 5)"),
+    fields: str = Query(None, description="포함할 분석 항목 (쉼표로 구분, comparisons가 없으면 비교 결과 생략)")
+) -> ResponseFormat:
+    """응답 형식 쿼리 파라미터를 읽습니다."""
+    try:
+        return ResponseFormat.parse(view, top_k, fields)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
 @router.post("/compare")
-async def compare_words(request: CompareRequest):
+async def compare_words(
+    request: CompareRequest,
+    http_request: Request,
+    response_format: ResponseFormat = Depends(response_format_params),
+    mode: str = Depends(scoring_mode_param),
+    schedule: Schedule = Depends(schedule_params(LANE_INTERACTIVE)),
+    stage_timings: bool = Header(False, alias="X-Stage-Timings", description="true면 단계별 처리 시간을 Server-Timing 헤더로 반환")
+):
     """단어 의미 비교 API - JSON 본문으로 데이터 받기"""
     if not similarity_service:
-        raise HTTPException(status_code=500, detail="서비스가 초기화되지 않았습니다.")
+        raise HTTPException(status_code=503, detail="서비스가 아직 준비되지 않았습니다.", headers={"Retry-After": "5"})
     
-    try:
-        # 의미 분석 수행
-        analysis_result = similarity_service.analyze_similarity_with_pos(request.meaning, request.user_input)
-        
-        if "error" in analysis_result:
-            return analysis_result
-        
-        # 개별 단어 비교 결과 추가
-        individual_comparisons = similarity_service.compare_individual_words(
-            analysis_result["meaning_words"], 
-            analysis_result["user_words"]
-        )
-        
-        # 유사도 점수 로그 출력
-        print(f"🔍 유사도 분석 결과:")
-        print(f"   입력: '{request.meaning}' vs '{request.user_input}'")
-        print(f"   총 점수: {analysis_result['total_score']:.3f}")
-        print(f"   의미 유사도: {analysis_result['semantic_similarity']:.3f}")
-        print(f"   품사 매칭: {analysis_result['pos_matching_score']:.3f}")
-        print(f"   동의어 점수: {analysis_result['synonym_score']:.3f}")
-        print(f"   키워드 점수: {analysis_result['keyword_score']:.3f}")
-        
-        # 개별 비교 결과 출력 (상위 3개)
-        print(f"   개별 비교 (상위 3개):")
-        for i, comp in enumerate(individual_comparisons[:3], 1):
-            match_type = "🎯 정확한 일치" if comp['is_exact_match'] else \
-                        "⭐ 높은 유사도" if comp['is_high_similarity'] else \
-                        "🔄 중간 유사도" if comp['is_medium_similarity'] else "📉 낮은 유사도"
-            print(f"     {i}. {comp['meaning_word']} ↔ {comp['user_word']}: {comp['similarity_score']:.3f} ({match_type})")
-        
-        print("-" * 60)
-        
-        return {
-            "success": True,
-            "analysis": analysis_result,
-            "individual_comparisons": individual_comparisons
-        }
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"분석 중 오류 발생: {str(e)}")
+    return await _compare_response(
+        "compare", http_request, request.meaning, request.user_input, response_format, stage_timings,
+        _compare(request.meaning, request.user_input, response_format, mode=mode, schedule=schedule)
+    )
 
 # 기존 쿼리 파라미터 방식도 유지 (하위 호환성)
 @router.post("/compare-query")
 async def compare_words_query(
+    http_request: Request,
     meaning: str = Query(..., description="의미 단어들 (쉼표로 구분)"),
-    user_input: str = Query(..., description="사용자 입력 단어들 (쉼표로 구분)")
+    user_input: str = Query(..., description="사용자 입력 단어들 (쉼표로 구분)"),
+    response_format: ResponseFormat = Depends(response_format_params),
+    mode: str = Depends(scoring_mode_param),
+    schedule: Schedule = Depends(schedule_params(LANE_INTERACTIVE)),
+    stage_timings: bool = Header(False, alias="X-Stage-Timings", description="true면 단계별 처리 시간을 Server-Timing 헤더로 반환")
 ):
     """단어 의미 비교 API - 쿼리 파라미터 방식 (하위 호환성)"""
     if not similarity_service:
-        raise HTTPException(status_code=500, detail="서비스가 초기화되지 않았습니다.")
+        raise HTTPException(status_code=503, detail="서비스가 아직 준비되지 않았습니다.", headers={"Retry-After": "5"})
     
+    return await _compare_response(
+        "compare-query", http_request, meaning, user_input, response_format, stage_timings,
+        _compare(meaning, user_input, response_format, mode=mode, schedule=schedule)
+    )
+
+@router.post("/compare-by-card")
+async def compare_by_card(
+    request: CompareByCardRequest,
+    http_request: Request,
+    response_format: ResponseFormat = Depends(response_format_params),
+    mode: str = Depends(scoring_mode_param),
+    schedule: Schedule = Depends(schedule_params(LANE_INTERACTIVE)),
+    stage_timings: bool = Header(False, alias="X-Stage-Timings", description="true면 단계별 처리 시간을 Server-Timing 헤더로 반환")
+):
+    """등록된 카드의 정답과 사용자 입력을 비교합니다. (카드 쪽 분석은 등록 시 미리 계산)"""
+    if not similarity_service:
+        raise HTTPException(status_code=503, detail="서비스가 아직 준비되지 않았습니다.", headers={"Retry-After": "5"})
+    
+    card = card_registry.get(request.card_id)
+    if card is None:
+        raise HTTPException(status_code=404, detail=f"등록되지 않은 카드입니다: {request.card_id}")
+    
+    user_input = EmbeddingCache.normalize_key(request.user_input)
+    if mode == SCORING_MODE_TIERED:
+        compute = lambda shared: scoring_executor.run(
+            similarity_service.analyze_card_tiered, card, user_input, response_format,
+            config.FAST_PATH_PASS_THRESHOLD, config.FAST_PATH_SYNONYM_SIMILARITY, schedule=shared
+        )
+    else:
+        compute = lambda shared: scoring_executor.run(
+            similarity_service.analyze_card, card, user_input, response_format, schedule=shared
+        )
+    # 결과는 같은 의미와 모드로 /compare를 호출한 것과 같으므로 결과 캐시 키를 공유
+    return await _compare_response(
+        "compare-by-card", http_request, card.meaning, request.user_input, response_format, stage_timings,
+        _compare(card.meaning, request.user_input, response_format, compute, mode=mode, schedule=schedule)
+    )
+
+async def _compare_response(endpoint: str, http_request: Request, meaning: str, user_input: str,
+                            response_format: ResponseFormat, stage_timings: bool, comparison) -> Response:
+    """비교 계산(comparison)을 기다려 응답을 만들고, 요청 로그와 자동 학습, 오류 응답을 엔드포인트 공통으로 처리합니다."""
+    started = time.perf_counter()
+    timings = start_request_timings(stage_timings)
     try:
-        # 의미 분석 수행
-        analysis_result = similarity_service.analyze_similarity_with_pos(meaning, user_input)
+        # 의미 분석 및 개별 단어 비교 수행 (이벤트 루프를 막지 않도록 전용 실행기에서)
+        analysis_result, comparisons = await _cancel_on_disconnect(http_request, comparison)
         
         if "error" in analysis_result:
-            return analysis_result
-        
-        # 개별 단어 비교 결과 추가
-        individual_comparisons = similarity_service.compare_individual_words(
-            analysis_result["meaning_words"], 
-            analysis_result["user_words"]
-        )
-        
-        # 유사도 점수 로그 출력
-        print(f"🔍 유사도 분석 결과 (쿼리 파라미터):")
-        print(f"   입력: '{meaning}' vs '{user_input}'")
-        print(f"   총 점수: {analysis_result['total_score']:.3f}")
-        print(f"   의미 유사도: {analysis_result['semantic_similarity']:.3f}")
-        print(f"   품사 매칭: {analysis_result['pos_matching_score']:.3f}")
-        print(f"   동의어 점수: {analysis_result['synonym_score']:.3f}")
-        print(f"   키워드 점수: {analysis_result['keyword_score']:.3f}")
+            _log_comparison(endpoint, meaning, user_input, started, analysis_result)
+            return _timed_response(analysis_result, timings)
         
-        # 개별 비교 결과 출력 (상위 3개)
-        print(f"   개별 비교 (상위 3개):")
-        for i, comp in enumerate(individual_comparisons[:3], 1):
-            match_type = "🎯 정확한 일치" if comp['is_exact_match'] else \
-                        "⭐ 높은 유사도" if comp['is_high_similarity'] else \
-                        "🔄 중간 유사도" if comp['is_medium_similarity'] else "📉 낮은 유사도"
-            print(f"     {i}. {comp['meaning_word']} ↔ {comp['user_word']}: {comp['similarity_score']:.3f} ({match_type})")
+        # 요청 로그 (샘플링하여 백그라운드에서 JSON 한 줄로 기록)
+        _log_comparison(endpoint, meaning, user_input, started, analysis_result,
+                        ResponseFormat.loggable_comparisons(comparisons))
+        _submit_learning(meaning, user_input, analysis_result)
         
-        print("-" * 60)
+        return _timed_response(response_format.format(analysis_result, comparisons), timings)
         
-        return {
-            "success": True,
-            "analysis": analysis_result,
-            "individual_comparisons": individual_comparisons
-        }
+    except (Exception, DeadlineExceededError, ClientDisconnectedError) as e:
+        return _error_response(endpoint, started, e, meaning, user_input)
+    finally:
+        request_latency.observe(endpoint, time.perf_counter() - started)
+
+def _error_response(endpoint: str, started: float, error: BaseException, meaning: str = None,
+                    user_input: str = None) -> Response:
+    """계산 중 발생한 예외를 기록하고 오류 응답으로 변환합니다. (과부하 503, 마감 504, 연결 끊김 499, 그 외 500)"""
+    headers = None
+    if isinstance(error, ServiceOverloadedError):
+        status, detail, headers = 503, str(error), {"Retry-After": "1"}
+    elif isinstance(error, DeadlineExceededError):
+        status, detail = 504, str(error)
+    elif isinstance(error, ClientDisconnectedError):
+        # 응답을 받을 클라이언트가 없으므로 기록만 남김
+        _log_error(endpoint, started, 499, str(error), meaning, user_input)
+        return Response(status_code=499)
+    else:
+        status, detail = 500, f"분석 중 오류 발생: {str(error)}"
+    _log_error(endpoint, started, status, str(error), meaning, user_input)
+    return FastJSONResponse(content={"detail": detail}, status_code=status, headers=headers)
+
+@router.post("/cards")
+async def register_cards(request: CardBulkRequest):
+    """카드(ID → 정답 의미)를 한 번에 등록합니다. 의미의 파싱, 형태소 분석, 임베딩을 미리 계산합니다."""
+    if not card_registry:
+        raise HTTPException(status_code=503, detail="서비스가 아직 준비되지 않았습니다.", headers={"Retry-After": "5"})
+    
+    if len(request.cards) > config.BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"한 번에 최대 {config.BATCH_MAX_ITEMS}개까지 등록할 수 있습니다.")
+    
+    items = [(card.card_id, card.meaning) for card in request.cards]
+    try:
+        cards = await scoring_executor.run(card_registry.register_many, items, schedule=Schedule(LANE_BATCH))
+    except ServiceOverloadedError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    return {"success": True, "registered": len(cards), "stats": card_registry.get_stats()}
+
+@router.get("/cards/{card_id}")
+async def get_card(card_id: str):
+    """등록된 카드의 미리 계산된 정보를 반환합니다."""
+    card = card_registry.get(card_id) if card_registry else None
+    if card is None:
+        raise HTTPException(status_code=404, detail=f"등록되지 않은 카드입니다: {card_id}")
+    return CardRegistry.describe(card)
+
+@router.delete("/cards/{card_id}")
+async def delete_card(card_id: str):
+    """등록된 카드를 삭제합니다."""
+    if not card_registry or not card_registry.remove(card_id):
+        raise HTTPException(status_code=404, detail=f"등록되지 않은 카드입니다: {card_id}")
+    return {"success": True}
+
+@router.websocket("/answer-session")
+async def answer_session(
+    websocket: WebSocket,
+    card_id: str = Query(None, description="등록된 카드 ID"),
+    meaning: str = Query(None, description="카드 대신 사용할 정답 의미 (세션 동안만 사용)"),
+    view: str = Query("full"),
+    top_k: int = Query(None),
+    fields: str = Query(None)
+):
+    """입력 중인 답을 실시간으로 채점하는 웹소켓 세션입니다.
+    
+    클라이언트는 {"user_input": ..., "seq": ...}를 보내고, 입력이 잠시 멈추면 가장 최근 입력의 결과를
+    {"type": "result", "seq": ..., ...}로 받습니다. 빠르게 연속으로 보낸 입력은 하나로 합쳐집니다.
+    """
+    await websocket.accept()
+    if not similarity_service:
+        await websocket.close(code=1013, reason="서비스가 아직 준비되지 않았습니다.")
+        return
+    
+    try:
+        response_format = ResponseFormat.parse(view, top_k, fields)
+        if card_id is not None:
+            card = card_registry.get(card_id)
+            if card is None:
+                raise ValueError(f"등록되지 않은 카드입니다: {card_id}")
+        elif meaning:
+            # 카드 쪽 파싱, 형태소 분석, 임베딩은 세션 시작 시 한 번만 계산
+            card = (await scoring_executor.run(card_registry.build_many, [("", meaning)]))[0]
+        else:
+            raise ValueError("card_id 또는 meaning이 필요합니다.")
+    except (ValueError, ServiceOverloadedError) as e:
+        await websocket.close(code=1008, reason=str(e))
+        return
+    
+    session = AnswerSession(similarity_service, scoring_executor, card, response_format,
+                            debounce_seconds=config.ANSWER_SESSION_DEBOUNCE_MS / 1000)
+    
+    async def receive_inputs():
+        try:
+            while True:
+                try:
+                    message = json.loads(await websocket.receive_text())
+                    user_input = message["user_input"]
+                    if not isinstance(user_input, str):
+                        raise TypeError
+                except (ValueError, KeyError, TypeError):
+                    await _send_json(websocket, {"type": "error", "error": "user_input 문자열이 필요합니다."})
+                    continue
+                session.submit(message.get("seq"), user_input)
+        except WebSocketDisconnect:
+            pass
+        finally:
+            session.close()
+    
+    receiver = asyncio.ensure_future(receive_inputs())
+    try:
+        await _send_json(websocket, {"type": "ready", "card": CardRegistry.describe(card)})
+        async for seq, user_input, analysis_result, comparisons, elapsed in session.results():
+            request_latency.observe("answer-session", elapsed)
+            if "error" in analysis_result:
+                await _send_json(websocket, {"type": "result", "seq": seq, "success": False, **analysis_result})
+                continue
+            
+            # 입력 중인 답이므로 자동 학습 후보로 넘기지 않음
+            _log_comparison("answer-session", card.meaning, user_input, time.perf_counter() - elapsed, analysis_result,
+                            ResponseFormat.loggable_comparisons(comparisons))
+            await _send_json(websocket, {"type": "result", "seq": seq, **response_format.format(analysis_result, comparisons)})
+    except WebSocketDisconnect:
+        pass
+    finally:
+        session.close()
+        receiver.cancel()
+
+@router.post("/compare-batch")
+async def compare_words_batch(
+    request: CompareBatchRequest,
+    response_format: ResponseFormat = Depends(response_format_params),
+    schedule: Schedule = Depends(schedule_params(LANE_BATCH))
+):
+    """여러 단어 쌍을 한 번에 비교하고 결과를 입력 순서대로 NDJSON으로 스트리밍합니다."""
+    if not similarity_service:
+        raise HTTPException(status_code=503, detail="서비스가 아직 준비되지 않았습니다.", headers={"Retry-After": "5"})
+    
+    if len(request.items) > config.BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"한 번에 최대 {config.BATCH_MAX_ITEMS}개까지 비교할 수 있습니다.")
+    
+    started = time.perf_counter()
+    pairs = [(item.meaning, item.user_input) for item in request.items]
+    chunk_size = config.BATCH_CHUNK_SIZE
+    chunks = [pairs[i:i + chunk_size] for i in range(0, len(pairs), chunk_size)]
+    
+    # 첫 청크는 응답 시작 전에 처리하여 과부하 시 503을 그대로 돌려줌
+    try:
+        first_results = await scoring_executor.run(
+            similarity_service.analyze_batch, chunks[0], response_format, schedule=schedule
+        ) if chunks else []
+    except (Exception, DeadlineExceededError) as e:
+        return _error_response("compare-batch", started, e)
+    
+    async def generate():
+        index = 0
+        errors = 0
+        for chunk_number, chunk in enumerate(chunks):
+            if chunk_number == 0:
+                results = first_results
+            else:
+                results = await _run_batch_chunk(chunk, response_format, schedule)
+            
+            for result in results:
+                errors += "error" in result[0]
+                yield _format_batch_line(index, result, response_format)
+                index += 1
         
+        request_latency.observe("compare-batch", time.perf_counter() - started)
+        get_request_logger().log({
+            "endpoint": "compare-batch",
+            "status": 200,
+            "latency_ms": (time.perf_counter() - started) * 1000,
+            "items": len(pairs),
+            "errors": errors
+        })
+    
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+async def _compare(meaning: str, user_input: str, response_format: ResponseFormat, compute=None,
+                   mode: str = SCORING_MODE_FULL, schedule: Schedule = Schedule()):
+    """단어 쌍을 비교합니다. 같은 입력의 결과는 결과 캐시에서, 동시에 들어온 같은 요청은 한 번만 계산합니다.
+    
+    compute는 실행 일정(Schedule)을 받아 계산하는 함수입니다. 없으면 mode에 맞는 분석을 실행기에서 실행합니다.
+    동시에 들어온 같은 요청은 처음 요청의 우선순위 레인으로 계산하고, 마감 시간은 요청마다 따로 적용합니다.
+    """
+    # 키와 분석이 같은 텍스트를 보도록 입력을 NFC·공백 정규화한 뒤 그대로 분석에 넘김
+    meaning, user_input = EmbeddingCache.normalize_key(meaning), EmbeddingCache.normalize_key(user_input)
+    # 모델/백엔드와 동의어 사전 버전이 바뀌면 다른 키
+    key = (
+        config.MODEL_NAME, config.ENCODER_BACKEND, get_synonym_index().version,
+        meaning, user_input, response_format.cache_key, mode
+    )
+    if compute is None and mode == SCORING_MODE_TIERED:
+        compute = lambda shared: scoring_executor.run(
+            similarity_service.analyze_tiered, meaning, user_input, response_format,
+            config.FAST_PATH_PASS_THRESHOLD, config.FAST_PATH_SYNONYM_SIMILARITY, schedule=shared
+        )
+    elif compute is None:
+        compute = lambda shared: scoring_executor.run(
+            similarity_service.analyze_with_comparisons, meaning, user_input, response_format, schedule=shared
+        )
+    # 공유하는 계산은 마감 없이 실행하고, 기다리는 요청이 모두 마감 시간으로 떠나면 결과 캐시가 계산을 취소
+    shared = Schedule(schedule.lane)
+    return await result_cache.get_or_compute(key, lambda: compute(shared), deadline=schedule.deadline)
+
+async def _cancel_on_disconnect(request: Request, awaitable):
+    """계산을 기다리는 동안 클라이언트가 연결을 끊으면 계산을 취소하고 ClientDisconnectedError를 발생시킵니다.
+    
+    대부분의 요청은 확인 주기 안에 끝나므로, 그보다 오래 걸리는 요청에만 연결 확인 태스크를 띄웁니다.
+    계산은 별도 태스크로 기다리고 그 태스크만 취소하므로, 요청을 처리하는 태스크의 취소 상태는 건드리지 않습니다.
+    """
+    task = asyncio.ensure_future(awaitable)
+    interval = config.DISCONNECT_POLL_MS / 1000
+    state = {"watcher": None, "disconnected": False}
+    
+    async def watch():
+        while not await request.is_disconnected():
+            await asyncio.sleep(interval)
+        state["disconnected"] = True
+        task.cancel()
+    
+    def start_watching():
+        state["watcher"] = asyncio.ensure_future(watch())
+    
+    timer = asyncio.get_running_loop().call_later(interval, start_watching)
+    try:
+        return await task
+    except asyncio.CancelledError:
+        if not state["disconnected"]:
+            raise
+        raise ClientDisconnectedError("클라이언트 연결이 끊겼습니다.") from None
+    finally:
+        timer.cancel()
+        if state["watcher"] is not None:
+            state["watcher"].cancel()
+
+async def _run_batch_chunk(chunk, response_format: ResponseFormat, schedule: Schedule):
+    """배치 청크를 실행합니다. 실패하면 청크의 모든 항목을 상태 코드가 담긴 오류 결과로 반환합니다."""
+    try:
+        return await _run_with_retry(similarity_service.analyze_batch, chunk, response_format, schedule=schedule)
+    except ServiceOverloadedError as e:
+        error = {"error": str(e), "status": 503}
+    except DeadlineExceededError as e:
+        error = {"error": str(e), "status": 504}
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"분석 중 오류 발생: {str(e)}") 
\ No newline at end of file
+        error = {"error": f"분석 중 오류 발생: {str(e)}", "status": 500}
+    return [(error, [])] * len(chunk)
+
+async def _run_with_retry(func, *args, schedule: Schedule):
+    """이미 응답을 스트리밍하는 중이라 503을 바로 돌려줄 수 없는 작업을 과부하가 풀릴 때까지 다시 시도합니다.
+    
+    정해진 횟수를 넘기거나 다음 시도 전에 마감 시간이 지나면 ServiceOverloadedError를 그대로 발생시킵니다.
+    """
+    interval = config.OVERLOAD_RETRY_INTERVAL_MS / 1000
+    for attempt in range(config.OVERLOAD_RETRY_LIMIT + 1):
+        try:
+            return await scoring_executor.run(func, *args, schedule=schedule)
+        except ServiceOverloadedError:
+            out_of_time = schedule.deadline is not None and time.monotonic() + interval >= schedule.deadline
+            if attempt == config.OVERLOAD_RETRY_LIMIT or out_of_time:
+                raise
+            await asyncio.sleep(interval)
+
+def _log_comparison(endpoint: str, meaning: str, user_input: str, started: float, analysis_result: Dict,
+                    individual_comparisons: List[Dict] = None):
+    """단어 비교 요청 한 건을 요청 로그에 남깁니다."""
+    latency_ms = (time.perf_counter() - started) * 1000
+    get_request_logger().log(comparison_event(
+        endpoint, meaning, user_input, analysis_result, individual_comparisons or [], latency_ms
+    ))
+
+def _submit_learning(meaning: str, user_input: str, analysis_result: Dict):
+    """자동 학습이 켜져 있으면 높은 점수의 답을 학습 후보로 넘깁니다. (백그라운드에서 처리)"""
+    if auto_learner:
+        auto_learner.submit(user_input, meaning, analysis_result["total_score"])
+
+def _log_error(endpoint: str, started: float, status: int, error: str, meaning: str = None, user_input: str = None):
+    """실패한 요청을 요청 로그에 남깁니다. (샘플링과 무관하게 기록)"""
+    event = {
+        "endpoint": endpoint,
+        "status": status,
+        "latency_ms": (time.perf_counter() - started) * 1000,
+        "error": error
+    }
+    if meaning is not None:
+        event["meaning"] = meaning
+        event["user_input"] = user_input
+    get_request_logger().log(event)
+
+def _timed_response(content: Dict, timings: Dict[str, float] = None) -> FastJSONResponse:
+    """응답을 직렬화하고, 단계 시간 기록이 켜져 있으면 Server-Timing 헤더를 붙입니다."""
+    with stage("serialize"):
+        response = FastJSONResponse(content=content)
+    if timings is not None:
+        response.headers["Server-Timing"] = format_server_timing(timings)
+    return response
+
+async def _send_json(websocket: WebSocket, content: Dict):
+    """웹소켓으로 JSON 텍스트 메시지를 보냅니다."""
+    with stage("serialize"):
+        text = dumps(content).decode("utf-8")
+    await websocket.send_text(text)
+
+def _format_batch_line(index: int, result, response_format: ResponseFormat) -> bytes:
+    """배치 결과 한 건을 NDJSON 한 줄로 변환합니다."""
+    analysis_result, comparisons = result
+    if "error" in analysis_result:
+        line = {"index": index, "success": False, **analysis_result}
+    else:
+        line = {"index": index, **response_format.format(analysis_result, comparisons)}
+    with stage("serialize"):
+        return dumps(line) + b"\n"
+
+@router.get("/stats")
+async def get_stats():
+    """캐시 등 성능 관련 통계를 반환합니다."""
+    stats = {
+        "embedding_cache": get_embedding_cache().get_stats(),
+        "synonyms": get_synonym_index().get_stats(),
+        "morph_cache": get_morph_cache_stats(),
+        "stages": stage_latency.get_stats(),
+        "requests": request_latency.get_stats(),
+        "request_log": get_request_logger().get_stats(),
+        "answer_sessions": get_answer_session_stats()
+    }
+    if isinstance(encoder, BatchingEncoder):
+        stats["encoder"] = encoder.get_stats()
+    if scoring_executor:
+        stats["scoring_executor"] = scoring_executor.get_stats()
+    if result_cache:
+        stats["result_cache"] = result_cache.get_stats()
+    if word_database:
+        stats["word_database"] = word_database.get_stats()
+    if card_registry:
+        stats["cards"] = card_registry.get_stats()
+    if auto_learner:
+        stats["auto_learning"] = auto_learner.get_stats()
+    return stats
+
+def render_metrics() -> str:
+    """성능 지표를 Prometheus 텍스트 형식으로 반환합니다. (프로세스별 값)"""
+    lines = stage_latency.render() + request_latency.render()
+    
+    cache_stats = get_embedding_cache().get_stats()
+    lines += render_metric("glasscard_embedding_cache_lookups_total", "counter", "임베딩 캐시 조회 수",
+                           {"memory": cache_stats["hits"], "disk": cache_stats["disk_hits"],
+                            "miss": cache_stats["misses"]}, label="result")
+    lines += render_metric("glasscard_embedding_cache_hit_ratio", "gauge", "임베딩 캐시 적중률",
+                           {"": cache_stats["hit_rate"]})
+    lines += render_metric("glasscard_embedding_cache_entries", "gauge", "임베딩 캐시 메모리 항목 수",
+                           {"": cache_stats["entries"]})
+    
+    morph_stats = get_morph_cache_stats()
+    lines += render_metric("glasscard_morph_cache_lookups_total", "counter", "형태소 분석 캐시 조회 수",
+                           {"hit": morph_stats["hits"], "miss": morph_stats["misses"]}, label="result")
+    lines += render_metric("glasscard_morph_cache_hit_ratio", "gauge", "형태소 분석 캐시 적중률",
+                           {"": morph_stats["hit_rate"]})
+    
+    if isinstance(encoder, BatchingEncoder):
+        encoder_stats = encoder.get_stats()
+        lines += [
+            "# HELP glasscard_encoder_batch_size 인코더 배치당 문장 수",
+            "# TYPE glasscard_encoder_batch_size histogram"
+        ]
+        cumulative = 0
+        for bound, count in encoder_stats["batch_size_histogram"].items():
+            cumulative += count
+            lines.append(f'glasscard_encoder_batch_size_bucket{{le="{bound}"}} {cumulative}')
+        lines.append(f"glasscard_encoder_batch_size_sum {encoder_stats['sentences']}")
+        lines.append(f"glasscard_encoder_batch_size_count {encoder_stats['batches']}")
+        lines += render_metric("glasscard_encoder_queue_depth", "gauge", "인코더 대기열 길이",
+                               {"": encoder_stats["queue_depth"]})
+    
+    if scoring_executor:
+        executor_stats = scoring_executor.get_stats()
+        lines += render_metric("glasscard_in_flight_requests", "gauge", "처리 중인 요청 수",
+                               {"": executor_stats["in_flight"]})
+        lines += render_metric("glasscard_scoring_tasks_total", "counter", "점수 계산 작업 수",
+                               {outcome: executor_stats[outcome] for outcome in OUTCOMES}, label="result")
+        lanes = executor_stats["lanes"]
+        lines += render_metric("glasscard_scheduler_queue_depth", "gauge", "우선순위 레인별 대기열 길이",
+                               {lane: stats["queue_depth"] for lane, stats in lanes.items()}, label="lane")
+        for reason in ("rejected", "expired", "cancelled"):
+            lines += render_metric(f"glasscard_scheduler_{reason}_total", "counter", f"우선순위 레인별 버린 작업 수 ({reason})",
+                                   {lane: stats[reason] for lane, stats in lanes.items()}, label="lane")
+        lines += lane_wait.render()
+    
+    if result_cache:
+        result_stats = result_cache.get_stats()
+        lines += render_metric("glasscard_result_cache_lookups_total", "counter", "비교 결과 캐시 조회 수",
+                               {"hit": result_stats["hits"], "coalesced": result_stats["coalesced"],
+                                "miss": result_stats["misses"]}, label="result")
+        lines += render_metric("glasscard_result_cache_hit_ratio", "gauge", "비교 결과 캐시 적중률 (동시 요청 합류 포함)",
+                               {"": result_stats["hit_rate"]})
+        lines += render_metric("glasscard_result_cache_entries", "gauge", "비교 결과 캐시 항목 수",
+                               {"": result_stats["entries"]})
+    
+    log_stats = get_request_logger().get_stats()
+    lines += render_metric("glasscard_request_log_events_total", "counter", "요청 로그 이벤트 수",
+                           {"logged": log_stats["logged"], "sampled_out": log_stats["sampled_out"],
+                            "dropped": log_stats["dropped"]}, label="result")
+    
+    if auto_learner:
+        learning_stats = auto_learner.get_stats()
+        lines += render_metric("glasscard_auto_learning_total", "counter", "자동 학습 후보 처리 수",
+                               {"learned": learning_stats["learned"], "duplicate": learning_stats["duplicates"],
+                                "evicted": learning_stats["evicted"], "dropped": learning_stats["dropped"]},
+                               label="result")
+        lines += render_metric("glasscard_auto_learning_words", "gauge", "자동 학습한 단어 수",
+                               {"": learning_stats["learned_words"]})
+    
+    if card_registry:
+        lines += render_metric("glasscard_cards", "gauge", "등록된 카드 수", {"": len(card_registry.cards)})
+    
+    if word_database:
+        lines += render_metric("glasscard_word_database_words", "gauge", "단어장 단어 수",
+                               {"": len(word_database.words)})
+    
+    return "\n".join(lines) + "\n"
+
+@router.get("/synonyms/{word}")
+async def get_synonyms(word: str):
+    """단어의 동의어 목록을 반환합니다."""
+    return {"word": word, "synonyms": get_synonym_index().get_synonyms(word)}
+
+@router.post("/synonyms/reload")
+async def reload_synonyms():
+    """동의어 사전 파일을 다시 읽습니다."""
+    synonym_index = get_synonym_index()
+    if not synonym_index.reload():
+        raise HTTPException(status_code=500, detail="동의어 사전을 다시 읽지 못했습니다.")
+    if result_cache:
+        result_cache.clear()  # 이전 버전 키의 결과는 더 이상 쓰이지 않음
+    return {"success": True, "stats": synonym_index.get_stats()}
+
+@router.post("/word-database/snapshot")
+async def save_word_database_snapshot():
+    """단어장 스냅샷을 저장합니다."""
+    if not word_database:
+        raise HTTPException(status_code=503, detail="서비스가 아직 준비되지 않았습니다.", headers={"Retry-After": "5"})
+    if not config.WORD_DB_SNAPSHOT_DIR:
+        raise HTTPException(status_code=400, detail="스냅샷 경로(GLASSCARD_WORD_DB_SNAPSHOT_DIR)가 설정되지 않았습니다.")
+    # 다른 워커의 단어장은 일부만 담고 있으므로 공유 스냅샷을 덮어쓰지 않음
+    _require_word_db_writer()
+    
+    await scoring_executor.run(word_database.save_snapshot, config.WORD_DB_SNAPSHOT_DIR, schedule=Schedule(LANE_BATCH))
+    return {"success": True, "stats": word_database.get_stats()}
+
+@router.post("/word-database/import")
+async def import_word_database(
+    file: UploadFile = File(..., description="CSV(word, meaning, pos, keywords 열) 또는 JSON Lines 파일"),
+    file_format: str = Query(None, alias="format", description=f"파일 형식 ({'/'.join(IMPORT_FORMATS)}), 없으면 확장자로 판단"),
+    chunk_size: int = Query(512, ge=1, le=10000, description="한 번에 인코딩하여 추가할 단어 수")
+):
+    """단어 파일을 청크 단위로 읽어 단어장에 추가하고 청크마다 진행 상황을 NDJSON으로 스트리밍합니다."""
+    if not word_database:
+        raise HTTPException(status_code=503, detail="서비스가 아직 준비되지 않았습니다.", headers={"Retry-After": "5"})
+    _require_word_db_writer()
+    
+    file_format = file_format or guess_format(file.filename)
+    if file_format not in IMPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"파일 형식을 지정해주세요: {', '.join(IMPORT_FORMATS)}")
+    
+    # 업로드 파일은 디스크에 임시 저장되어 있으므로 한 줄씩 읽으면 메모리 사용량이 일정
+    stream = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    importer = WordImporter(word_database, read_records(stream, file_format), chunk_size)
+    
+    async def generate():
+        try:
+            while True:
+                progress = await _run_import_step(importer)
+                if progress is None:
+                    break
+                yield dumps(progress) + b"\n"
+            yield dumps({**importer.progress(), "success": True, "stats": word_database.get_stats()}) + b"\n"
+        except ServiceOverloadedError as e:
+            yield dumps({**importer.progress(), "success": False, "status": 503, "error": str(e)}) + b"\n"
+        except Exception as e:
+            yield dumps({**importer.progress(), "success": False, "status": 500, "error": f"가져오기 중 오류 발생: {str(e)}"}) + b"\n"
+        finally:
+            stream.detach()
+    
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+def _require_word_db_writer():
+    """단어장을 변경하거나 저장하는 프로세스(단일 프로세스 또는 0번 워커)가 아니면 503으로 거절합니다.
+    
+    prefork 워커는 단어장을 각자 따로 가지므로, 다른 워커에서 바꾼 내용은 저장되지 않고 사라집니다.
+    같은 포트의 요청은 워커들에 나뉘어 들어가므로 다시 시도하면 0번 워커가 받을 수 있습니다.
+    """
+    if not is_primary_process():
+        raise HTTPException(
+            status_code=503,
+            detail="prefork 모드에서는 0번 워커만 단어장을 변경하거나 저장할 수 있습니다. 다시 시도해주세요.",
+            headers={"Retry-After": "1"}
+        )
+
+async def _run_import_step(importer: WordImporter):
+    """가져오기 청크 하나를 실행기에서 처리합니다. 과부하면 잠시 기다렸다가 정해진 횟수까지 다시 시도합니다."""
+    return await _run_with_retry(importer.step, schedule=Schedule(LANE_BATCH))
@@ -0,0 +1,110 @@
+import os
+from dotenv import load_dotenv
+
+# .env 파일이 있으면 환경 변수로 불러오기
+load_dotenv()
+
+def _get_int(name: str, default: int) -> int:
+    """정수형 환경 변수를 읽습니다."""
+    value = os.getenv(name)
+    return int(value) if value else default
+
+def _get_bool(name: str, default: bool) -> bool:
+    """불리언 환경 변수를 읽습니다. (1/true/yes/on)"""
+    value = os.getenv(name)
+    return value.strip().lower() in ("1", "true", "yes", "on") if value else default
+
+def _get_float(name: str, default: float) -> float:
+    """실수형 환경 변수를 읽습니다."""
+    value = os.getenv(name)
+    return float(value) if value else default
+
+# 모델 설정
+MODEL_NAME = os.getenv("GLASSCARD_MODEL_NAME", "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2")
+
+# 인코더 백엔드 (torch: fp32, torch-int8: 동적 int8 양자화, onnx: onnxruntime 설치 시)
+ENCODER_BACKEND = os.getenv("GLASSCARD_ENCODER_BACKEND", "torch")
+ONNX_CACHE_DIR = os.getenv("GLASSCARD_ONNX_CACHE_DIR", os.path.expanduser("~/.cache/glasscard/onnx"))
+
+# 임베딩 캐시 설정
+EMBEDDING_CACHE_MAX_MB = _get_float("GLASSCARD_EMBEDDING_CACHE_MAX_MB", 64.0)
+EMBEDDING_CACHE_DIR = os.getenv("GLASSCARD_EMBEDDING_CACHE_DIR") or None
+EMBEDDING_CACHE_DISK_MAX_ENTRIES = _get_int("GLASSCARD_EMBEDDING_CACHE_DISK_MAX_ENTRIES", 200000)
+
+# 요청 간 동적 마이크로 배치 설정
+ENCODER_MAX_BATCH_SIZE = _get_int("GLASSCARD_ENCODER_MAX_BATCH_SIZE", 64)
+ENCODER_MAX_WAIT_MS = _get_float("GLASSCARD_ENCODER_MAX_WAIT_MS", 5.0)
+
+# 점수 계산 실행기 설정
+SCORING_WORKERS = _get_int("GLASSCARD_SCORING_WORKERS", 4)
+SCORING_MAX_IN_FLIGHT = _get_int("GLASSCARD_SCORING_MAX_IN_FLIGHT", 64)
+TORCH_THREADS = _get_int("GLASSCARD_TORCH_THREADS", 0)  # 0이면 torch 기본값 사용
+
+# 스케줄러 설정 (interactive 레인이 batch 레인보다 먼저 실행, 마감 시간이 지났거나 연결이 끊긴 요청의 작업은 버림)
+SCORING_BATCH_MAX_IN_FLIGHT = _get_int("GLASSCARD_SCORING_BATCH_MAX_IN_FLIGHT", 32)  # 나머지는 interactive용으로 남김
+INTERACTIVE_TIMEOUT_MS = _get_float("GLASSCARD_INTERACTIVE_TIMEOUT_MS", 0.0)  # X-Timeout-Ms가 없을 때 마감 시간, 0이면 없음
+BATCH_TIMEOUT_MS = _get_float("GLASSCARD_BATCH_TIMEOUT_MS", 0.0)
+DISCONNECT_POLL_MS = _get_float("GLASSCARD_DISCONNECT_POLL_MS", 50.0)  # 계산을 기다리는 동안 연결 끊김 확인 주기
+OVERLOAD_RETRY_LIMIT = _get_int("GLASSCARD_OVERLOAD_RETRY_LIMIT", 40)  # 스트리밍 도중 과부하일 때 다시 시도하는 최대 횟수
+OVERLOAD_RETRY_INTERVAL_MS = _get_float("GLASSCARD_OVERLOAD_RETRY_INTERVAL_MS", 50.0)
+
+# 점수 계산 모드 (full: 항상 전체 계산, tiered: 정확 일치 → 동의어 → 캐시된 임베딩 순으로 확인 후 필요할 때만 모델 호출)
+SCORING_MODE = os.getenv("GLASSCARD_SCORING_MODE", "full")
+FAST_PATH_PASS_THRESHOLD = _get_float("GLASSCARD_FAST_PATH_PASS_THRESHOLD", 0.7)  # 동의어 단계가 답하는 최소 총점
+# 동의어 쌍에 가정하는 의미 유사도, 0이면 동의어 단계를 끔 (근사이므로 검증 보고서로 전체 계산과의 차이를 확인한 값으로만 켬)
+FAST_PATH_SYNONYM_SIMILARITY = _get_float("GLASSCARD_FAST_PATH_SYNONYM_SIMILARITY", 0.0)
+
+# 실시간 채점 웹소켓 세션 설정 (입력이 이 시간 동안 멈추면 가장 최근 입력만 계산)
+ANSWER_SESSION_DEBOUNCE_MS = _get_float("GLASSCARD_ANSWER_SESSION_DEBOUNCE_MS", 150.0)
+
+# 배치 비교 설정
+BATCH_MAX_ITEMS = _get_int("GLASSCARD_BATCH_MAX_ITEMS", 1000)
+BATCH_CHUNK_SIZE = _get_int("GLASSCARD_BATCH_CHUNK_SIZE", 32)
+
+# 단어장 임베딩 인덱스 설정 (exact: 정확 검색, ivf: 근사 검색)
+WORD_INDEX_BACKEND = os.getenv("GLASSCARD_WORD_INDEX_BACKEND", "exact")
+WORD_INDEX_N_LISTS = _get_int("GLASSCARD_WORD_INDEX_N_LISTS", 0)  # 0이면 4*sqrt(N)
+WORD_INDEX_N_PROBE = _get_int("GLASSCARD_WORD_INDEX_N_PROBE", 8)
+WORD_INDEX_MIN_TRAIN_SIZE = _get_int("GLASSCARD_WORD_INDEX_MIN_TRAIN_SIZE", 10000)
+
+# 단어장 스냅샷 경로 (설정하면 시작 시 복원, 종료 시 변경분 저장)
+WORD_DB_SNAPSHOT_DIR = os.getenv("GLASSCARD_WORD_DB_SNAPSHOT_DIR") or None
+
+# 동의어 사전 설정 (파일이 바뀌면 주기적으로 다시 읽음, 0이면 자동 갱신 안 함)
+SYNONYM_FILE = os.getenv("GLASSCARD_SYNONYM_FILE",
+                         os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "synonyms.json"))
+SYNONYM_RELOAD_INTERVAL = _get_float("GLASSCARD_SYNONYM_RELOAD_INTERVAL", 5.0)
+
+# 자동 학습 설정 (높은 점수의 답을 백그라운드에서 단어장에 추가, 한도를 넘으면 lfu/lru로 내보냄)
+AUTO_LEARN_ENABLED = _get_bool("GLASSCARD_AUTO_LEARN_ENABLED", False)
+AUTO_LEARN_THRESHOLD = _get_float("GLASSCARD_AUTO_LEARN_THRESHOLD", 0.7)
+AUTO_LEARN_MAX_WORDS = _get_int("GLASSCARD_AUTO_LEARN_MAX_WORDS", 1000)
+AUTO_LEARN_EVICTION = os.getenv("GLASSCARD_AUTO_LEARN_EVICTION", "lfu")
+AUTO_LEARN_GRACE_SECONDS = _get_float("GLASSCARD_AUTO_LEARN_GRACE_SECONDS", 3600.0)  # 이 시간 안에 학습했거나 쓴 단어는 나중에 내보냄
+AUTO_LEARN_BATCH_SIZE = _get_int("GLASSCARD_AUTO_LEARN_BATCH_SIZE", 64)
+AUTO_LEARN_QUEUE_SIZE = _get_int("GLASSCARD_AUTO_LEARN_QUEUE_SIZE", 10000)  # 가득 차면 기다리지 않고 버림
+
+# 시작 시 등록할 카드 파일 (JSON Lines: {"card_id": ..., "meaning": ...}, 빈 값이면 생략)
+CARDS_FILE = os.getenv("GLASSCARD_CARDS_FILE") or None
+
+# 형태소 분석 캐시 크기 (텍스트 수)
+MORPH_CACHE_SIZE = _get_int("GLASSCARD_MORPH_CACHE_SIZE", 10000)
+
+# 비교 결과 캐시 설정 (같은 입력 쌍의 완성된 결과 재사용, 0이면 끔)
+RESULT_CACHE_SIZE = _get_int("GLASSCARD_RESULT_CACHE_SIZE", 10000)
+RESULT_CACHE_TTL_SECONDS = _get_float("GLASSCARD_RESULT_CACHE_TTL_SECONDS", 300.0)
+
+# 시작 시 워밍업 말뭉치 (한 줄에 텍스트 하나, 빈 값이면 워밍업 생략)
+WARMUP_FILE = os.getenv("GLASSCARD_WARMUP_FILE",
+                        os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "warmup.txt"))
+
+# 멀티 프로세스(prefork) 서빙 설정 (WORKERS > 1이면 fork 전에 모델을 한 번 로드해 워커들이 공유)
+WORKERS = _get_int("GLASSCARD_WORKERS", 1)
+WORKER_THREADS = _get_int("GLASSCARD_WORKER_THREADS", 0)  # 워커당 torch/BLAS 스레드 수, 0이면 코어 수 / 워커 수
+CPU_PINNING = _get_bool("GLASSCARD_CPU_PINNING", False)  # 워커별로 겹치지 않는 코어에 고정
+
+# 요청 로그 설정 (오류와 낮은 점수는 항상, 나머지는 샘플링 비율만큼 JSON 한 줄로 기록)
+LOG_SAMPLE_RATE = _get_float("GLASSCARD_LOG_SAMPLE_RATE", 0.01)
+LOG_LOW_SCORE_THRESHOLD = _get_float("GLASSCARD_LOG_LOW_SCORE_THRESHOLD", 0.3)
+LOG_QUEUE_SIZE = _get_int("GLASSCARD_LOG_QUEUE_SIZE", 10000)  # 가득 차면 기다리지 않고 버림
+LOG_VERBOSE = _get_bool("GLASSCARD_LOG_VERBOSE", False)  # 모든 요청을 읽기 쉬운 형식으로 출력 (로컬 디버깅용)
@@ -1,30 +1,189 @@
-from typing import List
+import heapq
+import queue
+import threading
+import time
+from typing import Dict, List
 from .word_database import WordDatabase
 
+EVICTION_POLICIES = ("lfu", "lru")
+
 class AutoLearningSystem:
-    def __init__(self, word_db: WordDatabase):
+    """높은 점수의 답을 단어장에 자동으로 학습하는 시스템
+    
+    요청 경로에서는 후보를 크기가 정해진 큐에 넣기만 하고, 백그라운드 스레드가 후보를 모아
+    정확히 일치하는 단어 인덱스 → 임베딩 유사도 순으로 중복을 확인한 뒤 한 번에 추가합니다.
+    학습한 단어 수가 max_auto_words를 넘으면 적중 횟수(lfu) 또는 마지막 사용 시각(lru) 기준으로
+    자동 학습한 단어만 내보냅니다. (가져오기로 넣은 단어는 내보내지 않음)
+    grace_seconds 안에 학습했거나 사용한 단어는 다른 단어를 모두 내보낸 뒤에만 내보내므로,
+    적중 횟수가 0인 방금 학습한 단어가 lfu에서 먼저 밀려나지 않습니다.
+    자동 학습 여부와 사용 기록은 단어장에 저장되므로 스냅샷에서 복원한 뒤에도 유지됩니다.
+    """
+    
+    def __init__(self, word_db: WordDatabase, learning_threshold: float = 0.7, max_auto_words: int = 1000,
+                 eviction: str = "lfu", batch_size: int = 64, queue_size: int = 10000,
+                 flush_interval: float = 1.0, grace_seconds: float = 3600.0, start: bool = True):
+        if eviction not in EVICTION_POLICIES:
+            raise ValueError(f"eviction은 {', '.join(EVICTION_POLICIES)} 중 하나여야 합니다.")
         self.word_db = word_db
-        self.learning_threshold = 0.7  # 학습 임계값
-        self.max_auto_words = 1000  # 최대 자동 학습 단어 수
+        self.learning_threshold = learning_threshold  # 학습 임계값
+        self.max_auto_words = max_auto_words  # 자동 학습 단어 수 한도 (넘으면 내보냄)
+        self.duplicate_threshold = 0.9  # 이 이상 유사한 단어가 있으면 학습하지 않음
+        self.eviction = eviction
+        self.grace_seconds = grace_seconds  # 학습하거나 사용한 뒤 이 시간 동안은 내보내기 뒤순위
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._pending = set()  # 대기 중인 (단어, 의미)
+        self._lock = threading.Lock()
         
+        self.submitted = 0
+        self.dropped = 0
+        self.learned = 0
+        self.duplicates = 0
+        self.evicted = 0
+        
+        self._worker = None
+        if start:
+            self._worker = threading.Thread(target=self._run, name="auto-learner", daemon=True)
+            self._worker.start()
+    
+    def submit(self, user_input: str, meaning: str, score: float, pos: str = None,
+               keywords: List[str] = None) -> bool:
+        """학습 후보를 대기열에 넣습니다. (막히지 않음, 임계값 미만이거나 이미 대기 중이면 무시)"""
+        if score <= self.learning_threshold:
+            return False
+        key = (user_input.strip(), meaning.strip())
+        if not key[0] or not key[1]:
+            return False
+        
+        with self._lock:
+            if key in self._pending:
+                return False
+            self._pending.add(key)
+            self.submitted += 1
+        try:
+            self._queue.put_nowait({"word": key[0], "meaning": key[1], "pos": pos, "keywords": keywords or []})
+            return True
+        except queue.Full:
+            with self._lock:
+                self._pending.discard(key)
+                self.dropped += 1
+            return False
+    
     def should_learn_word(self, user_input: str, meaning: str, score: float) -> bool:
         """단어를 자동 학습할지 결정합니다."""
-        # 이미 데이터베이스에 있는지 확인
-        existing_words = self.word_db.find_best_match(user_input, [user_input], top_k=1)
-        if existing_words and existing_words[0]["total_score"] > 0.9:
+        if score <= self.learning_threshold:
             return False
-        
-        # 점수가 임계값을 넘고, 데이터베이스 크기가 제한을 넘지 않았는지 확인
-        return (score > self.learning_threshold and 
-                len(self.word_db.words) < self.max_auto_words)
+        return self._is_new(user_input, meaning)
     
     def auto_learn_word(self, user_input: str, meaning: str, pos: str = None, keywords: List[str] = None) -> bool:
-        """단어를 자동으로 학습합니다."""
+        """단어를 바로 학습합니다. (한도를 넘으면 오래되거나 적게 쓰인 학습 단어를 내보냄)"""
         try:
-            # 단어 추가
-            word_id = self.word_db.add_word(user_input, meaning, pos, keywords)
-            print(f"자동 학습: '{user_input}' -> '{meaning}' (ID: {word_id})")
-            return True
+            return self.learn_batch([{"word": user_input, "meaning": meaning, "pos": pos, "keywords": keywords or []}]) > 0
         except Exception as e:
             print(f"자동 학습 실패: {e}")
-            return False 
\ No newline at end of file
+            return False
+    
+    def learn_batch(self, candidates: List[Dict]) -> int:
+        """후보들의 중복을 확인하고 새 단어만 한 번에 추가합니다. 추가한 단어 수를 반환합니다."""
+        # 정확히 일치하는 단어가 없는 후보만 한 번에 인코딩해 두면 유사도 확인은 캐시 적중
+        unknown = [entry["word"] for entry in candidates if entry["word"] not in self.word_db.word_to_ids]
+        if unknown and self.word_db.words:
+            self.word_db.embedding_cache.encode(self.word_db.model, unknown)
+        
+        new_entries = [entry for entry in candidates if self._is_new(entry["word"], entry["meaning"])]
+        word_ids = self.word_db.add_words(new_entries, auto_learned=True)["word_ids"] if new_entries else []
+        
+        with self._lock:
+            self.learned += len(word_ids)
+            self.duplicates += len(candidates) - len(word_ids)
+        self._evict()
+        return len(word_ids)
+    
+    def _is_new(self, user_input: str, meaning: str) -> bool:
+        """단어장에 없는 단어인지 확인합니다. 이미 있으면 해당 학습 단어의 적중으로 기록합니다."""
+        # 정확히 같은 단어는 인덱스에서 바로 확인 (모델 호출 없음)
+        word_ids = self.word_db.word_to_ids.get(user_input)
+        if word_ids:
+            self.record_hits(word_ids)
+            return False
+        
+        # 의미가 거의 같은 단어 확인 (임베딩 검색)
+        existing_words = self.word_db.find_best_match(user_input, [user_input], top_k=1)
+        if existing_words and existing_words[0]["total_score"] > self.duplicate_threshold:
+            self.record_hits([existing_words[0]["word_id"]])
+            return False
+        return True
+    
+    def record_hits(self, word_ids: List[int]):
+        """학습한 단어의 사용을 기록합니다. (내보낼 단어를 고르는 기준)"""
+        self.word_db.record_usage(word_ids)
+    
+    def _evict(self):
+        """학습 단어가 한도를 넘으면 정책에 따라 내보냅니다."""
+        with self._lock:
+            usage = self.word_db.auto_learned_usage()
+            excess = len(usage) - self.max_auto_words
+            if excess <= 0:
+                return
+            if self.eviction == "lfu":
+                # 유예 기간 안의 단어는 적중 횟수와 무관하게 뒤로 (마지막 사용 시각은 학습 시각으로 시작)
+                recent = time.time() - self.grace_seconds
+                victims = heapq.nsmallest(
+                    excess, usage, key=lambda word_id: (usage[word_id][1] >= recent,) + usage[word_id]
+                )
+            else:
+                victims = heapq.nsmallest(excess, usage, key=lambda word_id: usage[word_id][1])
+            for word_id in victims:
+                self.word_db.remove_word(word_id)
+            self.evicted += len(victims)
+    
+    def _run(self):
+        """대기열의 후보를 batch_size개 또는 flush_interval마다 모아 학습합니다."""
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while None not in batch and len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            
+            stop = None in batch
+            candidates = [entry for entry in batch if entry is not None]
+            if candidates:
+                try:
+                    self.learn_batch(candidates)
+                except Exception as e:
+                    print(f"자동 학습 실패: {e}")
+                with self._lock:
+                    for entry in candidates:
+                        self._pending.discard((entry["word"], entry["meaning"]))
+            if stop:
+                return
+    
+    def close(self):
+        """남은 후보를 학습하고 백그라운드 스레드를 종료합니다."""
+        if self._worker is not None:
+            self._queue.put(None)
+            self._worker.join(timeout=10)
+    
+    def get_stats(self) -> Dict:
+        """자동 학습 통계를 반환합니다."""
+        with self._lock:
+            return {
+                "learning_threshold": self.learning_threshold,
+                "max_auto_words": self.max_auto_words,
+                "eviction": self.eviction,
+                "learned_words": len(self.word_db.auto_learned),
+                "queue_depth": self._queue.qsize(),
+                "submitted": self.submitted,
+                "dropped": self.dropped,
+                "learned": self.learned,
+                "duplicates": self.duplicates,
+                "evicted": self.evicted
+            }
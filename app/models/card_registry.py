@@ -0,0 +1,130 @@
+import json
+import threading
+from typing import Dict, List, NamedTuple, Optional, Tuple
+import numpy as np
+from ..services.encoder_backends import EncoderBackend
+from ..services.embedding_cache import EmbeddingCache, get_embedding_cache
+from ..services.metrics import stage
+from ..services.cancellation import checkpoint
+from ..utils.text_processor import parse_input, analyze_morphs_batch, keywords_from_morphs
+
+class Card(NamedTuple):
+    """등록된 카드의 정답(의미)과 미리 계산한 분석 결과"""
+    card_id: str
+    meaning: str
+    words: List[str]
+    pos_info: Dict[str, List[str]]
+    morphs: Tuple[Tuple[str, str], ...]
+    keywords: List[str]
+    embeddings: np.ndarray  # (단어 수, 차원), words와 같은 순서의 정규화된 벡터
+
+class CardRegistry:
+    """카드 ID → 정답(의미)을 등록해 두고, 의미 쪽 파싱/형태소 분석/임베딩을 미리 계산해 두는 저장소
+
+    카드로 비교하면 요청마다 사용자 입력만 처리하면 됩니다.
+    프로세스 메모리에만 저장하므로 prefork 워커마다 따로 유지됩니다. (CARDS_FILE로 시작 시 등록)
+    """
+
+    def __init__(self, model: EncoderBackend, embedding_cache: EmbeddingCache = None):
+        self.model = model
+        self.embedding_cache = embedding_cache or get_embedding_cache()
+        self.cards = {}  # {card_id: Card}
+        self._lock = threading.Lock()
+
+    def register_many(self, items: List[Tuple[str, str]]) -> List[Card]:
+        """(카드 ID, 의미) 목록을 한 번에 등록합니다. 이미 있는 ID는 새 의미로 바꿉니다."""
+        cards = self.build_many(items)
+        with self._lock:
+            for card in cards:
+                self.cards[card.card_id] = card
+        return cards
+
+    def build_many(self, items: List[Tuple[str, str]]) -> List[Card]:
+        """(카드 ID, 의미) 목록의 카드를 저장하지 않고 만듭니다.
+
+        형태소 분석은 한 번의 JVM 호출로, 임베딩은 전체 고유 단어를 한 번의 배치 인코딩으로 계산합니다.
+        """
+        if not items:
+            return []
+
+        # /compare와 결과 캐시 키를 공유하므로 의미를 키와 같은 정규화(NFC·공백)를 거친 텍스트로 분석
+        items = [(card_id, EmbeddingCache.normalize_key(meaning)) for card_id, meaning in items]
+        with stage("parse"):
+            parsed_list = [parse_input(meaning) for _, meaning in items]
+        checkpoint()
+        with stage("morph"):
+            morphs_list = analyze_morphs_batch([meaning for _, meaning in items])
+
+        unique_words = list(dict.fromkeys(word for parsed in parsed_list for word in parsed.words))
+        word_index = {word: i for i, word in enumerate(unique_words)}
+        if unique_words:
+            checkpoint()
+            with stage("encode"):
+                embeddings = self.embedding_cache.encode(self.model, unique_words)
+        else:
+            embeddings = np.zeros((0, 0), dtype=np.float32)
+
+        cards = []
+        for (card_id, meaning), parsed, morphs in zip(items, parsed_list, morphs_list):
+            rows = [word_index[word] for word in parsed.words]
+            cards.append(Card(
+                card_id=card_id,
+                meaning=meaning,
+                words=parsed.words,
+                pos_info=parsed.pos_info,
+                morphs=morphs,
+                keywords=keywords_from_morphs(morphs),
+                embeddings=np.ascontiguousarray(embeddings[rows]) if rows else np.zeros((0, 0), dtype=np.float32)
+            ))
+        return cards
+
+    def register(self, card_id: str, meaning: str) -> Card:
+        """카드 하나를 등록합니다."""
+        return self.register_many([(card_id, meaning)])[0]
+
+    def get(self, card_id: str) -> Optional[Card]:
+        """등록된 카드를 반환합니다. 없으면 None을 반환합니다."""
+        return self.cards.get(card_id)
+
+    def remove(self, card_id: str) -> bool:
+        """카드를 삭제합니다."""
+        with self._lock:
+            return self.cards.pop(card_id, None) is not None
+
+    def load_file(self, path: str, chunk_size: int = 256) -> int:
+        """JSON Lines 파일({"card_id": ..., "meaning": ...})의 카드를 청크 단위로 등록합니다."""
+        registered = 0
+        chunk = []
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                item = json.loads(line)
+                chunk.append((str(item["card_id"]), item["meaning"]))
+                if len(chunk) >= chunk_size:
+                    registered += len(self.register_many(chunk))
+                    chunk = []
+        registered += len(self.register_many(chunk))
+        print(f"카드 로드 완료: {registered}개 ({path})")
+        return registered
+
+    def get_stats(self) -> Dict:
+        """카드 저장소 통계를 반환합니다."""
+        cards = list(self.cards.values())
+        return {
+            "cards": len(cards),
+            "words": sum(len(card.words) for card in cards),
+            "embedding_bytes": sum(card.embeddings.nbytes for card in cards)
+        }
+
+    @staticmethod
+    def describe(card: Card) -> Dict:
+        """카드의 미리 계산된 정보를 API 응답용으로 반환합니다."""
+        return {
+            "card_id": card.card_id,
+            "meaning": card.meaning,
+            "words": card.words,
+            "pos_info": card.pos_info,
+            "keywords": card.keywords
+        }
@@ -0,0 +1,392 @@
+import json
+import os
+from abc import ABC, abstractmethod
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from .. import config
+
+# 임베딩 행렬의 최소 할당 크기 (이후 2배씩 증가)
+INITIAL_CAPACITY = 1024
+
+class VectorStore:
+    """정규화된 임베딩을 담는 연속 행렬 (행 번호 <-> word_id 매핑, 삭제는 툼스톤 처리)"""
+
+    def __init__(self, dtype=np.float32):
+        self.dtype = np.dtype(dtype)
+        self.vectors = None  # (capacity, dim)
+        self.row_ids = np.zeros(0, dtype=np.int64)  # {row: word_id}, 0이면 삭제된 행
+        self.id_to_row = {}  # {word_id: row}
+        self.size = 0  # 사용 중인 행 수 (툼스톤 포함)
+        self.tombstones = 0
+
+    @property
+    def alive_count(self) -> int:
+        return self.size - self.tombstones
+
+    def append(self, word_ids: List[int], vectors: np.ndarray) -> np.ndarray:
+        """행들을 끝에 추가하고 추가된 행 번호를 반환합니다. 공간이 부족하면 2배로 늘립니다."""
+        count = len(word_ids)
+        required = self.size + count
+
+        if self.vectors is None:
+            capacity = max(INITIAL_CAPACITY, required)
+            self.vectors = np.zeros((capacity, vectors.shape[1]), dtype=self.dtype)
+            self.row_ids = np.zeros(capacity, dtype=np.int64)
+        elif required > len(self.vectors) or not self.vectors.flags.writeable:
+            # 용량 부족 또는 읽기 전용(memmap) 행렬이면 새 버퍼로 복사
+            capacity = max(len(self.vectors) * 2, required) if required > len(self.vectors) else len(self.vectors)
+            grown = np.zeros((capacity, self.vectors.shape[1]), dtype=self.dtype)
+            grown[:self.size] = self.vectors[:self.size]
+            grown_ids = np.zeros(capacity, dtype=np.int64)
+            grown_ids[:self.size] = self.row_ids[:self.size]
+            self.vectors, self.row_ids = grown, grown_ids
+
+        rows = np.arange(self.size, required)
+        self.vectors[self.size:required] = vectors
+        self.row_ids[self.size:required] = word_ids
+        for row, word_id in zip(rows.tolist(), word_ids):
+            self.id_to_row[word_id] = row
+        self.size = required
+        return rows
+
+    def remove(self, word_id: int) -> bool:
+        """행을 툼스톤으로 표시합니다."""
+        row = self.id_to_row.pop(word_id, None)
+        if row is None:
+            return False
+        if not self.row_ids.flags.writeable:
+            self.row_ids = self.row_ids.copy()
+        self.row_ids[row] = 0
+        self.tombstones += 1
+        return True
+
+    def compact(self):
+        """툼스톤 행을 제거하고 남은 행을 앞으로 모읍니다."""
+        alive = np.nonzero(self.row_ids[:self.size])[0]
+        count = len(alive)
+
+        vectors = np.zeros((max(INITIAL_CAPACITY, count), self.vectors.shape[1]), dtype=self.dtype)
+        vectors[:count] = self.vectors[alive]
+        row_ids = np.zeros(len(vectors), dtype=np.int64)
+        row_ids[:count] = self.row_ids[alive]
+
+        self.vectors, self.row_ids = vectors, row_ids
+        self.size = count
+        self.tombstones = 0
+        self.id_to_row = {int(word_id): row for row, word_id in enumerate(self.row_ids[:count])}
+
+    def get(self, word_id: int):
+        row = self.id_to_row.get(word_id)
+        return None if row is None else np.array(self.vectors[row], dtype=np.float32)
+
+    def save(self, path: str):
+        """행렬과 행 번호 매핑을 .npy 파일로 저장합니다. (memmap으로 다시 열 수 있는 형식)"""
+        np.save(os.path.join(path, "vectors.npy"), self.vectors[:self.size] if self.size else
+                np.zeros((0, 0), dtype=self.dtype))
+        np.save(os.path.join(path, "row_ids.npy"), self.row_ids[:self.size])
+
+    def load(self, path: str, mmap: bool = True):
+        """저장된 행렬을 불러옵니다. mmap이면 OS 페이지 캐시를 공유하는 읽기 전용 memmap으로 엽니다."""
+        mode = "r" if mmap else None
+        vectors = np.load(os.path.join(path, "vectors.npy"), mmap_mode=mode)
+        row_ids = np.load(os.path.join(path, "row_ids.npy"), mmap_mode=mode)
+        self.size = len(row_ids)
+        self.vectors = vectors if self.size else None
+        self.row_ids = row_ids if self.size else np.zeros(0, dtype=np.int64)
+        if self.vectors is not None:
+            self.dtype = self.vectors.dtype
+        alive = np.nonzero(row_ids)[0]
+        self.tombstones = self.size - len(alive)
+        self.id_to_row = dict(zip(row_ids[alive].tolist(), alive.tolist()))
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """점수 배열에서 상위 k개의 위치를 부분 정렬로 찾아 내림차순으로 반환합니다."""
+    if k >= len(scores):
+        return np.argsort(-scores, kind="stable")
+    top = np.argpartition(-scores, k - 1)[:k]
+    return top[np.argsort(-scores[top], kind="stable")]
+
+class VectorIndex(ABC):
+    """WordDatabase의 임베딩 검색 인덱스 인터페이스 (add/remove/search를 모두 구현해야 생성 가능)"""
+
+    backend = None
+
+    def __init__(self, dtype=np.float32):
+        self.store = VectorStore(dtype)
+
+    def __len__(self) -> int:
+        return self.store.alive_count
+
+    @abstractmethod
+    def add(self, word_ids: List[int], vectors: np.ndarray):
+        """정규화된 임베딩들을 추가합니다."""
+
+    @abstractmethod
+    def remove(self, word_id: int) -> bool:
+        """임베딩을 삭제합니다."""
+
+    @abstractmethod
+    def search(self, queries: np.ndarray, top_k: int) -> List[Tuple[int, float]]:
+        """질의 벡터들 중 최대 유사도 기준 상위 k개의 (word_id, 유사도)를 반환합니다."""
+
+    def get_vector(self, word_id: int):
+        """word_id의 임베딩을 반환합니다. 없으면 None을 반환합니다."""
+        return self.store.get(word_id)
+
+    def _score_rows(self, rows: np.ndarray, queries: np.ndarray, top_k: int) -> List[Tuple[int, float]]:
+        """후보 행들의 유사도를 계산하여 상위 k개를 반환합니다."""
+        if len(rows) == 0:
+            return []
+        row_ids = self.store.row_ids[rows]
+        rows = rows[row_ids != 0]  # 삭제된 행 제외
+        if len(rows) == 0:
+            return []
+
+        vectors = self.store.vectors[rows]
+        if vectors.dtype != np.float32:
+            vectors = vectors.astype(np.float32)
+        similarities = np.maximum((vectors @ queries.T).max(axis=1), 0.0)
+
+        top = _top_k(similarities, min(top_k, len(rows)))
+        return [(int(self.store.row_ids[rows[i]]), float(similarities[i])) for i in top]
+
+    def save(self, path: str):
+        """인덱스를 디렉터리에 저장합니다."""
+        os.makedirs(path, exist_ok=True)
+        self.store.save(path)
+        with open(os.path.join(path, "index.json"), "w", encoding="utf-8") as f:
+            json.dump({"backend": self.backend, "params": self.get_params()}, f)
+
+    def load(self, path: str, mmap: bool = True):
+        """디렉터리에서 인덱스를 불러옵니다."""
+        self.store.load(path, mmap)
+
+    def get_params(self) -> Dict:
+        return {}
+
+    def get_stats(self) -> Dict:
+        """인덱스 통계를 반환합니다."""
+        return {
+            "backend": self.backend,
+            "vectors": len(self),
+            "rows": self.store.size,
+            "capacity": 0 if self.store.vectors is None else len(self.store.vectors),
+            "tombstones": self.store.tombstones,
+            **self.get_params()
+        }
+
+class ExactIndex(VectorIndex):
+    """전체 행렬과의 행렬 곱으로 정확한 상위 k개를 찾는 인덱스"""
+
+    backend = "exact"
+
+    def add(self, word_ids: List[int], vectors: np.ndarray):
+        self.store.append(word_ids, vectors)
+
+    def remove(self, word_id: int) -> bool:
+        if not self.store.remove(word_id):
+            return False
+        # 툼스톤이 절반을 넘으면 압축
+        if self.store.tombstones > self.store.size // 2:
+            self.store.compact()
+        return True
+
+    def search(self, queries: np.ndarray, top_k: int) -> List[Tuple[int, float]]:
+        if self.store.alive_count == 0 or top_k <= 0:
+            return []
+
+        # 전체 행렬과 한 번의 행렬 곱 (복사 없이 슬라이스 사용)
+        similarities = np.maximum((self.store.vectors[:self.store.size] @ queries.T).max(axis=1), 0.0)
+        row_ids = self.store.row_ids[:self.store.size]
+        if self.store.tombstones:
+            similarities[row_ids == 0] = -1.0  # 삭제된 행 제외
+
+        top = _top_k(similarities, min(top_k, self.store.alive_count))
+        return [(int(row_ids[row]), float(similarities[row])) for row in top]
+
+class IVFIndex(VectorIndex):
+    """역색인(IVF) 기반 근사 최근접 이웃 인덱스
+
+    벡터를 구면 k-means 중심점으로 묶고, 질의와 가까운 n_probe개 리스트의 벡터만 비교합니다.
+    n_lists/n_probe로 재현율과 속도를 조절하며, 벡터는 기본적으로 float16으로 저장해 메모리를 절반으로 줄입니다.
+    """
+
+    backend = "ivf"
+
+    def __init__(self, n_lists: int = 0, n_probe: int = 8, min_train_size: int = 10000,
+                 retrain_growth: float = 4.0, train_iterations: int = 10, dtype=np.float16, seed: int = 0):
+        super().__init__(dtype)
+        self.n_lists = n_lists  # 0이면 학습 시 4*sqrt(N)으로 자동 설정
+        self.n_probe = n_probe
+        self.min_train_size = min_train_size
+        self.retrain_growth = retrain_growth
+        self.train_iterations = train_iterations
+        self.seed = seed
+
+        self.centroids = None  # (n_lists, dim)
+        self._lists = []  # [np.ndarray of rows]
+        self._pending = []  # [[rows]] 아직 배열로 합치지 않은 추가분
+        self._trained_size = 0
+
+    @property
+    def is_trained(self) -> bool:
+        return self.centroids is not None
+
+    def add(self, word_ids: List[int], vectors: np.ndarray):
+        rows = self.store.append(word_ids, vectors)
+
+        if not self.is_trained:
+            if self.store.alive_count >= self.min_train_size:
+                self.train()
+            return
+
+        if self.store.alive_count >= self._trained_size * self.retrain_growth:
+            # 학습 시점보다 크게 늘어나면 중심점을 다시 학습
+            self.train()
+            return
+
+        assignments = self._assign(np.asarray(vectors, dtype=np.float32))
+        for row, list_id in zip(rows.tolist(), assignments.tolist()):
+            self._pending[list_id].append(row)
+
+    def remove(self, word_id: int) -> bool:
+        if not self.store.remove(word_id):
+            return False
+        # 툼스톤이 절반을 넘으면 압축 후 리스트 재구성
+        if self.store.tombstones > self.store.size // 2:
+            self.store.compact()
+            if self.is_trained:
+                self._rebuild_lists()
+        return True
+
+    def train(self):
+        """현재 벡터로 중심점을 학습하고 모든 벡터를 리스트에 배정합니다."""
+        alive_rows = np.nonzero(self.store.row_ids[:self.store.size])[0]
+        count = len(alive_rows)
+        if count == 0:
+            return
+
+        n_lists = self.n_lists or max(1, int(4 * np.sqrt(count)))
+        n_lists = min(n_lists, count)
+        rng = np.random.default_rng(self.seed)
+
+        # 리스트당 최대 256개 표본으로 학습
+        sample_size = min(count, n_lists * 256)
+        sample = self.store.vectors[rng.choice(alive_rows, sample_size, replace=False)].astype(np.float32)
+        centroids = sample[rng.choice(sample_size, n_lists, replace=False)].copy()
+
+        for _ in range(self.train_iterations):
+            assignments = (sample @ centroids.T).argmax(axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignments, sample)
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            empty = norms[:, 0] == 0
+            # 비어 있는 중심점은 임의 표본으로 다시 채움
+            sums[empty] = sample[rng.choice(sample_size, int(empty.sum()))]
+            norms[empty] = 1.0
+            centroids = sums / norms
+
+        self.centroids = centroids.astype(np.float32)
+        self._trained_size = count
+        self._rebuild_lists()
+
+    def search(self, queries: np.ndarray, top_k: int) -> List[Tuple[int, float]]:
+        if self.store.size == 0 or top_k <= 0:
+            return []
+        if not self.is_trained:
+            return self._score_rows(np.arange(self.store.size), queries, top_k)
+
+        self._flush_pending()
+        n_probe = min(self.n_probe, len(self.centroids))
+        probe = np.unique(np.argpartition(-(queries @ self.centroids.T), n_probe - 1, axis=1)[:, :n_probe])
+        candidate_rows = np.concatenate([self._lists[list_id] for list_id in probe])
+        return self._score_rows(candidate_rows, queries, top_k)
+
+    def _assign(self, vectors: np.ndarray, chunk_size: int = 65536) -> np.ndarray:
+        """벡터들을 가장 가까운 중심점에 배정합니다."""
+        return np.concatenate([
+            (vectors[i:i + chunk_size].astype(np.float32) @ self.centroids.T).argmax(axis=1)
+            for i in range(0, len(vectors), chunk_size)
+        ]) if len(vectors) else np.zeros(0, dtype=np.int64)
+
+    def _rebuild_lists(self):
+        """모든 살아 있는 행을 리스트에 다시 배정합니다."""
+        alive_rows = np.nonzero(self.store.row_ids[:self.store.size])[0]
+        assignments = self._assign(self.store.vectors[alive_rows])
+        order = np.argsort(assignments, kind="stable")
+        bounds = np.searchsorted(assignments[order], np.arange(len(self.centroids) + 1))
+        sorted_rows = alive_rows[order]
+        self._lists = [sorted_rows[bounds[i]:bounds[i + 1]] for i in range(len(self.centroids))]
+        self._pending = [[] for _ in range(len(self.centroids))]
+
+    def _flush_pending(self):
+        """추가 대기 중인 행들을 리스트 배열에 합칩니다."""
+        for list_id, rows in enumerate(self._pending):
+            if rows:
+                self._lists[list_id] = np.concatenate([self._lists[list_id], np.asarray(rows, dtype=np.int64)])
+                self._pending[list_id] = []
+
+    def save(self, path: str):
+        super().save(path)
+        if self.is_trained:
+            self._flush_pending()
+            lengths = np.array([len(rows) for rows in self._lists], dtype=np.int64)
+            np.save(os.path.join(path, "centroids.npy"), self.centroids)
+            np.save(os.path.join(path, "list_rows.npy"), np.concatenate(self._lists))
+            np.save(os.path.join(path, "list_lengths.npy"), lengths)
+
+    def load(self, path: str, mmap: bool = True):
+        super().load(path, mmap)
+        with open(os.path.join(path, "index.json"), "r", encoding="utf-8") as f:
+            params = json.load(f)["params"]
+        self._trained_size = params.get("trained_size", 0)
+
+        centroids_path = os.path.join(path, "centroids.npy")
+        if not os.path.exists(centroids_path):
+            self.centroids = None
+            self._lists, self._pending = [], []
+            return
+
+        self.centroids = np.load(centroids_path)
+        list_rows = np.load(os.path.join(path, "list_rows.npy"))
+        bounds = np.concatenate([[0], np.cumsum(np.load(os.path.join(path, "list_lengths.npy")))])
+        self._lists = [list_rows[bounds[i]:bounds[i + 1]] for i in range(len(self.centroids))]
+        self._pending = [[] for _ in range(len(self.centroids))]
+
+    def get_params(self) -> Dict:
+        return {
+            "n_lists": 0 if self.centroids is None else len(self.centroids),
+            "n_probe": self.n_probe,
+            "trained": self.is_trained,
+            "trained_size": self._trained_size
+        }
+
+def create_index(backend: str = "exact", **params) -> VectorIndex:
+    """이름으로 인덱스를 생성합니다."""
+    if backend == "exact":
+        return ExactIndex()
+    if backend == "ivf":
+        return IVFIndex(**params)
+    raise ValueError(f"지원하지 않는 인덱스 백엔드입니다: {backend}")
+
+def create_index_from_config() -> VectorIndex:
+    """설정값으로 인덱스를 생성합니다."""
+    if config.WORD_INDEX_BACKEND == "ivf":
+        return IVFIndex(
+            n_lists=config.WORD_INDEX_N_LISTS,
+            n_probe=config.WORD_INDEX_N_PROBE,
+            min_train_size=config.WORD_INDEX_MIN_TRAIN_SIZE
+        )
+    return create_index(config.WORD_INDEX_BACKEND)
+
+def load_index(path: str, mmap: bool = True) -> VectorIndex:
+    """저장된 인덱스를 백엔드에 맞게 불러옵니다."""
+    with open(os.path.join(path, "index.json"), "r", encoding="utf-8") as f:
+        info = json.load(f)
+    index = create_index(info["backend"])
+    if isinstance(index, IVFIndex):
+        index.n_probe = info["params"].get("n_probe", index.n_probe)
+    index.load(path, mmap)
+    return index
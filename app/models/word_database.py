@@ -1,98 +1,267 @@
+import json
+import os
+import threading
+import time
 from typing import Dict, List
-from sentence_transformers import SentenceTransformer, util
+import numpy as np
+from ..services.encoder_backends import EncoderBackend
+from ..services.embedding_cache import EmbeddingCache, get_embedding_cache
+from ..services.metrics import stage
+from ..utils.versioned_dir import new_version, publish, resolve
+from .vector_index import VectorIndex, create_index_from_config, load_index
+
+SNAPSHOT_METADATA_FILE = "metadata.json"
+SNAPSHOT_INDEX_DIR = "index"
 
 class WordDatabase:
-    def __init__(self, model: SentenceTransformer):
+    def __init__(self, model: EncoderBackend, embedding_cache: EmbeddingCache = None,
+                 index: VectorIndex = None):
         self.model = model
-        self.words = {}  # {word_id: {"word": "단어", "meaning": "의미", "pos": "품사", "embedding": tensor}}
+        self.embedding_cache = embedding_cache or get_embedding_cache()
+        self.words = {}  # {word_id: {"word": "단어", "meaning": "의미", "pos": "품사", "keywords": [...]}}
         self.word_id_counter = 1
         self.meaning_to_ids = {}  # {meaning: [word_ids]}
         self.word_to_ids = {}  # {word: [word_ids]}
+        self.auto_learned = {}  # 자동 학습으로 추가한 단어의 사용 기록 {word_id: [적중 횟수, 마지막 사용 시각(time.time)]}
         
+        # 임베딩 검색 인덱스 (기본값은 설정의 백엔드)
+        self.index = index if index is not None else create_index_from_config()
+        self._lock = threading.RLock()
+        self.dirty = False  # 마지막 스냅샷 이후 변경 여부
+    
     def add_word(self, word: str, meaning: str, pos: str = None, keywords: List[str] = None) -> int:
         """단어를 데이터베이스에 추가합니다."""
-        word_id = self.word_id_counter
-        self.word_id_counter += 1
-        
         # 임베딩 계산
         try:
-            embedding = self.model.encode(word, convert_to_tensor=True)
+            embedding = self.embedding_cache.encode(self.model, [word])[0]
         except Exception as e:
             print(f"임베딩 계산 오류: {e}")
             embedding = None
         
-        # 단어 정보 저장
-        self.words[word_id] = {
-            "word": word,
-            "meaning": meaning,
-            "pos": pos,
-            "embedding": embedding,
-            "keywords": keywords or []
-        }
+        with self._lock:
+            word_id = self.word_id_counter
+            self.word_id_counter += 1
+            
+            # 단어 정보 저장
+            self.words[word_id] = {
+                "word": word,
+                "meaning": meaning,
+                "pos": pos,
+                "keywords": keywords or []
+            }
+            
+            if embedding is not None:
+                self.index.add([word_id], embedding[np.newaxis, :])
+            
+            # 인덱스 업데이트
+            if meaning not in self.meaning_to_ids:
+                self.meaning_to_ids[meaning] = []
+            self.meaning_to_ids[meaning].append(word_id)
+            
+            if word not in self.word_to_ids:
+                self.word_to_ids[word] = []
+            self.word_to_ids[word].append(word_id)
+            self.dirty = True
         
-        # 인덱스 업데이트
-        if meaning not in self.meaning_to_ids:
-            self.meaning_to_ids[meaning] = []
-        self.meaning_to_ids[meaning].append(word_id)
+        return word_id
+    
+    def add_words(self, entries: List[Dict], auto_learned: bool = False) -> Dict:
+        """여러 단어를 한 번에 추가합니다. (entries: [{"word", "meaning", "pos", "keywords"}])
         
-        if word not in self.word_to_ids:
-            self.word_to_ids[word] = []
-        self.word_to_ids[word].append(word_id)
+        이미 있는 (단어, 의미) 쌍과 목록 안의 중복은 건너뜁니다. 새 단어는 한 번의 배치 인코딩으로
+        임베딩을 계산하고, 저장소와 인덱스에 한 번에 추가합니다.
+        auto_learned면 자동 학습한 단어로 표시하여 사용 기록을 함께 남깁니다. (스냅샷에 저장됨)
+        """
+        with self._lock:
+            new_entries = self._dedupe(entries)
+        if not new_entries:
+            return {"added": 0, "duplicates": len(entries), "word_ids": []}
         
-        return word_id
+        # 자주 쓰는 임베딩을 밀어내지 않도록 캐시에 넣지 않고 인코딩
+        with stage("word_db_encode"):
+            embeddings = self.embedding_cache.encode(self.model, [entry["word"] for entry in new_entries], store=False)
+        
+        with self._lock:
+            # 인코딩하는 동안 다른 스레드가 추가한 단어 제외
+            fresh = set(map(id, self._dedupe(new_entries)))
+            rows = [i for i, entry in enumerate(new_entries) if id(entry) in fresh]
+            word_ids = list(range(self.word_id_counter, self.word_id_counter + len(rows)))
+            self.word_id_counter += len(rows)
+            
+            for word_id, row in zip(word_ids, rows):
+                entry = new_entries[row]
+                word, meaning = entry["word"], entry["meaning"]
+                self.words[word_id] = {
+                    "word": word,
+                    "meaning": meaning,
+                    "pos": entry.get("pos"),
+                    "keywords": entry.get("keywords") or []
+                }
+                self.meaning_to_ids.setdefault(meaning, []).append(word_id)
+                self.word_to_ids.setdefault(word, []).append(word_id)
+            
+            if word_ids:
+                self.index.add(word_ids, embeddings[rows])
+                self.dirty = True
+            if auto_learned:
+                now = time.time()
+                for word_id in word_ids:
+                    self.auto_learned[word_id] = [0, now]
+        
+        return {"added": len(word_ids), "duplicates": len(entries) - len(word_ids), "word_ids": word_ids}
+    
+    def _dedupe(self, entries: List[Dict]) -> List[Dict]:
+        """이미 있는 (단어, 의미) 쌍과 목록 안의 중복을 제외합니다. (잠금 상태에서 호출)"""
+        seen = set()
+        result = []
+        for entry in entries:
+            key = (entry["word"], entry["meaning"])
+            if key in seen:
+                continue
+            seen.add(key)
+            if any(self.words[word_id]["meaning"] == key[1] for word_id in self.word_to_ids.get(key[0], ())):
+                continue
+            result.append(entry)
+        return result
+    
+    def remove_word(self, word_id: int) -> bool:
+        """단어를 데이터베이스에서 삭제합니다."""
+        with self._lock:
+            word_info = self.words.pop(word_id, None)
+            if word_info is None:
+                return False
+            self.auto_learned.pop(word_id, None)
+            
+            self.index.remove(word_id)
+            
+            # 인덱스 업데이트
+            for index, key in ((self.meaning_to_ids, word_info["meaning"]), (self.word_to_ids, word_info["word"])):
+                ids = index.get(key, [])
+                if word_id in ids:
+                    ids.remove(word_id)
+                if not ids:
+                    index.pop(key, None)
+            
+            self.dirty = True
+            return True
+    
+    def record_usage(self, word_ids: List[int]):
+        """자동 학습한 단어의 적중 횟수와 마지막 사용 시각을 갱신합니다. (다른 단어는 무시)"""
+        now = time.time()
+        with self._lock:
+            for word_id in word_ids:
+                usage = self.auto_learned.get(word_id)
+                if usage is not None:
+                    usage[0] += 1
+                    usage[1] = now
+                    self.dirty = True
+    
+    def auto_learned_usage(self) -> Dict[int, tuple]:
+        """자동 학습한 단어의 사용 기록 사본을 반환합니다. {word_id: (적중 횟수, 마지막 사용 시각)}"""
+        with self._lock:
+            return {word_id: tuple(usage) for word_id, usage in self.auto_learned.items()}
     
     def find_best_match(self, user_input: str, user_words: List[str], top_k: int = 5) -> List[Dict]:
         """사용자 입력과 가장 잘 매칭되는 단어들을 찾습니다."""
-        if not self.words:
+        if not self.words or not user_words or top_k <= 0:
             return []
         
         # 사용자 입력 임베딩 계산
         try:
-            user_embeddings = self.model.encode(user_words, convert_to_tensor=True, show_progress_bar=False)
+            with stage("word_db_encode"):
+                user_embeddings = self.embedding_cache.encode(self.model, user_words)
         except Exception as e:
             print(f"사용자 입력 임베딩 오류: {e}")
             return []
         
-        # 모든 단어와 유사도 계산 (배치 처리)
-        all_similarities = []
-        
-        for word_id, word_info in self.words.items():
-            if word_info["embedding"] is None:
-                continue
-                
-            # 각 사용자 단어와의 최대 유사도
-            max_similarity = 0.0
-            for user_embedding in user_embeddings:
-                try:
-                    similarity = util.pytorch_cos_sim(user_embedding, word_info["embedding"]).item()
-                    max_similarity = max(max_similarity, similarity)
-                except Exception as e:
-                    continue
+        with self._lock, stage("word_db_search"):
+            matches = self.index.search(user_embeddings, top_k)
             
-            # 종합 점수 (동의어, 키워드 등은 외부에서 계산)
-            total_score = max_similarity
-            
-            all_similarities.append({
-                "word_id": word_id,
-                "word": word_info["word"],
-                "meaning": word_info["meaning"],
-                "pos": word_info["pos"],
-                "similarity": max_similarity,
-                "total_score": total_score
-            })
+            results = []
+            for word_id, similarity in matches:
+                word_info = self.words[word_id]
+                
+                # 종합 점수 (동의어, 키워드 등은 외부에서 계산)
+                results.append({
+                    "word_id": word_id,
+                    "word": word_info["word"],
+                    "meaning": word_info["meaning"],
+                    "pos": word_info["pos"],
+                    "similarity": similarity,
+                    "total_score": similarity
+                })
         
-        # 점수순으로 정렬하고 상위 k개 반환
-        all_similarities.sort(key=lambda x: x["total_score"], reverse=True)
-        return all_similarities[:top_k]
+        return results
     
     def get_word_by_id(self, word_id: int) -> Dict:
         """ID로 단어 정보를 가져옵니다."""
         return self.words.get(word_id, {})
     
+    def get_embedding(self, word_id: int):
+        """ID로 정규화된 임베딩을 가져옵니다. 없으면 None을 반환합니다."""
+        with self._lock:
+            return self.index.get_vector(word_id)
+    
     def get_stats(self) -> Dict:
         """데이터베이스 통계를 반환합니다."""
         return {
             "total_words": len(self.words),
             "total_meanings": len(self.meaning_to_ids),
-            "total_unique_words": len(self.word_to_ids)
-        } 
\ No newline at end of file
+            "total_unique_words": len(self.word_to_ids),
+            "index": self.index.get_stats()
+        }
+    
+    def save_snapshot(self, path: str):
+        """메타데이터와 임베딩을 스냅샷 디렉터리에 저장합니다.
+        
+        임베딩은 memmap으로 다시 열 수 있는 .npy로 저장되므로, 재시작 시 모델 호출 없이 복원됩니다.
+        새 버전 디렉터리에 다 쓴 뒤 path 링크를 원자적으로 바꾸므로, 읽는 쪽은 항상 완성된 스냅샷을 봅니다.
+        """
+        version = new_version(path)
+        
+        with self._lock:
+            metadata = {
+                "word_id_counter": self.word_id_counter,
+                "words": [
+                    [word_id, info["word"], info["meaning"], info["pos"], info["keywords"]]
+                    for word_id, info in self.words.items()
+                ],
+                "meaning_to_ids": self.meaning_to_ids,
+                "word_to_ids": self.word_to_ids,
+                "auto_learned": [[word_id, hits, last_used] for word_id, (hits, last_used) in self.auto_learned.items()]
+            }
+            with open(os.path.join(version, SNAPSHOT_METADATA_FILE), "w", encoding="utf-8") as f:
+                json.dump(metadata, f, ensure_ascii=False, separators=(",", ":"))
+            self.index.save(os.path.join(version, SNAPSHOT_INDEX_DIR))
+            self.dirty = False
+        
+        publish(path, version)
+        print(f"단어장 스냅샷 저장: {len(metadata['words'])}개 -> {path}")
+    
+    def load_snapshot(self, path: str, mmap: bool = True):
+        """스냅샷에서 단어장을 복원합니다.
+        
+        mmap이면 임베딩을 읽기 전용 memmap으로 열어 같은 호스트의 워커들이 OS 페이지 캐시를 공유합니다.
+        이후 단어를 추가하면 해당 워커에서만 임베딩 행렬이 메모리로 복사됩니다.
+        """
+        # 읽는 도중 다른 프로세스가 새 버전으로 바꿔도 같은 버전을 읽도록 한 번만 해석
+        version = resolve(path)
+        with open(os.path.join(version, SNAPSHOT_METADATA_FILE), "r", encoding="utf-8") as f:
+            metadata = json.load(f)
+        index = load_index(os.path.join(version, SNAPSHOT_INDEX_DIR), mmap)
+        
+        with self._lock:
+            self.words = {
+                word_id: {"word": word, "meaning": meaning, "pos": pos, "keywords": keywords}
+                for word_id, word, meaning, pos, keywords in metadata["words"]
+            }
+            self.word_id_counter = metadata["word_id_counter"]
+            self.meaning_to_ids = metadata["meaning_to_ids"]
+            self.word_to_ids = metadata["word_to_ids"]
+            # 이전 형식의 스냅샷에는 자동 학습 기록이 없음
+            self.auto_learned = {
+                word_id: [hits, last_used] for word_id, hits, last_used in metadata.get("auto_learned", [])
+            }
+            self.index = index
+            self.dirty = False
+        print(f"단어장 스냅샷 로드: {len(self.words)}개 <- {path}")
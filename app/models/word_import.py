@@ -0,0 +1,128 @@
+import csv
+import json
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO
+from .word_database import WordDatabase
+
+IMPORT_FORMATS = ("csv", "jsonl")
+
+def guess_format(filename: str) -> Optional[str]:
+    """파일 이름의 확장자로 형식을 추측합니다."""
+    lower = (filename or "").lower()
+    if lower.endswith(".csv"):
+        return "csv"
+    if lower.endswith((".jsonl", ".ndjson", ".json")):
+        return "jsonl"
+    return None
+
+def read_records(stream: TextIO, file_format: str) -> Iterator[Optional[Dict]]:
+    """CSV(word, meaning, pos, keywords 열) 또는 JSON Lines 파일을 한 줄씩 읽어 단어 항목을 만듭니다.
+
+    CSV의 keywords 열은 '|'로 구분합니다. 형식이 잘못된 줄은 None을 돌려 건너뛴 수를 셀 수 있게 합니다.
+    """
+    if file_format == "csv":
+        rows = csv.DictReader(stream)
+    elif file_format == "jsonl":
+        rows = _read_json_lines(stream)
+    else:
+        raise ValueError(f"지원하지 않는 형식입니다: {file_format} ({', '.join(IMPORT_FORMATS)})")
+
+    for row in rows:
+        yield _to_entry(row, file_format)
+
+def _read_json_lines(stream: TextIO) -> Iterator[Optional[Dict]]:
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            yield None
+
+def _to_entry(row, file_format: str) -> Optional[Dict]:
+    """읽은 행을 단어 항목으로 변환합니다. 단어나 의미가 없으면 None을 반환합니다."""
+    if not isinstance(row, dict):
+        return None
+    word = str(row.get("word") or "").strip()
+    meaning = str(row.get("meaning") or "").strip()
+    if not word or not meaning:
+        return None
+
+    keywords = row.get("keywords") or []
+    if isinstance(keywords, str):
+        keywords = [keyword.strip() for keyword in keywords.split("|") if keyword.strip()]
+    return {"word": word, "meaning": meaning, "pos": row.get("pos") or None, "keywords": list(keywords)}
+
+class WordImporter:
+    """단어 항목 스트림을 청크 단위로 단어장에 추가하는 가져오기 작업
+
+    한 번에 청크 하나만 메모리에 두므로 파일 크기와 무관하게 메모리 사용량이 일정합니다.
+    step()은 청크 하나를 처리하고 진행 상황을 반환하며, 끝나면 None을 반환합니다.
+    """
+
+    def __init__(self, database: WordDatabase, records: Iterable[Optional[Dict]], chunk_size: int = 512):
+        self.database = database
+        self.records = iter(records)
+        self.chunk_size = chunk_size
+        self.started = time.perf_counter()
+        self.done = False
+
+        self.processed = 0
+        self.added = 0
+        self.duplicates = 0
+        self.invalid = 0
+
+    def step(self) -> Optional[Dict]:
+        """다음 청크를 읽어 추가합니다."""
+        if self.done:
+            return None
+
+        chunk = []
+        for record in self.records:
+            self.processed += 1
+            if record is None:
+                self.invalid += 1
+                continue
+            chunk.append(record)
+            if len(chunk) >= self.chunk_size:
+                break
+        else:
+            self.done = True
+
+        if chunk:
+            result = self.database.add_words(chunk)
+            self.added += result["added"]
+            self.duplicates += result["duplicates"]
+        elif self.done:
+            return None
+        return self.progress()
+
+    def run(self, on_progress=None) -> Dict:
+        """끝까지 가져오고 최종 진행 상황을 반환합니다."""
+        while True:
+            progress = self.step()
+            if progress is None:
+                return self.progress()
+            if on_progress:
+                on_progress(progress)
+
+    def progress(self) -> Dict:
+        """지금까지의 진행 상황을 반환합니다."""
+        elapsed = time.perf_counter() - self.started
+        return {
+            "processed": self.processed,
+            "added": self.added,
+            "duplicates": self.duplicates,
+            "invalid": self.invalid,
+            "done": self.done,
+            "elapsed_seconds": elapsed,
+            "words_per_second": self.processed / elapsed if elapsed > 0 else 0.0
+        }
+
+def import_file(database: WordDatabase, path: str, file_format: str = None, chunk_size: int = 512,
+                on_progress=None) -> Dict:
+    """CSV/JSON Lines 파일을 단어장으로 가져옵니다."""
+    file_format = file_format or guess_format(path)
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        return WordImporter(database, read_records(f, file_format), chunk_size).run(on_progress)
@@ -0,0 +1,127 @@
+import asyncio
+import threading
+import time
+from typing import AsyncIterator, Dict, Tuple
+from ..models.card_registry import Card
+from .response_format import ResponseFormat
+from .cancellation import ComputationCancelled
+from .scoring_executor import ScoringExecutor, ServiceOverloadedError
+from .similarity_service import SimilarityService
+
+# 모든 세션의 누적 통계 (이벤트 루프 안에서만 갱신)
+_totals = {
+    "sessions": 0,
+    "active_sessions": 0,
+    "inputs": 0,
+    "computed": 0,
+    "coalesced": 0,
+    "cancelled": 0,
+    "encoded_words": 0,
+    "reused_words": 0
+}
+
+class AnswerSession:
+    """입력 중인 답을 실시간으로 채점하는 세션 하나의 상태
+
+    카드(정답) 쪽 분석은 세션 동안 한 번만 준비해 두고, 사용자 단어의 임베딩을 세션에 보관하여
+    이전 입력 이후 바뀐 단어만 인코딩합니다. 입력이 debounce_seconds 동안 멈췄을 때 가장 최근 입력 하나만 계산하고,
+    계산 중에 새 입력이 오면 진행 중인 계산은 다음 단계 전에 중단하고 결과도 보내지 않습니다.
+    """
+
+    def __init__(self, service: SimilarityService, executor: ScoringExecutor, card: Card,
+                 response_format: ResponseFormat, debounce_seconds: float = 0.15):
+        self.service = service
+        self.executor = executor
+        self.card = card
+        self.response_format = response_format
+        self.debounce = debounce_seconds
+
+        self.word_embeddings = {}  # {사용자 단어: 정규화된 임베딩}, 마지막으로 계산한 입력의 단어만 보관
+        self._pending = None  # 아직 계산하지 않은 가장 최근 입력 (seq, user_input)
+        self._wakeup = asyncio.Event()
+        self._cancel_event = None  # 진행 중인 계산의 중단 신호
+        self._closed = False
+
+        self.stats = {key: 0 for key in ("inputs", "computed", "coalesced", "cancelled", "encoded_words", "reused_words")}
+        _totals["sessions"] += 1
+        _totals["active_sessions"] += 1
+
+    def submit(self, seq, user_input: str):
+        """새 입력을 받습니다. 아직 계산하지 않은 이전 입력은 버리고, 진행 중인 계산은 중단시킵니다."""
+        if self._closed:
+            return
+        self._count("inputs")
+        if self._pending is not None:
+            self._count("coalesced")
+        self._pending = (seq, user_input)
+        if self._cancel_event is not None:
+            self._cancel_event.set()
+        self._wakeup.set()
+
+    async def results(self) -> AsyncIterator[Tuple[object, str, Dict, list, float]]:
+        """입력이 멈출 때마다 최신 입력을 계산하여 (seq, 입력, 분석 결과, 비교 결과, 계산 시간)을 내보냅니다."""
+        while not self._closed:
+            await self._wakeup.wait()
+            # 입력이 debounce 동안 더 오지 않을 때까지 대기
+            while not self._closed:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.debounce)
+                except asyncio.TimeoutError:
+                    break
+            if self._closed or self._pending is None:
+                continue
+
+            seq, user_input = self._pending
+            self._pending = None
+            cancel_event = self._cancel_event = threading.Event()
+            known_words = set(self.word_embeddings)
+            started = time.perf_counter()
+            try:
+                analysis_result, comparisons = await self.executor.run(
+                    self.service.analyze_card, self.card, user_input, self.response_format, self.word_embeddings,
+                    cancel_event=cancel_event
+                )
+            except ComputationCancelled:
+                self._count("cancelled")
+                continue
+            except ServiceOverloadedError:
+                # 과부하면 잠시 뒤 다시 시도 (그 사이 새 입력이 오면 새 입력을 계산)
+                if self._pending is None:
+                    self._pending = (seq, user_input)
+                await asyncio.sleep(0.05)
+                self._wakeup.set()
+                continue
+            except Exception as e:
+                analysis_result, comparisons = {"error": f"분석 중 오류 발생: {str(e)}"}, []
+            finally:
+                self._cancel_event = None
+
+            # 계산이 끝나기 직전에 새 입력이 왔으면 곧 다시 계산하므로 보내지 않음
+            if cancel_event.is_set():
+                self._count("cancelled")
+                continue
+            self._count("computed")
+            if "error" not in analysis_result:
+                encoded = sum(word not in known_words for word in self.word_embeddings)
+                self._count("encoded_words", encoded)
+                self._count("reused_words", len(self.word_embeddings) - encoded)
+            yield seq, user_input, analysis_result, comparisons, time.perf_counter() - started
+
+    def close(self):
+        """세션을 끝냅니다. 진행 중인 계산은 다음 단계 전에 중단됩니다."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._cancel_event is not None:
+            self._cancel_event.set()
+        self._wakeup.set()
+        _totals["active_sessions"] -= 1
+
+    def _count(self, key: str, amount: int = 1):
+        self.stats[key] += amount
+        _totals[key] += amount
+
+def get_answer_session_stats() -> Dict:
+    """실시간 채점 세션의 누적 통계를 반환합니다."""
+    return dict(_totals)
@@ -0,0 +1,178 @@
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Dict, List, Union
+
+import numpy as np
+
+from .encoder_backends import EncoderBackend
+from .metrics import record_stage
+
+# 배치 크기 분포 집계 구간
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+
+class _EncodeRequest:
+    __slots__ = ("sentences", "future", "enqueued_at")
+
+    def __init__(self, sentences: List[str]):
+        self.sentences = sentences
+        self.future = Future()
+        self.enqueued_at = time.perf_counter()
+
+class BatchingEncoder(EncoderBackend):
+    """여러 요청의 encode 호출을 모아 한 번의 배치로 실행하는 모델 앞단
+
+    최대 배치 크기에 도달하거나 첫 요청 이후 최대 대기 시간이 지나면 모인 문장을
+    한 번에 인코딩하고, 결과를 요청별로 나누어 돌려줍니다.
+    """
+
+    def __init__(self, model: EncoderBackend, max_batch_size: int = 64, max_wait_ms: float = 5.0):
+        self.model = model
+        self.name = model.name
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+
+        self._queue = queue.Queue()
+        self._stats_lock = threading.Lock()
+        self._batches = 0
+        self._requests = 0
+        self._sentences = 0
+        self._batch_size_counts = {bucket: 0 for bucket in BATCH_SIZE_BUCKETS}
+        self._batch_size_counts["+Inf"] = 0
+        self._queue_waits = deque(maxlen=2048)  # 최근 대기 시간 (초)
+        self._max_queue_wait = 0.0
+
+        self._worker = threading.Thread(target=self._run, name="batching-encoder", daemon=True)
+        self._worker.start()
+
+    def encode(self, sentences: Union[str, List[str]], convert_to_tensor: bool = False, **kwargs):
+        """SentenceTransformer.encode와 같은 방식으로 임베딩을 반환합니다."""
+        single = isinstance(sentences, str)
+        sentence_list = [sentences] if single else list(sentences)
+        if not sentence_list:
+            return np.zeros((0, 0), dtype=np.float32)
+
+        request = _EncodeRequest(sentence_list)
+        self._queue.put(request)
+        embeddings = request.future.result()
+
+        if single:
+            embeddings = embeddings[0]
+        if convert_to_tensor:
+            import torch
+            return torch.from_numpy(embeddings)
+        return embeddings
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.model.get_sentence_embedding_dimension()
+
+    def __getattr__(self, name):
+        # 그 밖의 속성은 원본 백엔드로 위임
+        return getattr(self.model, name)
+
+    def close(self):
+        """워커 스레드를 종료합니다."""
+        self._queue.put(None)
+        self._worker.join(timeout=5)
+
+    def _run(self):
+        """큐에서 요청을 모아 배치 단위로 인코딩합니다."""
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+
+            batch = [first]
+            sentence_count = len(first.sentences)
+            deadline = first.enqueued_at + self.max_wait
+            stop = False
+
+            while sentence_count < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                try:
+                    request = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if request is None:
+                    stop = True
+                    break
+                batch.append(request)
+                sentence_count += len(request.sentences)
+
+            self._process(batch)
+            if stop:
+                return
+
+    def _process(self, batch: List[_EncodeRequest]):
+        """모인 요청을 한 번에 인코딩하고 결과를 요청별로 나눕니다."""
+        started = time.perf_counter()
+        sentences = [sentence for request in batch for sentence in request.sentences]
+
+        try:
+            embeddings = self.model.encode(
+                sentences,
+                batch_size=self.max_batch_size,
+                convert_to_numpy=True,
+                show_progress_bar=False
+            )
+        except Exception as e:
+            for request in batch:
+                request.future.set_exception(e)
+            return
+
+        record_stage("model_encode", time.perf_counter() - started)
+
+        offset = 0
+        for request in batch:
+            count = len(request.sentences)
+            request.future.set_result(embeddings[offset:offset + count])
+            offset += count
+
+        self._record(batch, len(sentences), started)
+
+    def _record(self, batch: List[_EncodeRequest], sentence_count: int, started: float):
+        """배치 크기와 대기 시간 통계를 기록합니다."""
+        with self._stats_lock:
+            self._batches += 1
+            self._requests += len(batch)
+            self._sentences += sentence_count
+
+            bucket = next((b for b in BATCH_SIZE_BUCKETS if sentence_count <= b), "+Inf")
+            self._batch_size_counts[bucket] += 1
+
+            for request in batch:
+                wait = started - request.enqueued_at
+                record_stage("encoder_queue_wait", wait)
+                self._queue_waits.append(wait)
+                self._max_queue_wait = max(self._max_queue_wait, wait)
+
+    def get_stats(self) -> Dict:
+        """배치 크기와 큐 대기 시간 통계를 반환합니다."""
+        with self._stats_lock:
+            waits = sorted(self._queue_waits)
+
+            def percentile(p: float) -> float:
+                if not waits:
+                    return 0.0
+                return waits[min(len(waits) - 1, int(p * len(waits)))] * 1000
+
+            return {
+                "backend": self.name,
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": self.max_wait * 1000,
+                "queue_depth": self._queue.qsize(),
+                "batches": self._batches,
+                "requests": self._requests,
+                "sentences": self._sentences,
+                "avg_batch_size": self._sentences / self._batches if self._batches else 0.0,
+                "avg_requests_per_batch": self._requests / self._batches if self._batches else 0.0,
+                "batch_size_histogram": {str(k): v for k, v in self._batch_size_counts.items()},
+                "queue_wait_ms": {
+                    "p50": percentile(0.5),
+                    "p95": percentile(0.95),
+                    "p99": percentile(0.99),
+                    "max": self._max_queue_wait * 1000
+                }
+            }
@@ -0,0 +1,58 @@
+import contextvars
+import threading
+import time
+from typing import Optional
+
+class ComputationCancelled(BaseException):
+    """더 이상 필요 없는 계산을 다음 단계 전에 중단할 때 발생합니다.
+
+    파이프라인 곳곳의 except Exception 처리에 삼켜지지 않도록 asyncio.CancelledError처럼 BaseException을 상속합니다.
+    """
+
+class DeadlineExceededError(ComputationCancelled):
+    """요청의 마감 시간이 지나 계산을 중단할 때 발생합니다."""
+
+class ClientDisconnectedError(ComputationCancelled):
+    """클라이언트가 연결을 끊어 계산을 중단할 때 발생합니다."""
+
+# 기다리던 요청이 모두 마감 시간으로 떠나 공유 계산을 취소할 때 asyncio 취소 메시지로 넘기는 값
+DEADLINE_CANCEL_MESSAGE = "deadline_exceeded"
+
+class CancelToken:
+    """작업 하나의 마감 시간과 취소 신호"""
+
+    __slots__ = ("deadline", "event")
+
+    def __init__(self, deadline: Optional[float] = None, event: threading.Event = None):
+        self.deadline = deadline  # time.monotonic() 기준, None이면 마감 없음
+        self.event = event or threading.Event()
+
+    def cancel(self):
+        self.event.set()
+
+    def expire(self):
+        """마감 시간이 지난 것으로 처리합니다. (이후 확인에서 DeadlineExceededError)"""
+        self.deadline = float("-inf")
+
+    def expired(self, now: float = None) -> bool:
+        return self.deadline is not None and (now if now is not None else time.monotonic()) >= self.deadline
+
+    def check(self):
+        """취소되었거나 마감 시간이 지났으면 예외를 발생시킵니다."""
+        if self.expired():
+            raise DeadlineExceededError("요청 마감 시간이 지났습니다.")
+        if self.event.is_set():
+            raise ComputationCancelled("취소된 작업입니다.")
+
+# 실행 중인 작업의 취소 토큰 (실행기 스레드에서 작업마다 복사한 컨텍스트에 설정)
+_current_token = contextvars.ContextVar("cancel_token", default=None)
+
+def set_current_token(token: Optional[CancelToken]):
+    """현재 컨텍스트에서 실행할 작업의 취소 토큰을 설정합니다."""
+    _current_token.set(token)
+
+def checkpoint():
+    """현재 작업이 취소되었거나 마감 시간이 지났으면 중단합니다. (단계 사이에서 호출)"""
+    token = _current_token.get()
+    if token is not None:
+        token.check()
@@ -0,0 +1,235 @@
+import json
+import os
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .. import config
+from ..utils.versioned_dir import new_version, publish, resolve
+
+class EmbeddingCache:
+    """정규화된 텍스트를 키로 하는 프로세스 공용 임베딩 캐시 (메모리 LRU + 디스크 계층)
+
+    저장되는 임베딩은 모두 L2 정규화된 float32 벡터이므로 내적이 곧 코사인 유사도입니다.
+    namespace(모델 + 인코더 백엔드)가 다른 디스크 계층은 임베딩이 호환되지 않으므로 읽지 않습니다.
+    """
+
+    VECTORS_FILE = "embeddings.f32"
+    INDEX_FILE = "index.json"
+    CURRENT_LINK = "current"  # 현재 버전 디렉터리를 가리키는 링크
+
+    def __init__(self, max_memory_bytes: int, disk_dir: str = None, disk_max_entries: int = 200000,
+                 namespace: str = ""):
+        self.max_memory_bytes = max_memory_bytes
+        self.namespace = namespace
+        self.disk_dir = disk_dir
+        self.disk_max_entries = disk_max_entries
+
+        self._entries = OrderedDict()  # {key: np.ndarray}
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+
+        # 디스크 계층 (읽기 전용 memmap + 키 인덱스)
+        self._disk_index = {}  # {key: row}
+        self._disk_vectors = None
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if self.disk_dir:
+            self.load_disk()
+
+    @staticmethod
+    def normalize_key(text: str) -> str:
+        """캐시 키로 사용할 정규화된 텍스트를 만듭니다."""
+        return " ".join(unicodedata.normalize("NFC", text).split())
+
+    def get(self, text: str) -> Optional[np.ndarray]:
+        """캐시된 임베딩을 반환합니다. 없으면 None을 반환합니다."""
+        key = self.normalize_key(text)
+        with self._lock:
+            return self._lookup(key)
+
+    def contains(self, texts: List[str]) -> bool:
+        """모든 텍스트의 임베딩이 (메모리 또는 디스크에) 캐시되어 있는지 확인합니다. (통계에 반영하지 않음)"""
+        keys = [self.normalize_key(text) for text in texts]
+        with self._lock:
+            return all(key in self._entries or key in self._disk_index for key in keys)
+
+    def put(self, text: str, embedding: np.ndarray):
+        """임베딩을 정규화하여 캐시에 저장합니다."""
+        key = self.normalize_key(text)
+        with self._lock:
+            self._store(key, _normalize(np.asarray(embedding, dtype=np.float32)))
+
+    def encode(self, model, texts: List[str], store: bool = True) -> np.ndarray:
+        """텍스트 목록의 임베딩을 반환합니다. 캐시에 없는 텍스트만 한 번에 배치 인코딩합니다.
+
+        store가 False면 새로 인코딩한 임베딩을 캐시에 넣지 않습니다. (대량 가져오기가 자주 쓰는 항목을 밀어내지 않도록)
+        """
+        keys = [self.normalize_key(text) for text in texts]
+        found = {}
+        missing = []
+
+        with self._lock:
+            for key in dict.fromkeys(keys):
+                embedding = self._lookup(key)
+                if embedding is None:
+                    missing.append(key)
+                else:
+                    found[key] = embedding
+
+        if missing:
+            encoded = model.encode(missing, convert_to_numpy=True, show_progress_bar=False)
+            encoded = _normalize(np.asarray(encoded, dtype=np.float32).reshape(len(missing), -1))
+            if store:
+                with self._lock:
+                    for key, embedding in zip(missing, encoded):
+                        embedding = embedding.copy()
+                        self._store(key, embedding)
+                        found[key] = embedding
+            else:
+                found.update(zip(missing, encoded))
+
+        if not keys:
+            return np.zeros((0, 0), dtype=np.float32)
+        return np.stack([found[key] for key in keys])
+
+    def _lookup(self, key: str) -> Optional[np.ndarray]:
+        """메모리 → 디스크 순으로 조회합니다. (잠금 상태에서 호출)"""
+        embedding = self._entries.get(key)
+        if embedding is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return embedding
+
+        row = self._disk_index.get(key)
+        if row is not None:
+            # 디스크에서 찾은 항목은 메모리 계층으로 승격
+            embedding = np.array(self._disk_vectors[row], dtype=np.float32)
+            self._store(key, embedding)
+            self.disk_hits += 1
+            return embedding
+
+        self.misses += 1
+        return None
+
+    def _store(self, key: str, embedding: np.ndarray):
+        """메모리 계층에 저장하고 한도를 넘으면 가장 오래된 항목부터 제거합니다. (잠금 상태에서 호출)"""
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._memory_bytes -= previous.nbytes
+
+        self._entries[key] = embedding
+        self._memory_bytes += embedding.nbytes
+
+        while self._memory_bytes > self.max_memory_bytes and len(self._entries) > 1:
+            _, evicted = self._entries.popitem(last=False)
+            self._memory_bytes -= evicted.nbytes
+            self.evictions += 1
+
+    def load_disk(self):
+        """디스크 계층의 인덱스를 읽고 임베딩 파일을 memmap으로 엽니다."""
+        # 인덱스와 임베딩 파일을 같은 버전에서 읽도록 링크를 한 번만 해석 (없으면 이전 형식의 파일)
+        current_path = os.path.join(self.disk_dir, self.CURRENT_LINK)
+        version = resolve(current_path) if os.path.exists(current_path) else self.disk_dir
+        index_path = os.path.join(version, self.INDEX_FILE)
+        vectors_path = os.path.join(version, self.VECTORS_FILE)
+        if not os.path.exists(index_path) or not os.path.exists(vectors_path):
+            return
+
+        try:
+            with open(index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+            if index.get("namespace", "") != self.namespace:
+                print(f"임베딩 캐시 디스크 계층 건너뜀: namespace 불일치 ({index.get('namespace', '')} != {self.namespace})")
+                return
+            keys = index["keys"]
+            expected_bytes = len(keys) * index["dim"] * np.dtype(np.float32).itemsize
+            if index.get("rows", len(keys)) != len(keys) or os.path.getsize(vectors_path) != expected_bytes:
+                print("임베딩 캐시 디스크 계층 건너뜀: 인덱스와 임베딩 파일의 행 수 불일치")
+                return
+            vectors = None
+            if keys:
+                vectors = np.memmap(vectors_path, dtype=np.float32, mode="r",
+                                    shape=(len(keys), index["dim"]))
+        except Exception as e:
+            print(f"임베딩 캐시 로드 오류: {e}")
+            return
+
+        with self._lock:
+            self._disk_index = {key: row for row, key in enumerate(keys)}
+            self._disk_vectors = vectors
+        print(f"임베딩 캐시 디스크 계층 로드: {len(keys)}개")
+
+    def save_disk(self):
+        """메모리 계층의 항목을 디스크 계층과 병합하여 저장합니다."""
+        if not self.disk_dir:
+            return
+
+        with self._lock:
+            # 최근 사용한 메모리 항목을 우선하고, 남는 자리를 기존 디스크 항목으로 채움
+            merged = OrderedDict(reversed(list(self._entries.items())))
+            for key, row in self._disk_index.items():
+                if len(merged) >= self.disk_max_entries:
+                    break
+                if key not in merged:
+                    merged[key] = np.array(self._disk_vectors[row], dtype=np.float32)
+
+        keys = list(merged.keys())[:self.disk_max_entries]
+        if not keys:
+            return
+        dim = len(merged[keys[0]])
+
+        # 다른 워커가 읽는 중일 수 있으므로 새 버전 디렉터리에 두 파일을 모두 쓴 뒤 링크를 원자적으로 교체
+        os.makedirs(self.disk_dir, exist_ok=True)
+        current_path = os.path.join(self.disk_dir, self.CURRENT_LINK)
+        version = new_version(current_path)
+        np.stack([merged[key] for key in keys]).astype(np.float32).tofile(os.path.join(version, self.VECTORS_FILE))
+        with open(os.path.join(version, self.INDEX_FILE), "w", encoding="utf-8") as f:
+            json.dump({"namespace": self.namespace, "dim": dim, "rows": len(keys), "keys": keys}, f, ensure_ascii=False)
+        publish(current_path, version)
+
+        self.load_disk()
+
+    def get_stats(self) -> Dict:
+        """캐시 통계를 반환합니다."""
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "namespace": self.namespace,
+                "entries": len(self._entries),
+                "memory_bytes": self._memory_bytes,
+                "max_memory_bytes": self.max_memory_bytes,
+                "disk_entries": len(self._disk_index),
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0
+            }
+
+def _normalize(embeddings: np.ndarray) -> np.ndarray:
+    """임베딩을 L2 정규화합니다."""
+    norms = np.linalg.norm(embeddings, axis=-1, keepdims=True)
+    return embeddings / np.maximum(norms, 1e-12)
+
+# 프로세스 전역 캐시
+_embedding_cache = None
+
+def get_embedding_cache() -> EmbeddingCache:
+    """프로세스 전역 임베딩 캐시를 반환합니다. 없으면 설정값으로 생성합니다."""
+    global _embedding_cache
+    if _embedding_cache is None:
+        _embedding_cache = EmbeddingCache(
+            max_memory_bytes=int(config.EMBEDDING_CACHE_MAX_MB * 1024 * 1024),
+            disk_dir=config.EMBEDDING_CACHE_DIR,
+            disk_max_entries=config.EMBEDDING_CACHE_DISK_MAX_ENTRIES,
+            namespace=f"{config.MODEL_NAME}:{config.ENCODER_BACKEND}"
+        )
+    return _embedding_cache
@@ -0,0 +1,187 @@
+import os
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, List, Union
+
+import numpy as np
+import torch
+from sentence_transformers import SentenceTransformer
+
+from .. import config
+
+class EncoderBackend(ABC):
+    """문장 임베딩 인코더 인터페이스 (SentenceTransformer.encode와 같은 호출 방식, encode와 차원을 구현해야 생성 가능)"""
+
+    name = None
+    fork_safe = True  # fork 전에 로드해 prefork 워커들이 공유해도 되는지 여부
+
+    @abstractmethod
+    def encode(self, sentences: Union[str, List[str]], batch_size: int = 32, **kwargs) -> np.ndarray:
+        """문장(또는 문장 목록)의 임베딩을 float32 numpy 배열로 반환합니다."""
+
+    @abstractmethod
+    def get_sentence_embedding_dimension(self) -> int:
+        """임베딩 차원을 반환합니다."""
+
+    def check_agreement(self, reference: "EncoderBackend", texts: List[str]) -> Dict:
+        """기준 인코더와의 임베딩 코사인 유사도를 비교합니다."""
+        ours = _normalize(np.asarray(self.encode(texts), dtype=np.float32))
+        theirs = _normalize(np.asarray(reference.encode(texts), dtype=np.float32))
+        cosines = (ours * theirs).sum(axis=1)
+        return {
+            "backend": self.name,
+            "reference": reference.name,
+            "texts": len(texts),
+            "min_cosine": float(cosines.min()),
+            "mean_cosine": float(cosines.mean())
+        }
+
+    def measure_throughput(self, texts: List[str], batch_size: int = 32, repeat: int = 3) -> Dict:
+        """인코딩 처리량(문장/초)을 측정합니다. 첫 실행은 워밍업으로 제외합니다."""
+        self.encode(texts[:batch_size], batch_size=batch_size)
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            self.encode(texts, batch_size=batch_size)
+            timings.append(time.perf_counter() - started)
+        best = min(timings)
+        return {
+            "backend": self.name,
+            "texts": len(texts),
+            "batch_size": batch_size,
+            "seconds": best,
+            "sentences_per_second": len(texts) / best if best > 0 else 0.0
+        }
+
+class TorchEncoderBackend(EncoderBackend):
+    """sentence-transformers fp32 torch 추론"""
+
+    name = "torch"
+
+    def __init__(self, model_name: str, model: SentenceTransformer = None):
+        self.model_name = model_name
+        self.model = model or SentenceTransformer(model_name, device="cpu")
+
+    def encode(self, sentences: Union[str, List[str]], batch_size: int = 32, **kwargs) -> np.ndarray:
+        return self.model.encode(sentences, batch_size=batch_size, convert_to_numpy=True, show_progress_bar=False)
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.model.get_sentence_embedding_dimension()
+
+class QuantizedTorchEncoderBackend(TorchEncoderBackend):
+    """Linear 계층을 int8로 동적 양자화한 torch CPU 추론"""
+
+    name = "torch-int8"
+
+    def __init__(self, model_name: str, model: SentenceTransformer = None):
+        model = model or SentenceTransformer(model_name, device="cpu")
+        quantized = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        super().__init__(model_name, quantized)
+
+class OnnxEncoderBackend(EncoderBackend):
+    """트랜스포머를 ONNX 그래프로 내보내 onnxruntime으로 실행하는 추론 (onnxruntime 설치 시)
+
+    풀링은 mean pooling만 지원합니다. 내보낸 그래프는 캐시 경로에 저장해 재사용합니다.
+    """
+
+    name = "onnx"
+    fork_safe = False  # onnxruntime 세션은 생성 시 스레드 풀을 띄우므로 워커마다 따로 로드
+
+    def __init__(self, model_name: str, model: SentenceTransformer = None, onnx_path: str = None,
+                 threads: int = 0):
+        import onnxruntime  # 선택 의존성
+
+        model = model or SentenceTransformer(model_name, device="cpu")
+        pooling = model[1] if len(model) > 1 else None
+        mean_pooling = getattr(pooling, "pooling_mode_mean_tokens", False) or getattr(pooling, "pooling_mode", None) == "mean"
+        if len(model) != 2 or not mean_pooling:
+            raise ValueError("ONNX 백엔드는 mean pooling 모델만 지원합니다.")
+
+        self.model_name = model_name
+        self.tokenizer = model.tokenizer
+        self.max_seq_length = model.max_seq_length
+        self.dimension = model.get_sentence_embedding_dimension()
+
+        onnx_path = onnx_path or os.path.join(config.ONNX_CACHE_DIR, model_name.replace("/", "__") + ".onnx")
+        if not os.path.exists(onnx_path):
+            self._export(model, onnx_path)
+
+        options = onnxruntime.SessionOptions()
+        if threads > 0:
+            options.intra_op_num_threads = threads
+        self.session = onnxruntime.InferenceSession(onnx_path, options, providers=["CPUExecutionProvider"])
+
+    def _export(self, model: SentenceTransformer, onnx_path: str):
+        """트랜스포머 본체를 ONNX로 내보냅니다."""
+        class _TokenEmbeddings(torch.nn.Module):
+            def __init__(self, transformer):
+                super().__init__()
+                self.transformer = transformer
+
+            def forward(self, input_ids, attention_mask):
+                return self.transformer(input_ids=input_ids, attention_mask=attention_mask)[0]
+
+        os.makedirs(os.path.dirname(onnx_path) or ".", exist_ok=True)
+        sample = self.tokenizer(["워밍업 문장", "예시"], padding=True, return_tensors="pt")
+        module = _TokenEmbeddings(model[0].auto_model).eval()
+        tmp_path = f"{onnx_path}.tmp-{os.getpid()}"
+        with torch.no_grad():
+            torch.onnx.export(
+                module,
+                (sample["input_ids"], sample["attention_mask"]),
+                tmp_path,
+                input_names=["input_ids", "attention_mask"],
+                output_names=["token_embeddings"],
+                dynamic_axes={
+                    "input_ids": {0: "batch", 1: "sequence"},
+                    "attention_mask": {0: "batch", 1: "sequence"},
+                    "token_embeddings": {0: "batch", 1: "sequence"}
+                },
+                opset_version=14
+            )
+        os.replace(tmp_path, onnx_path)
+        print(f"ONNX 그래프 내보내기 완료: {onnx_path}")
+
+    def encode(self, sentences: Union[str, List[str]], batch_size: int = 32, **kwargs) -> np.ndarray:
+        single = isinstance(sentences, str)
+        sentence_list = [sentences] if single else list(sentences)
+
+        outputs = []
+        for start in range(0, len(sentence_list), batch_size):
+            tokens = self.tokenizer(
+                sentence_list[start:start + batch_size],
+                padding=True,
+                truncation=True,
+                max_length=self.max_seq_length,
+                return_tensors="np"
+            )
+            mask = tokens["attention_mask"].astype(np.int64)
+            token_embeddings = self.session.run(None, {
+                "input_ids": tokens["input_ids"].astype(np.int64),
+                "attention_mask": mask
+            })[0]
+            # mean pooling
+            weights = mask[:, :, np.newaxis].astype(np.float32)
+            outputs.append((token_embeddings * weights).sum(axis=1) / np.maximum(weights.sum(axis=1), 1e-9))
+
+        embeddings = np.concatenate(outputs) if outputs else np.zeros((0, self.dimension), dtype=np.float32)
+        return embeddings[0] if single else embeddings.astype(np.float32)
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.dimension
+
+ENCODER_BACKENDS = {
+    TorchEncoderBackend.name: TorchEncoderBackend,
+    QuantizedTorchEncoderBackend.name: QuantizedTorchEncoderBackend,
+    OnnxEncoderBackend.name: OnnxEncoderBackend
+}
+
+def create_encoder_backend(name: str, model_name: str, model: SentenceTransformer = None) -> EncoderBackend:
+    """이름으로 인코더 백엔드를 생성합니다. 이미 로드한 모델이 있으면 재사용합니다."""
+    if name not in ENCODER_BACKENDS:
+        raise ValueError(f"지원하지 않는 인코더 백엔드입니다: {name} (가능한 값: {', '.join(ENCODER_BACKENDS)})")
+    return ENCODER_BACKENDS[name](model_name, model)
+
+def _normalize(embeddings: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(embeddings, axis=-1, keepdims=True)
+    return embeddings / np.maximum(norms, 1e-12)
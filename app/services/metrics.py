@@ -0,0 +1,104 @@
+import bisect
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+# 지연 시간 히스토그램 구간 (초)
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+class Histogram:
+    """라벨 값별로 집계하는 Prometheus 형식 히스토그램
+
+    관측 한 번은 구간 탐색과 짧은 잠금뿐이라 운영 환경에서 항상 켜 두어도 부담이 작습니다.
+    """
+
+    def __init__(self, name: str, help_text: str, label: str, buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label = label
+        self.buckets = tuple(buckets)
+        self._series = {}  # {라벨 값: [구간별 개수, 합계]}
+        self._lock = threading.Lock()
+
+    def observe(self, label_value: str, value: float):
+        """값 하나를 기록합니다."""
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_value)
+            if series is None:
+                series = self._series[label_value] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def render(self) -> List[str]:
+        """Prometheus 텍스트 형식의 줄 목록을 반환합니다."""
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {key: (list(counts), total) for key, (counts, total) in self._series.items()}
+
+        for label_value, (counts, total) in sorted(series.items()):
+            label = f'{self.label}="{label_value}"'
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{label},le="{bound}"}} {cumulative}')
+            cumulative += counts[-1]
+            lines.append(f'{self.name}_bucket{{{label},le="+Inf"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{label}}} {total}")
+            lines.append(f"{self.name}_count{{{label}}} {cumulative}")
+        return lines
+
+    def get_stats(self) -> Dict:
+        """라벨 값별 관측 수와 평균(ms)을 반환합니다."""
+        with self._lock:
+            return {
+                label_value: {
+                    "count": sum(counts),
+                    "avg_ms": total / sum(counts) * 1000 if sum(counts) else 0.0
+                }
+                for label_value, (counts, total) in self._series.items()
+            }
+
+stage_latency = Histogram("glasscard_stage_seconds", "처리 단계별 소요 시간", label="stage")
+request_latency = Histogram("glasscard_request_seconds", "엔드포인트별 요청 처리 시간", label="endpoint")
+
+# 요청별 단계 시간 ({단계: 초}), 요청에서 켰을 때만 기록 (스레드 풀로는 컨텍스트 복사로 전달)
+_request_timings = contextvars.ContextVar("request_timings", default=None)
+
+def record_stage(name: str, seconds: float):
+    """단계 소요 시간을 히스토그램과 (켜져 있으면) 현재 요청의 단계 시간에 기록합니다."""
+    stage_latency.observe(name, seconds)
+    timings = _request_timings.get()
+    if timings is not None:
+        timings[name] = timings.get(name, 0.0) + seconds
+
+@contextmanager
+def stage(name: str):
+    """블록의 소요 시간을 단계 시간으로 기록합니다."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(name, time.perf_counter() - started)
+
+def start_request_timings(enabled: bool) -> Optional[Dict[str, float]]:
+    """현재 요청의 단계 시간 기록을 시작합니다. 켜지 않으면 None을 반환합니다."""
+    if not enabled:
+        return None
+    timings = {}
+    _request_timings.set(timings)
+    return timings
+
+def format_server_timing(timings: Dict[str, float]) -> str:
+    """단계 시간을 Server-Timing 헤더 값으로 변환합니다. (단위: ms)"""
+    return ", ".join(f"{name};dur={seconds * 1000:.3f}" for name, seconds in timings.items())
+
+def render_metric(name: str, metric_type: str, help_text: str, values: Dict[str, float], label: str = None) -> List[str]:
+    """gauge/counter 지표를 Prometheus 텍스트 형식의 줄 목록으로 변환합니다. (values: {라벨 값: 값})"""
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} {metric_type}"]
+    for label_value, value in values.items():
+        suffix = f'{{{label}="{label_value}"}}' if label else ""
+        lines.append(f"{name}{suffix} {float(value)}")
+    return lines
@@ -0,0 +1,158 @@
+import gc
+import os
+import signal
+import socket
+import time
+from typing import Callable, List, Optional
+
+import torch
+import uvicorn
+
+# 워커별 스레드 수를 따르는 네이티브 스레드 풀 환경 변수
+THREAD_ENV_VARS = ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS", "NUMEXPR_NUM_THREADS")
+
+# 현재 프로세스의 prefork 워커 번호 (prefork 워커가 아니면 None)
+_worker_index = None
+
+def is_primary_process() -> bool:
+    """공유 파일(스냅샷, 캐시 디스크 계층)을 저장할 프로세스인지 확인합니다. (단일 프로세스 또는 0번 워커)"""
+    return _worker_index is None or _worker_index == 0
+
+def available_cpus() -> List[int]:
+    """현재 프로세스가 사용할 수 있는 CPU 코어 목록을 반환합니다."""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+def plan_worker_threads(workers: int, threads: int = 0) -> int:
+    """워커당 torch/BLAS 스레드 수를 정합니다. 지정하지 않으면 코어를 워커 수로 나눕니다."""
+    if threads > 0:
+        return threads
+    return max(1, len(available_cpus()) // max(1, workers))
+
+def check_oversubscription(workers: int, threads: int) -> Optional[str]:
+    """워커 수 × 워커당 스레드 수가 코어 수를 넘으면 경고 메시지를 반환합니다."""
+    cores = len(available_cpus())
+    if workers * threads > cores:
+        return (f"스레드 초과 할당: 워커 {workers}개 × 스레드 {threads}개 = {workers * threads} > 코어 {cores}개. "
+                f"GLASSCARD_WORKER_THREADS를 {max(1, cores // workers)} 이하로 낮추세요.")
+    return None
+
+def plan_cpu_sets(workers: int, threads: int) -> List[List[int]]:
+    """워커별로 겹치지 않는 연속된 코어 묶음을 배정합니다. (코어가 모자라면 순환)"""
+    cpus = available_cpus()
+    per_worker = min(threads, len(cpus))
+    return [[cpus[(index * per_worker + offset) % len(cpus)] for offset in range(per_worker)]
+            for index in range(workers)]
+
+def apply_thread_budget(threads: int, cpus: List[int] = None):
+    """현재 프로세스의 torch/BLAS 스레드 수를 제한하고, 코어 목록이 있으면 해당 코어에 고정합니다."""
+    for name in THREAD_ENV_VARS:
+        os.environ[name] = str(threads)
+    torch.set_num_threads(threads)
+    try:
+        from threadpoolctl import threadpool_limits  # 선택 의존성 (이미 로드된 numpy BLAS 제한)
+        threadpool_limits(limits=threads)
+    except ImportError:
+        pass
+    if cpus and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, cpus)
+
+class PreforkServer:
+    """리스닝 소켓을 먼저 연 뒤 워커 프로세스를 fork하여 같은 소켓으로 요청을 나눠 받는 서버
+
+    fork 전에 부모 프로세스에서 로드한 모델 가중치는 워커들이 copy-on-write로 공유합니다.
+    JVM, 스레드, 스레드 풀은 fork 이후 각 워커의 startup 단계에서 만들어집니다.
+    비정상 종료된 워커는 다시 띄웁니다.
+    """
+
+    def __init__(self, app, host: str, port: int, workers: int, threads: int = 0, cpu_pinning: bool = False,
+                 on_worker_start: Callable[[int], None] = None):
+        self.app = app
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.threads = plan_worker_threads(workers, threads)
+        self.cpu_sets = plan_cpu_sets(workers, self.threads) if cpu_pinning else None
+        self.on_worker_start = on_worker_start
+
+        self._sock = None
+        self._children = {}  # {pid: 워커 번호}
+        self._stopping = False
+
+    def run(self):
+        """워커들을 띄우고 모두 종료될 때까지 감독합니다."""
+        warning = check_oversubscription(self.workers, self.threads)
+        if warning:
+            print(f"⚠️ {warning}")
+        print(f"prefork 서버 시작: 워커 {self.workers}개, 워커당 스레드 {self.threads}개"
+              f"{', CPU 고정 ' + str(self.cpu_sets) if self.cpu_sets else ''}")
+
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._sock.bind((self.host, self.port))
+        self._sock.listen(2048)
+        self._sock.set_inheritable(True)
+
+        # 공유 객체를 GC 추적 대상에서 빼서 워커의 GC가 페이지를 복사하게 만들지 않도록 함
+        gc.collect()
+        gc.freeze()
+
+        for index in range(self.workers):
+            self._spawn(index)
+
+        signal.signal(signal.SIGTERM, self._stop)
+        signal.signal(signal.SIGINT, self._stop)
+
+        while self._children:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            index = self._children.pop(pid, None)
+            if index is None or self._stopping:
+                continue
+            print(f"워커 {index} (pid {pid})가 종료되었습니다 (status {status}). 다시 시작합니다.")
+            time.sleep(1)
+            self._spawn(index)
+
+        self._sock.close()
+        print("prefork 서버가 종료되었습니다.")
+
+    def _spawn(self, index: int):
+        """워커 프로세스 하나를 fork합니다."""
+        pid = os.fork()
+        if pid == 0:
+            exit_code = 0
+            try:
+                self._run_worker(index)
+            except BaseException as e:
+                print(f"워커 {index} 오류: {e}")
+                exit_code = 1
+            finally:
+                os._exit(exit_code)
+        self._children[pid] = index
+
+    def _run_worker(self, index: int):
+        """워커 프로세스에서 스레드 예산을 적용하고 uvicorn 서버를 실행합니다."""
+        global _worker_index
+        _worker_index = index
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+
+        cpus = self.cpu_sets[index] if self.cpu_sets else None
+        apply_thread_budget(self.threads, cpus)
+        if self.on_worker_start:
+            self.on_worker_start(index)
+
+        server = uvicorn.Server(uvicorn.Config(self.app, host=self.host, port=self.port, lifespan="on"))
+        server.run(sockets=[self._sock])
+
+    def _stop(self, signum, frame):
+        """워커들에 종료 신호를 전달합니다."""
+        self._stopping = True
+        for pid in list(self._children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
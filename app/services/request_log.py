@@ -0,0 +1,179 @@
+import json
+import queue
+import random
+import sys
+import threading
+import time
+from typing import Dict, List
+
+from .. import config
+
+class RequestLogger:
+    """요청 로그를 JSON 한 줄로 백그라운드에서 기록하는 로거
+
+    요청 경로에서는 크기가 정해진 큐에 넣기만 하고, 큐가 가득 차면 기다리지 않고 버립니다.
+    오류와 낮은 점수(이상치)는 항상 기록하고, 나머지는 sample_rate 비율만 기록합니다.
+    verbose 모드에서는 모든 요청을 사람이 읽기 쉬운 형식으로 출력합니다. (로컬 디버깅용)
+    """
+
+    def __init__(self, sample_rate: float = 0.01, low_score_threshold: float = 0.3, queue_size: int = 10000,
+                 verbose: bool = False, stream=None):
+        self.sample_rate = sample_rate
+        self.low_score_threshold = low_score_threshold
+        self.verbose = verbose
+        self.stream = stream or sys.stdout
+
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        self.logged = 0
+        self.sampled_out = 0
+        self.dropped = 0
+
+        self._worker = threading.Thread(target=self._run, name="request-log", daemon=True)
+        self._worker.start()
+
+    def sample_reason(self, event: Dict) -> str:
+        """이벤트를 기록할 이유를 반환합니다. 기록하지 않으면 None을 반환합니다."""
+        if self.verbose:
+            return "verbose"
+        if event.get("error"):
+            return "error"
+        total_score = event.get("total_score")
+        if total_score is not None and total_score < self.low_score_threshold:
+            return "low_score"
+        if random.random() < self.sample_rate:
+            return "sampled"
+        return None
+
+    def log(self, event: Dict):
+        """샘플링 조건에 맞으면 이벤트를 기록 대기열에 넣습니다. (막히지 않음)"""
+        reason = self.sample_reason(event)
+        if reason is None:
+            with self._lock:
+                self.sampled_out += 1
+            return
+
+        event["ts"] = time.time()
+        event["sample"] = reason
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+
+    def close(self):
+        """남은 로그를 기록하고 백그라운드 스레드를 종료합니다."""
+        self._queue.put(None)
+        self._worker.join(timeout=5)
+
+    def _run(self):
+        """대기열의 이벤트를 모아 한 번에 기록합니다."""
+        while True:
+            events = [self._queue.get()]
+            while not self._queue.empty() and len(events) < 256:
+                events.append(self._queue.get_nowait())
+
+            stop = None in events
+            lines = [self._format(event) for event in events if event is not None]
+            if lines:
+                try:
+                    self.stream.write("".join(lines))
+                    self.stream.flush()
+                except Exception:
+                    pass
+                with self._lock:
+                    self.logged += len(lines)
+            if stop:
+                return
+
+    def _format(self, event: Dict) -> str:
+        """이벤트를 출력할 문자열로 변환합니다."""
+        if not self.verbose:
+            return json.dumps(event, ensure_ascii=False, default=str) + "\n"
+
+        # 사람이 읽기 쉬운 형식 (로컬 디버깅용)
+        lines = [f"🔍 [{event.get('endpoint')}] {event.get('status')} ({event.get('latency_ms', 0):.1f}ms)"]
+        if "meaning" in event:
+            lines.append(f"   입력: '{event['meaning']}' vs '{event['user_input']}'")
+        if event.get("error"):
+            lines.append(f"   오류: {event['error']}")
+        if "total_score" in event:
+            lines.append(f"   총 점수: {event['total_score']:.3f}")
+            lines.append(f"   의미 유사도: {event['semantic_similarity']:.3f}")
+            lines.append(f"   품사 매칭: {event['pos_matching_score']:.3f}")
+            lines.append(f"   동의어 점수: {event['synonym_score']:.3f}")
+            lines.append(f"   키워드 점수: {event['keyword_score']:.3f}")
+        for i, comp in enumerate(event.get("top_comparisons", []), 1):
+            similarity = comp["similarity_score"]
+            match_type = "🎯 정확한 일치" if comp["meaning_word"] == comp["user_word"] else \
+                        "⭐ 높은 유사도" if similarity > 0.7 else \
+                        "🔄 중간 유사도" if similarity >= 0.4 else "📉 낮은 유사도"
+            lines.append(f"     {i}. {comp['meaning_word']} ↔ {comp['user_word']}: {similarity:.3f} ({match_type})")
+        for key in ("items", "errors"):
+            if key in event:
+                lines.append(f"   {key}: {event[key]}")
+        lines.append("-" * 60)
+        return "\n".join(lines) + "\n"
+
+    def get_stats(self) -> Dict:
+        """로거 통계를 반환합니다."""
+        with self._lock:
+            return {
+                "sample_rate": self.sample_rate,
+                "verbose": self.verbose,
+                "queue_depth": self._queue.qsize(),
+                "logged": self.logged,
+                "sampled_out": self.sampled_out,
+                "dropped": self.dropped
+            }
+
+def comparison_event(endpoint: str, meaning: str, user_input: str, analysis_result: Dict,
+                     individual_comparisons: List[Dict], latency_ms: float, status: int = 200) -> Dict:
+    """단어 비교 요청 한 건의 로그 이벤트를 만듭니다. (모든 점수 구성 요소 포함)"""
+    event = {
+        "endpoint": endpoint,
+        "status": status,
+        "latency_ms": latency_ms,
+        "meaning": meaning,
+        "user_input": user_input
+    }
+    if "error" in analysis_result:
+        event["incomplete_input"] = analysis_result.get("incomplete_input", False)
+        return event
+
+    for key in ("total_score", "semantic_similarity", "pos_matching_score", "synonym_score", "keyword_score"):
+        event[key] = analysis_result[key]
+    event["meaning_words"] = len(analysis_result["meaning_words"])
+    event["user_words"] = len(analysis_result["user_words"])
+    event["top_comparisons"] = [
+        {
+            "meaning_word": comp["meaning_word"],
+            "user_word": comp["user_word"],
+            "similarity_score": comp["similarity_score"]
+        }
+        for comp in individual_comparisons[:3]
+    ]
+    return event
+
+# 프로세스 전역 요청 로거 (prefork 워커마다 fork 이후 첫 사용 시 생성)
+_request_logger = None
+_request_logger_lock = threading.Lock()
+
+def get_request_logger() -> RequestLogger:
+    """프로세스 전역 요청 로거를 반환합니다. 없으면 설정값으로 생성합니다."""
+    global _request_logger
+    if _request_logger is None:
+        with _request_logger_lock:
+            if _request_logger is None:
+                _request_logger = RequestLogger(
+                    sample_rate=config.LOG_SAMPLE_RATE,
+                    low_score_threshold=config.LOG_LOW_SCORE_THRESHOLD,
+                    queue_size=config.LOG_QUEUE_SIZE,
+                    verbose=config.LOG_VERBOSE
+                )
+    return _request_logger
+
+def close_request_logger():
+    """요청 로거가 있으면 남은 로그를 기록하고 종료합니다."""
+    if _request_logger is not None:
+        _request_logger.close()
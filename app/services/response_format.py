@@ -0,0 +1,116 @@
+import json
+from typing import Dict, List, Optional
+
+try:
+    import orjson  # 더 빠른 JSON 직렬화 (requirements.txt에 포함, 없는 환경에서는 표준 json 사용)
+except ImportError:
+    orjson = None
+
+from fastapi.responses import JSONResponse
+
+# 응답 형식
+VIEW_FULL = "full"          # 기존 형식: 모든 단어 쌍의 비교 결과 (기본값)
+VIEW_TOP_K = "top_k"        # 유사도 상위 top_k개 단어 쌍만
+VIEW_COLUMNAR = "columnar"  # 단어 배열 + 유사도 행렬
+VIEWS = (VIEW_FULL, VIEW_TOP_K, VIEW_COLUMNAR)
+
+# fields로 고를 수 있는 항목 (분석 결과 키 + 비교 결과)
+ANALYSIS_FIELDS = (
+    "semantic_similarity", "pos_matching_score", "synonym_score", "keyword_score", "total_score",
+    "meaning_words", "user_words", "meaning_pos_info", "user_pos_info", "tier"
+)
+COMPARISONS_FIELD = "comparisons"
+
+def dumps(content) -> bytes:
+    """JSON 바이트로 직렬화합니다. (orjson이 있으면 orjson, 없으면 표준 json)"""
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+class FastJSONResponse(JSONResponse):
+    """dumps로 직렬화하는 JSONResponse"""
+
+    def render(self, content) -> bytes:
+        return dumps(content)
+
+class ResponseFormat:
+    """단어 비교 응답의 형식 (요청 옵션)
+
+    비교 결과는 필요한 만큼만 만듭니다. top_k는 상위 k개 항목만, columnar는 항목 dict 없이
+    행렬 그대로, fields에 comparisons가 없으면 비교 결과 자체를 만들지 않습니다.
+    """
+
+    def __init__(self, view: str = VIEW_FULL, top_k: int = None, fields: List[str] = None):
+        if view not in VIEWS:
+            raise ValueError(f"view는 {', '.join(VIEWS)} 중 하나여야 합니다.")
+        if top_k is not None and top_k < 1:
+            raise ValueError("top_k는 1 이상이어야 합니다.")
+        unknown = [field for field in fields or [] if field not in ANALYSIS_FIELDS + (COMPARISONS_FIELD,)]
+        if unknown:
+            raise ValueError(f"알 수 없는 필드: {', '.join(unknown)}")
+
+        self.view = view
+        self.top_k = top_k if top_k is not None else (5 if view == VIEW_TOP_K else None)
+        self.fields = set(fields) if fields else None
+
+    @classmethod
+    def parse(cls, view: str = VIEW_FULL, top_k: int = None, fields: str = None) -> "ResponseFormat":
+        """쿼리 파라미터 값으로 형식을 만듭니다. (fields는 쉼표로 구분)"""
+        field_list = [field.strip() for field in fields.split(",") if field.strip()] if fields else None
+        return cls(view=view, top_k=top_k, fields=field_list)
+
+    @property
+    def is_default(self) -> bool:
+        return self.view == VIEW_FULL and self.top_k is None and self.fields is None
+
+    @property
+    def cache_key(self) -> tuple:
+        """결과 캐시 키에 넣을 형식 식별값입니다."""
+        return self.view, self.top_k, tuple(sorted(self.fields)) if self.fields is not None else None
+
+    @property
+    def include_comparisons(self) -> bool:
+        return self.fields is None or COMPARISONS_FIELD in self.fields
+
+    def build_comparisons(self, service, analysis_result: Dict, similarity_matrix: List[List[float]]):
+        """형식에 맞는 비교 결과를 만듭니다. 포함하지 않으면 None을 반환합니다."""
+        if not self.include_comparisons:
+            return None
+        meaning_words, user_words = analysis_result["meaning_words"], analysis_result["user_words"]
+        if self.view == VIEW_COLUMNAR:
+            return {
+                "meaning_words": meaning_words,
+                "user_words": user_words,
+                "similarity_matrix": similarity_matrix
+            }
+        return service.compare_individual_words(meaning_words, user_words, similarity_matrix, top_k=self.top_k)
+
+    def format(self, analysis_result: Dict, comparisons) -> Dict:
+        """성공한 분석 결과를 응답 본문으로 만듭니다."""
+        if self.is_default:
+            return {
+                "success": True,
+                "analysis": analysis_result,
+                "individual_comparisons": comparisons
+            }
+
+        analysis = analysis_result
+        if self.view == VIEW_COLUMNAR and comparisons is not None:
+            # 단어 배열은 비교 결과에 있으므로 분석 결과에서는 생략
+            analysis = {key: value for key, value in analysis.items() if key not in ("meaning_words", "user_words")}
+        if self.fields is not None:
+            # 비교 결과가 일부 단어 쌍뿐이라는 표시는 비교 결과를 포함하면 항상 함께 보냄
+            keep = self.fields | {"partial_comparisons"} if comparisons is not None else self.fields
+            analysis = {key: value for key, value in analysis.items() if key in keep}
+
+        body = {"success": True, "analysis": analysis}
+        if comparisons is not None:
+            body["comparisons" if self.view == VIEW_COLUMNAR else "individual_comparisons"] = comparisons
+        return body
+
+    @staticmethod
+    def loggable_comparisons(comparisons) -> Optional[List[Dict]]:
+        """요청 로그에 남길 수 있는 비교 결과 목록을 반환합니다. (columnar 형식은 제외)"""
+        return comparisons if isinstance(comparisons, list) else None
+
+DEFAULT_RESPONSE_FORMAT = ResponseFormat()
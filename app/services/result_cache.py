@@ -0,0 +1,116 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Hashable, Optional
+
+from .cancellation import DEADLINE_CANCEL_MESSAGE, DeadlineExceededError
+
+class ResultCache:
+    """완성된 비교 결과를 저장하는 TTL + 크기 제한 캐시 (단일 비행)
+
+    같은 키의 요청이 동시에 들어오면 계산은 한 번만 하고 기다리던 요청들이 결과를 함께 받습니다.
+    계산은 별도 태스크로 실행하므로 처음 요청한 클라이언트가 연결을 끊어도 나머지는 결과를 받고,
+    기다리던 요청이 모두 취소되면 계산도 취소합니다. 마감 시간은 기다리는 요청마다 따로 적용합니다.
+    이벤트 루프 안에서만 사용하므로 잠금이 없습니다. 실패한 계산은 저장하지 않습니다.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl_seconds: float = 300.0):
+        self.max_entries = max_entries
+        self.ttl = ttl_seconds
+
+        self._entries = OrderedDict()  # {key: (만료 시각, 결과)}
+        self._in_flight = {}  # {key: asyncio.Task}
+        self._waiters = {}  # {asyncio.Task: 기다리는 요청 수}
+
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.expired = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.ttl > 0
+
+    async def get_or_compute(self, key: Hashable, compute: Callable[[], Awaitable], deadline: Optional[float] = None):
+        """캐시된 결과를 반환합니다. 없으면 compute로 한 번만 계산하여 저장합니다.
+
+        deadline(time.monotonic() 기준)까지 결과가 나오지 않으면 이 요청만 DeadlineExceededError로 끝납니다.
+        """
+        if not self.enabled:
+            return await _wait(compute(), deadline)
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            del self._entries[key]
+            self.expired += 1
+
+        task = self._in_flight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            task = asyncio.ensure_future(compute())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._complete(key, done))
+
+        self._waiters[task] = self._waiters.get(task, 0) + 1
+        expired = False
+        try:
+            return await _wait(asyncio.shield(task), deadline)
+        except DeadlineExceededError:
+            expired = True
+            raise
+        finally:
+            self._waiters[task] -= 1
+            if not self._waiters[task]:
+                del self._waiters[task]
+                # 기다리는 요청이 없으면 계산할 필요가 없음 (실행기의 작업도 취소되고,
+                # 마지막 요청이 마감 시간으로 떠났으면 실행기가 취소가 아닌 마감 초과로 셈)
+                if not task.done():
+                    task.cancel(DEADLINE_CANCEL_MESSAGE if expired else None)
+
+    def _complete(self, key: Hashable, task: asyncio.Task):
+        """계산이 끝나면 성공한 결과만 저장합니다."""
+        self._in_flight.pop(key, None)
+        if task.cancelled() or task.exception() is not None:
+            return
+
+        self._entries[key] = (time.monotonic() + self.ttl, task.result())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        """저장된 결과를 모두 지웁니다. (진행 중인 계산은 그대로)"""
+        self._entries.clear()
+
+    def get_stats(self) -> Dict:
+        """캐시 통계를 반환합니다."""
+        lookups = self.hits + self.coalesced + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl,
+            "in_flight": len(self._in_flight),
+            "hits": self.hits,
+            "coalesced": self.coalesced,
+            "misses": self.misses,
+            "expired": self.expired,
+            "evictions": self.evictions,
+            "hit_rate": (self.hits + self.coalesced) / lookups if lookups else 0.0
+        }
+
+async def _wait(awaitable: Awaitable, deadline: Optional[float]):
+    """deadline까지 결과를 기다립니다. 지나면 기다리던 awaitable을 취소하고 DeadlineExceededError를 발생시킵니다."""
+    if deadline is None:
+        return await awaitable
+    try:
+        return await asyncio.wait_for(awaitable, max(deadline - time.monotonic(), 0))
+    except asyncio.TimeoutError:
+        raise DeadlineExceededError("요청 마감 시간이 지났습니다.") from None
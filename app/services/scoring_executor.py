@@ -0,0 +1,232 @@
+import asyncio
+import contextvars
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, NamedTuple, Optional
+
+import torch
+
+from ..utils.text_processor import attach_jvm_thread
+from .cancellation import (
+    DEADLINE_CANCEL_MESSAGE, CancelToken, ComputationCancelled, DeadlineExceededError, set_current_token
+)
+from .metrics import Histogram, record_stage
+
+# 우선순위 레인 (앞에 있을수록 먼저 실행)
+LANE_INTERACTIVE = "interactive"
+LANE_BATCH = "batch"
+LANES = (LANE_INTERACTIVE, LANE_BATCH)
+
+# 작업 결과별 카운터 (completed는 끝까지 실행되어 결과를 낸 작업, failed는 실행 중 예외가 난 작업)
+OUTCOMES = ("completed", "failed", "rejected", "expired", "cancelled")
+
+# 레인별 실행 대기 시간
+lane_wait = Histogram("glasscard_scheduler_wait_seconds", "우선순위 레인별 실행 대기 시간", label="lane")
+
+class ServiceOverloadedError(Exception):
+    """동시 처리 한도를 넘어 요청을 받을 수 없을 때 발생합니다."""
+
+class Schedule(NamedTuple):
+    """작업의 우선순위 레인과 마감 시각 (time.monotonic() 기준, None이면 마감 없음)"""
+    lane: str = LANE_INTERACTIVE
+    deadline: Optional[float] = None
+
+class _Job:
+    __slots__ = ("func", "args", "kwargs", "lane", "token", "context", "loop", "future", "submitted")
+
+    def __init__(self, func, args, kwargs, lane, token, loop):
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.lane = lane
+        self.token = token
+        # 요청별 단계 시간 기록이 작업 스레드에서도 이어지도록 컨텍스트를 복사해 실행
+        self.context = contextvars.copy_context()
+        self.loop = loop
+        self.future = loop.create_future()
+        self.submitted = time.perf_counter()
+
+class ScoringExecutor:
+    """CPU 작업(모델 추론, 형태소 분석)을 이벤트 루프 밖의 전용 스레드에서 실행하는 스케줄러
+
+    작업은 우선순위 레인(interactive → batch) 순서로, 같은 레인 안에서는 들어온 순서대로 실행합니다.
+    마감 시간이 지났거나 요청한 쪽이 취소한 작업은 실행하지 않고 버리며, 실행 중이면 다음 단계 전에 중단합니다.
+    처리 중인 작업 수가 한도(전체, 레인별)에 도달하면 대기열에 쌓지 않고 즉시 ServiceOverloadedError를 발생시킵니다.
+    작업의 자리는 기다리던 쪽이 떠날 때가 아니라 작업이 실제로 끝나거나 대기열에서 버려질 때 반납합니다.
+    """
+
+    def __init__(self, max_workers: int = 4, max_in_flight: int = 64, torch_threads: int = 0,
+                 batch_max_in_flight: int = None):
+        # 모델 추론은 배치 인코더 스레드 하나에서 실행되므로 torch 스레드 수는 워커 수와 곱해지지 않음
+        if torch_threads > 0:
+            torch.set_num_threads(torch_threads)
+
+        self.max_workers = max_workers
+        self.max_in_flight = max_in_flight
+        # batch 레인이 한도를 다 차지하지 않도록 나머지를 interactive용으로 남김
+        self.lane_limits = {
+            LANE_INTERACTIVE: max_in_flight,
+            LANE_BATCH: min(batch_max_in_flight or max_in_flight, max_in_flight)
+        }
+
+        self._cond = threading.Condition()
+        self._queues = {lane: deque() for lane in LANES}
+        self._in_flight = 0
+        self._lane_in_flight = {lane: 0 for lane in LANES}
+        self._lane_counts = {lane: dict.fromkeys(("submitted",) + OUTCOMES, 0) for lane in LANES}
+        self._shutdown = False
+
+        self._workers = [
+            threading.Thread(target=self._work, name=f"scoring_{i}", daemon=True)
+            for i in range(max_workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    async def run(self, func: Callable, *args, schedule: Schedule = Schedule(),
+                  cancel_event: threading.Event = None, **kwargs):
+        """함수를 실행 스레드에서 실행하고 결과를 기다립니다.
+
+        schedule의 마감 시간이 지나면 DeadlineExceededError, cancel_event가 설정되면 ComputationCancelled가 발생합니다.
+        기다리는 쪽이 취소되면(클라이언트 연결 끊김 등) 작업도 취소됩니다.
+        """
+        lane = schedule.lane
+        if lane not in LANES:
+            raise ValueError(f"lane은 {', '.join(LANES)} 중 하나여야 합니다.")
+
+        with self._cond:
+            counts = self._lane_counts[lane]
+            if self._in_flight >= self.max_in_flight or self._lane_in_flight[lane] >= self.lane_limits[lane]:
+                counts["rejected"] += 1
+                raise ServiceOverloadedError("처리 중인 요청이 너무 많습니다. 잠시 후 다시 시도해주세요.")
+            self._in_flight += 1
+            self._lane_in_flight[lane] += 1
+            counts["submitted"] += 1
+
+            token = CancelToken(schedule.deadline, cancel_event)
+            job = _Job(func, args, kwargs, lane, token, asyncio.get_running_loop())
+            self._queues[lane].append(job)
+            self._cond.notify()
+
+        try:
+            if token.deadline is None:
+                return await job.future
+            try:
+                return await asyncio.wait_for(job.future, max(token.deadline - time.monotonic(), 0))
+            except asyncio.TimeoutError:
+                raise DeadlineExceededError("요청 마감 시간이 지났습니다.") from None
+        except asyncio.CancelledError as e:
+            # 결과 캐시가 기다리던 요청이 모두 마감 시간으로 떠나 취소했으면 작업도 마감 초과로 처리
+            if e.args == (DEADLINE_CANCEL_MESSAGE,):
+                token.expire()
+            raise
+        finally:
+            # 결과를 기다리지 않게 되었으면 대기 중이거나 실행 중인 작업도 중단 (자리는 작업이 멈출 때 반납)
+            if not job.future.done() or job.future.cancelled():
+                token.cancel()
+
+    def _work(self):
+        """대기열에서 우선순위가 가장 높은 작업을 꺼내 실행합니다."""
+        attach_jvm_thread()
+        while True:
+            with self._cond:
+                job = self._next_job()
+                while job is None:
+                    if self._shutdown:
+                        return
+                    self._cond.wait()
+                    job = self._next_job()
+
+            waited = time.perf_counter() - job.submitted
+            lane_wait.observe(job.lane, waited)
+            try:
+                result = job.context.run(_run_job, waited, job)
+            except ComputationCancelled as e:
+                self._finish(job.lane, "expired" if isinstance(e, DeadlineExceededError) else "cancelled")
+                _resolve(job, exception=e)
+            except BaseException as e:
+                self._finish(job.lane, "failed")
+                _resolve(job, exception=e)
+            else:
+                self._finish(job.lane, "completed")
+                _resolve(job, result=result)
+
+    def _next_job(self) -> Optional[_Job]:
+        """실행할 작업을 꺼냅니다. 마감 시간이 지났거나 취소된 작업은 실행하지 않고 버립니다. (잠금 상태에서 호출)"""
+        now = time.monotonic()
+        for lane in LANES:
+            queue = self._queues[lane]
+            while queue:
+                job = queue.popleft()
+                if job.token.expired(now):
+                    self._release(lane, "expired")
+                    _resolve(job, exception=DeadlineExceededError("요청 마감 시간이 지났습니다."))
+                elif job.token.event.is_set():
+                    self._release(lane, "cancelled")
+                    _resolve(job, exception=ComputationCancelled("취소된 작업입니다."))
+                else:
+                    return job
+        return None
+
+    def _finish(self, lane: str, outcome: str):
+        """실행을 마친 작업의 자리를 반납하고 결과를 셉니다."""
+        with self._cond:
+            self._release(lane, outcome)
+
+    def _release(self, lane: str, outcome: str):
+        """작업의 자리를 반납하고 결과를 셉니다. (잠금 상태에서 호출)"""
+        self._in_flight -= 1
+        self._lane_in_flight[lane] -= 1
+        self._lane_counts[lane][outcome] += 1
+
+    def shutdown(self):
+        """실행 스레드를 종료합니다. (실행 중인 작업은 기다리지 않음)"""
+        with self._cond:
+            self._shutdown = True
+            self._cond.notify_all()
+
+    def get_stats(self) -> Dict:
+        """실행기 통계를 반환합니다. 결과별 작업 수와, 레인별로 대기열 길이, 버린 작업 수, 대기 시간을 포함합니다."""
+        wait_stats = lane_wait.get_stats()
+        with self._cond:
+            lanes = {}
+            for lane in LANES:
+                counts = self._lane_counts[lane]
+                lanes[lane] = {
+                    "queue_depth": len(self._queues[lane]),
+                    "in_flight": self._lane_in_flight[lane],
+                    "max_in_flight": self.lane_limits[lane],
+                    **counts,
+                    "shed": counts["rejected"] + counts["expired"] + counts["cancelled"],
+                    "wait_avg_ms": wait_stats.get(lane, {}).get("avg_ms", 0.0)
+                }
+            return {
+                "max_workers": self.max_workers,
+                "max_in_flight": self.max_in_flight,
+                "in_flight": self._in_flight,
+                **{outcome: sum(counts[outcome] for counts in self._lane_counts.values()) for outcome in OUTCOMES},
+                "torch_threads": torch.get_num_threads(),
+                "lanes": lanes
+            }
+
+def _run_job(waited: float, job: _Job):
+    """대기 시간을 기록하고 작업의 취소 토큰을 설정한 뒤 함수를 실행합니다."""
+    record_stage("executor_wait", waited)
+    set_current_token(job.token)
+    job.token.check()
+    return job.func(*job.args, **job.kwargs)
+
+def _resolve(job: _Job, result=None, exception: BaseException = None):
+    """이벤트 루프 스레드에서 작업의 결과를 전달합니다."""
+    def deliver():
+        if job.future.done():
+            return
+        if exception is not None:
+            job.future.set_exception(exception)
+        else:
+            job.future.set_result(result)
+    try:
+        job.loop.call_soon_threadsafe(deliver)
+    except RuntimeError:
+        pass  # 이벤트 루프가 이미 닫힘
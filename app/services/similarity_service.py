@@ -1,67 +1,355 @@
-from typing import Dict, List
-from sentence_transformers import SentenceTransformer, util
-from ..utils.text_processor import (
-    parse_pos_input, parse_comma_separated_input, 
-    extract_words_from_pos_input, check_incomplete_pos_input,
-    extract_keywords
-)
+from typing import Callable, Dict, List, Tuple
+import numpy as np
+from .encoder_backends import EncoderBackend
+from .embedding_cache import EmbeddingCache, get_embedding_cache
+from .synonym_index import SynonymIndex, get_synonym_index
+from .metrics import stage
+from .cancellation import checkpoint
+from .response_format import ResponseFormat, DEFAULT_RESPONSE_FORMAT
+from ..models.card_registry import Card
+from ..utils.text_processor import parse_input, analyze_morphs_batch, keywords_from_morphs
 
 class SimilarityService:
-    def __init__(self, model: SentenceTransformer):
+    def __init__(self, model: EncoderBackend, embedding_cache: EmbeddingCache = None,
+                 synonym_index: SynonymIndex = None):
         self.model = model
+        self.embedding_cache = embedding_cache or get_embedding_cache()
+        self.synonym_index = synonym_index or get_synonym_index()
         
     def calculate_similarity(self, text1: str, text2: str) -> float:
         """두 텍스트 간의 의미 유사도를 계산합니다."""
         try:
-            # 임베딩 계산
-            embedding1 = self.model.encode(text1, convert_to_tensor=True)
-            embedding2 = self.model.encode(text2, convert_to_tensor=True)
-            similarity = util.cos_sim(embedding1, embedding2).item()
-            
-            # 메모리 정리
-            del embedding1, embedding2
-            
-            return similarity
+            # 임베딩 계산 (캐시 사용, 정규화된 벡터이므로 내적이 코사인 유사도)
+            embedding1, embedding2 = self.embedding_cache.encode(self.model, [text1, text2])
+            return float(embedding1 @ embedding2)
         except Exception as e:
             print(f"유사도 계산 오류: {e}")
             return 0.0
     
+    def calculate_similarity_matrix(self, meaning_words: List[str], user_words: List[str]) -> List[List[float]]:
+        """의미 단어 x 사용자 단어 유사도 행렬을 한 번의 배치 인코딩으로 계산합니다."""
+        if not meaning_words or not user_words:
+            return []
+        
+        # 양쪽의 고유 단어만 모아 한 번에 인코딩 (캐시에 없는 단어만 모델 호출)
+        unique_words = list(dict.fromkeys(meaning_words + user_words))
+        word_index = {word: i for i, word in enumerate(unique_words)}
+        
+        # 실행기에서 취소되었거나 마감 시간이 지난 작업은 모델을 호출하기 전에 중단
+        checkpoint()
+        try:
+            with stage("encode"):
+                embeddings = self.embedding_cache.encode(self.model, unique_words)
+            with stage("similarity_matrix"):
+                meaning_embeddings = embeddings[[word_index[word] for word in meaning_words]]
+                user_embeddings = embeddings[[word_index[word] for word in user_words]]
+                return (meaning_embeddings @ user_embeddings.T).tolist()
+        except Exception as e:
+            print(f"유사도 행렬 계산 오류: {e}")
+            return [[0.0] * len(user_words) for _ in meaning_words]
+    
+    def analyze_with_comparisons(self, meaning: str, user_input: str,
+                                 response_format: ResponseFormat = DEFAULT_RESPONSE_FORMAT) -> Tuple[Dict, List[Dict]]:
+        """의미 분석과 개별 단어 비교를 같은 유사도 행렬로 수행합니다."""
+        analysis_result, similarity_matrix = self._analyze(meaning, user_input)
+        if "error" in analysis_result:
+            return analysis_result, []
+        
+        # 응답 형식에 필요한 만큼만 비교 결과 생성 (기본은 모든 단어 쌍)
+        checkpoint()
+        comparisons = response_format.build_comparisons(self, analysis_result, similarity_matrix)
+        return analysis_result, comparisons
+    
     def analyze_similarity_with_pos(self, meaning: str, user_input: str) -> Dict:
         """품사를 고려한 의미 유사도를 분석합니다."""
+        analysis_result, _ = self._analyze(meaning, user_input)
+        return analysis_result
+    
+    def analyze_tiered(self, meaning: str, user_input: str,
+                       response_format: ResponseFormat = DEFAULT_RESPONSE_FORMAT,
+                       pass_threshold: float = 0.7, synonym_similarity: float = 0.0) -> Tuple[Dict, List[Dict]]:
+        """싼 신호부터 확인하고 결과가 정해지지 않았을 때만 모델을 호출합니다. 답한 단계를 tier로 반환합니다.
+        
+        - exact: 임베딩 캐시 키와 같게 정규화(NFC, 공백)한 단어 쌍이 같으면 의미 유사도는 최대값 1.0으로 정해짐 (전체 계산과 같은 점수)
+        - synonym: 동의어 쌍에 synonym_similarity를 가정한 총점이 pass_threshold 이상이면 통과로 답함
+          (근사이므로 synonym_similarity가 0이면 건너뜀, 검증 보고서로 확인한 값으로만 켬)
+        - cached: 모든 단어의 임베딩이 캐시에 있어 모델 호출 없이 전체 계산
+        - model: 모델을 호출하여 전체 계산
+        
+        exact/synonym 단계의 개별 비교 결과에는 정해진 단어 쌍만 포함되며 (나머지 유사도는 None),
+        분석 결과에 partial_comparisons를 표시합니다.
+        """
+        parsed = self._parse_inputs(meaning, user_input)
+        if "error" in parsed:
+            return parsed, []
+        
+        meaning_words, user_words = parsed["meaning_words"], parsed["user_words"]
+        return self._tiered(parsed, response_format, pass_threshold, synonym_similarity,
+                            lambda: self.calculate_similarity_matrix(meaning_words, user_words), meaning_words + user_words)
+    
+    def _tiered(self, parsed: Dict, response_format: ResponseFormat, pass_threshold: float, synonym_similarity: float,
+                full_matrix: Callable[[], List[List[float]]], encoded_words: List[str]) -> Tuple[Dict, List[Dict]]:
+        """파싱 결과로 빠른 경로 단계를 확인하고, 답할 수 없으면 full_matrix로 전체 계산합니다."""
+        meaning_words, user_words = parsed["meaning_words"], parsed["user_words"]
+        with stage("fast_path"):
+            tier, partial_matrix = self._fast_path_matrix(meaning_words, user_words, synonym_similarity)
+        
+        checkpoint()
+        if tier is not None:
+            # 의미 유사도는 행렬의 최대값이므로 정해진 쌍의 최대값으로 점수 계산 (단계 시간은 _score가 기록)
+            semantic = max(value for row in partial_matrix for value in row if value is not None)
+            analysis_result = self._score(parsed, [[semantic]])
+            if tier == "exact" or analysis_result["total_score"] >= pass_threshold:
+                analysis_result["tier"] = tier
+                analysis_result["partial_comparisons"] = True
+                return analysis_result, response_format.build_comparisons(self, analysis_result, partial_matrix)
+        
+        tier = "cached" if self.embedding_cache.contains(encoded_words) else "model"
+        similarity_matrix = full_matrix()
+        checkpoint()
+        analysis_result = self._score(parsed, similarity_matrix)
+        analysis_result["tier"] = tier
+        return analysis_result, response_format.build_comparisons(self, analysis_result, similarity_matrix)
+    
+    def _fast_path_matrix(self, meaning_words: List[str], user_words: List[str],
+                          synonym_similarity: float) -> Tuple[str, List[List[float]]]:
+        """정확 일치(1.0)와 동의어 쌍(synonym_similarity)만 채운 행렬과 답할 수 있는 단계를 반환합니다.
+        
+        정확 일치는 임베딩 캐시 키와 같은 정규화만 적용하므로, 같다고 판단한 단어는 전체 계산에서도 같은 임베딩(유사도 1.0)입니다.
+        """
+        if not meaning_words or not user_words:
+            return None, []
+        
+        # 1단계: 정규화 후 정확히 같은 단어 쌍
+        normalized_user = [EmbeddingCache.normalize_key(word) for word in user_words]
+        matrix = [
+            [1.0 if normalized == user_normalized else None for user_normalized in normalized_user]
+            for normalized in map(EmbeddingCache.normalize_key, meaning_words)
+        ]
+        if any(1.0 in row for row in matrix):
+            return "exact", matrix
+        if synonym_similarity <= 0:
+            return None, matrix
+        
+        # 2단계: 같은 동의어 그룹에 속한 단어 쌍
+        user_groups = [self.synonym_index.groups_of(word) for word in user_words]
+        synonym = False
+        for i, meaning_word in enumerate(meaning_words):
+            groups = self.synonym_index.groups_of(meaning_word)
+            for j, groups_of_user in enumerate(user_groups):
+                if not groups.isdisjoint(groups_of_user):
+                    matrix[i][j] = synonym_similarity
+                    synonym = True
+        return ("synonym" if synonym else None), matrix
+    
+    def analyze_card(self, card: Card, user_input: str,
+                     response_format: ResponseFormat = DEFAULT_RESPONSE_FORMAT,
+                     word_embeddings: Dict[str, np.ndarray] = None) -> Tuple[Dict, List[Dict]]:
+        """등록된 카드와 사용자 입력을 비교합니다. 카드 쪽은 등록 시 계산한 값을 사용하고 사용자 입력만 처리합니다.
+        
+        word_embeddings를 주면 사용자 단어의 임베딩을 그 안에 보관하여 이전 호출 이후 바뀐 단어만 인코딩합니다.
+        """
+        parsed = self._parse_card_input(card, user_input)
+        if "error" in parsed:
+            return parsed, []
+        
+        similarity_matrix = self._card_similarity_matrix(card, parsed["user_words"], word_embeddings)
+        checkpoint()
+        analysis_result = self._score(parsed, similarity_matrix)
+        checkpoint()
+        comparisons = response_format.build_comparisons(self, analysis_result, similarity_matrix)
+        return analysis_result, comparisons
+    
+    def analyze_card_tiered(self, card: Card, user_input: str,
+                            response_format: ResponseFormat = DEFAULT_RESPONSE_FORMAT,
+                            pass_threshold: float = 0.7, synonym_similarity: float = 0.0) -> Tuple[Dict, List[Dict]]:
+        """등록된 카드와 사용자 입력을 analyze_tiered와 같은 단계로 비교합니다. (카드 단어의 임베딩은 이미 계산되어 있음)"""
+        parsed = self._parse_card_input(card, user_input)
+        if "error" in parsed:
+            return parsed, []
+        
+        user_words = parsed["user_words"]
+        return self._tiered(parsed, response_format, pass_threshold, synonym_similarity,
+                            lambda: self._card_similarity_matrix(card, user_words), user_words)
+    
+    def _parse_card_input(self, card: Card, user_input: str) -> Dict:
+        """사용자 입력만 파싱하고 형태소 분석하여 카드의 미리 계산된 값과 합친 파싱 결과를 반환합니다."""
+        with stage("parse"):
+            user_parsed = parse_input(user_input)
+        
         # 불완전한 품사 입력 확인
-        incomplete_check = check_incomplete_pos_input(user_input)
-        if incomplete_check["is_incomplete"]:
+        if user_parsed.incomplete["is_incomplete"]:
             return {
-                "error": incomplete_check["message"],
+                "error": user_parsed.incomplete["message"],
                 "incomplete_input": True
             }
         
-        # 품사 정보 파싱
-        meaning_pos_info = parse_pos_input(meaning)
-        user_pos_info = parse_pos_input(user_input)
+        checkpoint()
+        with stage("morph"):
+            user_morphs = analyze_morphs_batch([user_input])[0]
+        
+        return {
+            "meaning_words": card.words,
+            "user_words": user_parsed.words,
+            "meaning_pos_info": card.pos_info,
+            "user_pos_info": user_parsed.pos_info,
+            "meaning_morphs": card.morphs,
+            "meaning_keywords": card.keywords,
+            "user_morphs": user_morphs
+        }
+    
+    def _card_similarity_matrix(self, card: Card, user_words: List[str],
+                                word_embeddings: Dict[str, np.ndarray] = None) -> List[List[float]]:
+        """카드의 미리 계산된 임베딩과 사용자 단어의 유사도 행렬을 계산합니다. (사용자 단어만 인코딩)"""
+        if not card.words or not user_words:
+            return []
         
-        # 품사 정보가 없는 경우 일반 텍스트로 처리
-        if not meaning_pos_info:
-            meaning_words = parse_comma_separated_input(meaning)
-        else:
-            meaning_words = extract_words_from_pos_input(meaning)
+        unique_words = list(dict.fromkeys(user_words))
+        word_index = {word: i for i, word in enumerate(unique_words)}
+        
+        checkpoint()
+        try:
+            with stage("encode"):
+                if word_embeddings is None:
+                    embeddings = self.embedding_cache.encode(self.model, unique_words)
+                else:
+                    # 이전 입력에 없던 단어만 인코딩하고, 지금 입력에 없는 단어는 버림
+                    changed = [word for word in unique_words if word not in word_embeddings]
+                    if changed:
+                        word_embeddings.update(zip(changed, self.embedding_cache.encode(self.model, changed)))
+                    for word in [word for word in word_embeddings if word not in word_index]:
+                        del word_embeddings[word]
+                    embeddings = np.stack([word_embeddings[word] for word in unique_words])
+            with stage("similarity_matrix"):
+                user_embeddings = embeddings[[word_index[word] for word in user_words]]
+                return (card.embeddings @ user_embeddings.T).tolist()
+        except Exception as e:
+            print(f"유사도 행렬 계산 오류: {e}")
+            return [[0.0] * len(user_words) for _ in card.words]
+    
+    def analyze_batch(self, pairs: List[Tuple[str, str]],
+                      response_format: ResponseFormat = DEFAULT_RESPONSE_FORMAT) -> List[Tuple[Dict, List[Dict]]]:
+        """여러 (의미, 사용자 입력) 쌍을 한 번에 분석합니다.
         
-        if not user_pos_info:
-            user_words = parse_comma_separated_input(user_input)
-        else:
-            user_words = extract_words_from_pos_input(user_input)
+        배치 전체의 고유 단어를 한 번에 인코딩하고, 고유 단어 간 유사도 행렬 하나에서
+        각 쌍의 행렬을 인덱싱으로 잘라 사용합니다.
+        """
+        # 배치 전체의 형태소 분석을 한 번의 JVM 호출로 수행
+        checkpoint()
+        with stage("morph"):
+            morphs = analyze_morphs_batch([text for pair in pairs for text in pair])
+        parsed_list = [
+            self._parse_inputs(meaning, user_input, (morphs[2 * i], morphs[2 * i + 1]))
+            for i, (meaning, user_input) in enumerate(pairs)
+        ]
+        
+        # 배치 전체의 고유 단어 수집
+        unique_words = list(dict.fromkeys(
+            word
+            for parsed in parsed_list if "error" not in parsed
+            for word in parsed["meaning_words"] + parsed["user_words"]
+        ))
+        word_index = {word: i for i, word in enumerate(unique_words)}
+        
+        similarity_table = None
+        checkpoint()
+        if unique_words:
+            try:
+                with stage("encode"):
+                    embeddings = self.embedding_cache.encode(self.model, unique_words)
+                with stage("similarity_matrix"):
+                    similarity_table = embeddings @ embeddings.T
+            except Exception as e:
+                print(f"배치 유사도 계산 오류: {e}")
+        
+        results = []
+        for parsed in parsed_list:
+            checkpoint()
+            if "error" in parsed:
+                results.append((parsed, []))
+                continue
+            
+            meaning_words, user_words = parsed["meaning_words"], parsed["user_words"]
+            if not meaning_words or not user_words:
+                similarity_matrix = []
+            elif similarity_table is None:
+                similarity_matrix = [[0.0] * len(user_words) for _ in meaning_words]
+            else:
+                meaning_idx = [word_index[word] for word in meaning_words]
+                user_idx = [word_index[word] for word in user_words]
+                similarity_matrix = similarity_table[np.ix_(meaning_idx, user_idx)].tolist()
+            
+            analysis_result = self._score(parsed, similarity_matrix)
+            comparisons = response_format.build_comparisons(self, analysis_result, similarity_matrix)
+            results.append((analysis_result, comparisons))
+        
+        return results
+    
+    def _analyze(self, meaning: str, user_input: str) -> Tuple[Dict, List[List[float]]]:
+        """분석 결과와 함께 재사용할 유사도 행렬을 반환합니다."""
+        parsed = self._parse_inputs(meaning, user_input)
+        if "error" in parsed:
+            return parsed, []
+        
+        # 의미 유사도 계산용 행렬 (단어 쌍 전체를 한 번에)
+        similarity_matrix = self.calculate_similarity_matrix(parsed["meaning_words"], parsed["user_words"])
+        checkpoint()
+        return self._score(parsed, similarity_matrix), similarity_matrix
+    
+    def _parse_inputs(self, meaning: str, user_input: str, morphs: Tuple = None) -> Dict:
+        """입력을 파싱하여 단어 목록, 품사 정보와 형태소 분석 결과를 반환합니다."""
+        # 입력 파싱 (품사 그룹, 단어 목록, 불완전 입력 여부를 한 번에)
+        with stage("parse"):
+            meaning_parsed = parse_input(meaning)
+            user_parsed = parse_input(user_input)
+        
+        # 불완전한 품사 입력 확인
+        if user_parsed.incomplete["is_incomplete"]:
+            return {
+                "error": user_parsed.incomplete["message"],
+                "incomplete_input": True
+            }
+        
+        # 형태소 분석은 요청당 한 번만 수행하고 키워드 점수 등에서 공유
+        if morphs is None:
+            checkpoint()
+            with stage("morph"):
+                morphs = analyze_morphs_batch([meaning, user_input])
+        
+        return {
+            "meaning_words": meaning_parsed.words,
+            "user_words": user_parsed.words,
+            "meaning_pos_info": meaning_parsed.pos_info,
+            "user_pos_info": user_parsed.pos_info,
+            "meaning_morphs": morphs[0],
+            "user_morphs": morphs[1]
+        }
+    
+    def _score(self, parsed: Dict, similarity_matrix: List[List[float]]) -> Dict:
+        """파싱 결과와 유사도 행렬로 종합 점수를 계산합니다."""
+        meaning_words, user_words = parsed["meaning_words"], parsed["user_words"]
         
         # 품사 매칭 점수 계산
-        pos_matching_score = self._calculate_pos_matching_score(meaning_pos_info, user_pos_info)
+        with stage("pos_matching"):
+            pos_matching_score = self._calculate_pos_matching_score(parsed["meaning_pos_info"], parsed["user_pos_info"])
         
         # 의미 유사도 계산
-        semantic_similarity = self._calculate_semantic_similarity(meaning_words, user_words)
+        with stage("semantic"):
+            semantic_similarity = self._calculate_semantic_similarity(similarity_matrix)
         
         # 동의어 확장 점수
-        synonym_score = self._calculate_synonym_score(meaning_words, user_words)
+        with stage("synonym"):
+            synonym_score = self._calculate_synonym_score(meaning_words, user_words)
         
         # 키워드 매칭 점수
-        keyword_score = self._calculate_keyword_score(meaning, user_input)
+        with stage("keyword"):
+            meaning_keywords = parsed.get("meaning_keywords")
+            if meaning_keywords is None:
+                meaning_keywords = keywords_from_morphs(parsed["meaning_morphs"])
+            keyword_score = self._calculate_keyword_score(
+                meaning_keywords,
+                keywords_from_morphs(parsed["user_morphs"])
+            )
         
         # 종합 점수 계산 (더 엄격한 가중치)
         total_score = (
@@ -85,8 +373,8 @@ class SimilarityService:
             "total_score": total_score,
             "meaning_words": meaning_words,
             "user_words": user_words,
-            "meaning_pos_info": meaning_pos_info,
-            "user_pos_info": user_pos_info
+            "meaning_pos_info": parsed["meaning_pos_info"],
+            "user_pos_info": parsed["user_pos_info"]
         }
     
     def _calculate_pos_matching_score(self, meaning_pos: Dict, user_pos: Dict) -> float:
@@ -112,64 +400,23 @@ class SimilarityService:
         
         return base_score
     
-    def _calculate_semantic_similarity(self, meaning_words: List[str], user_words: List[str]) -> float:
-        """의미 유사도를 계산합니다."""
-        if not meaning_words or not user_words:
-            return 0.0
-        
+    def _calculate_semantic_similarity(self, similarity_matrix: List[List[float]]) -> float:
+        """유사도 행렬에서 의미 유사도(최대값)를 계산합니다."""
         max_similarity = 0.0
         
-        for meaning_word in meaning_words:
-            for user_word in user_words:
-                similarity = self.calculate_similarity(meaning_word, user_word)
-                max_similarity = max(max_similarity, similarity)
+        for row in similarity_matrix:
+            if row:
+                max_similarity = max(max_similarity, max(row))
         
         return max_similarity
     
     def _calculate_synonym_score(self, meaning_words: List[str], user_words: List[str]) -> float:
         """동의어 확장 점수를 계산합니다."""
-        # 엄격한 동의어 사전 (정확한 동의어만)
-        synonym_dict = {
-            "사랑": ["사랑하다", "애정", "연애"],
-            "행복": ["행복하다", "기쁘다", "즐겁다"],
-            "슬픔": ["슬프다", "우울하다", "비통하다"],
-            "기쁨": ["기쁘다", "즐겁다", "환희"],
-            "화": ["화나다", "분노", "격분"],
-            "걱정": ["걱정하다", "염려", "불안"],
-            "희망": ["희망하다", "바라다", "기대"],
-            "사과": ["미안하다", "죄송하다"],
-            "감사": ["고맙다", "감사하다"],
-            "축하": ["축하하다", "경사"],
-            "학습": ["공부하다", "배우다"],
-            "노력": ["열심히", "부지런히"],
-            "성공": ["성취하다", "달성하다"],
-            "실패": ["실패하다", "실수하다"]
-        }
-        
-        matching_count = 0
-        total_pairs = len(meaning_words) * len(user_words)
-        
-        for meaning_word in meaning_words:
-            for user_word in user_words:
-                # 직접 매칭
-                if meaning_word == user_word:
-                    matching_count += 1
-                    continue
-                
-                # 동의어 매칭
-                for base_word, synonyms in synonym_dict.items():
-                    if (meaning_word in synonyms or meaning_word == base_word) and \
-                       (user_word in synonyms or user_word == base_word):
-                        matching_count += 1
-                        break
-        
-        return matching_count / total_pairs if total_pairs > 0 else 0.0
-    
-    def _calculate_keyword_score(self, meaning: str, user_input: str) -> float:
+        # 동의어 사전은 데이터 파일에서 컴파일한 역색인 사용 (정확한 동의어만)
+        return self.synonym_index.score(meaning_words, user_words)
+    
+    def _calculate_keyword_score(self, meaning_keywords: List[str], user_keywords: List[str]) -> float:
         """키워드 매칭 점수를 계산합니다."""
-        meaning_keywords = extract_keywords(meaning)
-        user_keywords = extract_keywords(user_input)
-        
         if not meaning_keywords or not user_keywords:
             return 0.0
         
@@ -181,28 +428,57 @@ class SimilarityService:
         
         return matching_count / (len(meaning_keywords) + len(user_keywords) - matching_count) if (len(meaning_keywords) + len(user_keywords) - matching_count) > 0 else 0.0
     
-    def compare_individual_words(self, meaning_words: List[str], user_words: List[str]) -> List[Dict]:
-        """개별 단어들 간의 비교 결과를 반환합니다."""
-        comparisons = []
+    def compare_individual_words(self, meaning_words: List[str], user_words: List[str],
+                                 similarity_matrix: List[List[float]] = None, top_k: int = None) -> List[Dict]:
+        """개별 단어들 간의 비교 결과를 반환합니다. top_k를 주면 유사도 상위 k개만 만듭니다."""
+        if similarity_matrix is None:
+            similarity_matrix = self.calculate_similarity_matrix(meaning_words, user_words)
         
-        for i, meaning_word in enumerate(meaning_words):
-            for j, user_word in enumerate(user_words):
-                similarity = self.calculate_similarity(meaning_word, user_word)
-                
-                comparison = {
-                    "meaning_word": meaning_word,
-                    "user_word": user_word,
-                    "similarity_score": similarity,
-                    "meaning_index": i,
-                    "user_index": j,
-                    "is_exact_match": meaning_word == user_word,
-                    "is_high_similarity": similarity > 0.7,
-                    "is_medium_similarity": 0.4 <= similarity <= 0.7,
-                    "is_low_similarity": similarity < 0.4
-                }
-                comparisons.append(comparison)
-        
-        # 유사도 점수 기준으로 정렬 (높은 점수부터)
-        comparisons.sort(key=lambda x: x["similarity_score"], reverse=True)
-        
-        return comparisons 
\ No newline at end of file
+        with stage("individual_comparisons"):
+            if any(None in row for row in similarity_matrix):
+                # 빠른 경로의 부분 행렬: 정해진 단어 쌍만 비교 결과로 만듦
+                comparisons = [
+                    self._comparison(meaning_words, user_words, similarity_matrix, i, j)
+                    for i, row in enumerate(similarity_matrix)
+                    for j, value in enumerate(row) if value is not None
+                ]
+                comparisons.sort(key=lambda x: x["similarity_score"], reverse=True)
+                return comparisons[:top_k] if top_k is not None else comparisons
+            
+            if top_k is not None and meaning_words and user_words:
+                # 상위 k개 위치만 골라 dict 생성 (안정 정렬이라 동점 순서는 전체 정렬과 같음)
+                scores = np.asarray(similarity_matrix, dtype=np.float64).ravel()
+                order = np.argsort(-scores, kind="stable")[:top_k]
+                return [
+                    self._comparison(meaning_words, user_words, similarity_matrix, *divmod(int(k), len(user_words)))
+                    for k in order
+                ]
+            
+            comparisons = [
+                self._comparison(meaning_words, user_words, similarity_matrix, i, j)
+                for i in range(len(meaning_words))
+                for j in range(len(user_words))
+            ]
+            
+            # 유사도 점수 기준으로 정렬 (높은 점수부터)
+            comparisons.sort(key=lambda x: x["similarity_score"], reverse=True)
+        
+        return comparisons
+    
+    @staticmethod
+    def _comparison(meaning_words: List[str], user_words: List[str], similarity_matrix: List[List[float]],
+                    i: int, j: int) -> Dict:
+        """단어 쌍 하나의 비교 결과를 만듭니다."""
+        meaning_word, user_word = meaning_words[i], user_words[j]
+        similarity = similarity_matrix[i][j]
+        return {
+            "meaning_word": meaning_word,
+            "user_word": user_word,
+            "similarity_score": similarity,
+            "meaning_index": i,
+            "user_index": j,
+            "is_exact_match": meaning_word == user_word,
+            "is_high_similarity": similarity > 0.7,
+            "is_medium_similarity": 0.4 <= similarity <= 0.7,
+            "is_low_similarity": similarity < 0.4
+        } 
\ No newline at end of file
@@ -0,0 +1,74 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List
+
+class StartupTracker:
+    """시작 단계별 소요 시간과 준비(ready) 상태를 기록합니다.
+
+    워밍업까지 끝나야 ready가 되며, 그 전에는 /ready가 503을 반환해 로드 밸런서가 트래픽을 보내지 않습니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+        self.phases = {}  # {단계 이름: 소요 시간(초)}
+        self.running = []  # 진행 중인 단계 (병렬로 여러 개일 수 있음)
+        self.ready = False
+        self.error = None
+        self.total_seconds = None
+
+    @contextmanager
+    def phase(self, name: str):
+        """단계의 소요 시간을 기록합니다."""
+        started = time.perf_counter()
+        with self._lock:
+            self.running.append(name)
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self.running.remove(name)
+                self.phases[name] = elapsed
+            print(f"시작 단계 완료: {name} ({elapsed:.2f}초)")
+
+    def mark_ready(self):
+        """모든 시작 단계가 끝났음을 기록합니다."""
+        with self._lock:
+            self.total_seconds = time.perf_counter() - self._started
+            self.ready = True
+        breakdown = ", ".join(f"{name} {seconds:.2f}초" for name, seconds in self.phases.items())
+        print(f"GlassCard 준비 완료 (총 {self.total_seconds:.2f}초): {breakdown}")
+
+    def mark_failed(self, error: Exception):
+        """시작 실패를 기록합니다. (ready 상태가 되지 않음)"""
+        with self._lock:
+            self.error = str(error)
+        print(f"GlassCard 시작 실패: {error}")
+
+    def get_status(self) -> Dict:
+        """준비 상태와 단계별 소요 시간을 반환합니다."""
+        with self._lock:
+            return {
+                "status": "ready" if self.ready else "failed" if self.error else "starting",
+                "running_phases": list(self.running),
+                "phases": {name: round(seconds, 3) for name, seconds in self.phases.items()},
+                "elapsed_seconds": round(time.perf_counter() - self._started, 3),
+                "total_seconds": round(self.total_seconds, 3) if self.total_seconds is not None else None,
+                "error": self.error
+            }
+
+def load_warmup_corpus(path: str) -> List[str]:
+    """워밍업 말뭉치를 읽습니다. 경로가 없거나 읽을 수 없으면 빈 목록을 반환합니다."""
+    if not path:
+        return []
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return [line.strip() for line in f if line.strip()]
+    except OSError as e:
+        print(f"워밍업 말뭉치 로드 오류: {e}")
+        return []
+
+# 프로세스 전역 시작 상태
+startup_tracker = StartupTracker()
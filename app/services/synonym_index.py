@@ -0,0 +1,117 @@
+import json
+import os
+import threading
+import time
+from typing import Dict, FrozenSet, List
+
+from .. import config
+
+_NO_GROUPS = frozenset()
+
+class SynonymIndex:
+    """데이터 파일의 동의어 그룹을 단어 -> 그룹 ID 역색인으로 컴파일한 동의어 사전
+
+    파일이 바뀌면 재시작 없이 다시 읽어 들이며, 컴파일된 색인은 참조 교체로 한 번에 바뀝니다.
+    """
+
+    def __init__(self, path: str, reload_interval: float = 5.0):
+        self.path = path
+        self.reload_interval = reload_interval
+        self.version = 0  # 다시 읽을 때마다 증가 (결과 캐시 키 등에 사용)
+
+        self._word_to_groups = {}  # {word: frozenset(group_ids)}
+        self._groups = []  # [[words]]
+        self._mtime = None
+        self._last_check = 0.0
+        self._reload_lock = threading.Lock()
+
+        self.reload()
+
+    def reload(self) -> bool:
+        """데이터 파일을 읽어 색인을 다시 만듭니다. 실패하면 기존 색인을 유지합니다."""
+        with self._reload_lock:
+            try:
+                mtime = os.path.getmtime(self.path)
+                with open(self.path, "r", encoding="utf-8") as f:
+                    groups = [[word.strip() for word in group if word.strip()] for group in json.load(f)["groups"]]
+            except Exception as e:
+                print(f"동의어 사전 로드 오류: {e}")
+                return False
+
+            word_to_groups = {}
+            for group_id, group in enumerate(groups):
+                for word in group:
+                    word_to_groups.setdefault(word, set()).add(group_id)
+
+            # 참조 교체로 읽는 쪽은 항상 완성된 색인만 보게 됨
+            self._word_to_groups = {word: frozenset(ids) for word, ids in word_to_groups.items()}
+            self._groups = groups
+            self._mtime = mtime
+            self._last_check = time.monotonic()
+            self.version += 1
+
+        print(f"동의어 사전 로드: 그룹 {len(groups)}개, 단어 {len(self._word_to_groups)}개")
+        return True
+
+    def maybe_reload(self):
+        """주기적으로 파일 변경 여부를 확인하고, 바뀌었으면 다시 읽습니다."""
+        now = time.monotonic()
+        if self.reload_interval <= 0 or now - self._last_check < self.reload_interval:
+            return
+        self._last_check = now
+        try:
+            if os.path.getmtime(self.path) != self._mtime:
+                self.reload()
+        except OSError:
+            pass
+
+    def groups_of(self, word: str) -> FrozenSet[int]:
+        """단어가 속한 동의어 그룹 ID들을 반환합니다."""
+        return self._word_to_groups.get(word, _NO_GROUPS)
+
+    def get_synonyms(self, word: str) -> List[str]:
+        """단어와 같은 그룹에 속한 단어들을 반환합니다."""
+        groups = self._groups
+        synonyms = []
+        for group_id in sorted(self.groups_of(word)):
+            synonyms.extend(w for w in groups[group_id] if w != word and w not in synonyms)
+        return synonyms
+
+    def score(self, meaning_words: List[str], user_words: List[str]) -> float:
+        """같거나 같은 동의어 그룹에 속한 단어 쌍의 비율을 계산합니다."""
+        total_pairs = len(meaning_words) * len(user_words)
+        if total_pairs == 0:
+            return 0.0
+
+        self.maybe_reload()
+        word_to_groups = self._word_to_groups
+        user_groups = [(user_word, word_to_groups.get(user_word, _NO_GROUPS)) for user_word in user_words]
+
+        matching_count = 0
+        for meaning_word in meaning_words:
+            meaning_groups = word_to_groups.get(meaning_word, _NO_GROUPS)
+            for user_word, groups in user_groups:
+                # 직접 매칭 또는 공통 그룹 존재
+                if meaning_word == user_word or not meaning_groups.isdisjoint(groups):
+                    matching_count += 1
+
+        return matching_count / total_pairs
+
+    def get_stats(self) -> Dict:
+        """동의어 사전 통계를 반환합니다."""
+        return {
+            "path": self.path,
+            "version": self.version,
+            "groups": len(self._groups),
+            "words": len(self._word_to_groups)
+        }
+
+# 프로세스 전역 동의어 사전
+_synonym_index = None
+
+def get_synonym_index() -> SynonymIndex:
+    """프로세스 전역 동의어 사전을 반환합니다. 없으면 설정값으로 생성합니다."""
+    global _synonym_index
+    if _synonym_index is None:
+        _synonym_index = SynonymIndex(config.SYNONYM_FILE, config.SYNONYM_RELOAD_INTERVAL)
+    return _synonym_index
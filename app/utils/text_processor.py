@@ -1,10 +1,33 @@
 import re
-from typing import Dict, List, Tuple
-from functools import lru_cache
+import threading
+from collections import OrderedDict
+from typing import Dict, List, NamedTuple, Tuple
 from konlpy.tag import Okt
+from .. import config
 
-# konlpy 초기화
-okt = Okt()
+# konlpy 분석기 (JVM 시작 비용이 크므로 import 시점이 아닌 init_okt/첫 호출 시 생성)
+okt = None
+
+# Okt는 JVM 객체를 공유하므로 여러 스레드에서 동시에 호출하지 않도록 직렬화
+_okt_lock = threading.Lock()
+
+def init_okt() -> Okt:
+    """Okt 분석기를 생성합니다. (JVM 시작 포함, 이미 생성했으면 그대로 반환)"""
+    global okt
+    if okt is None:
+        with _okt_lock:
+            if okt is None:
+                okt = Okt()
+    return okt
+
+def attach_jvm_thread():
+    """현재 스레드를 JVM에 연결합니다. (작업 스레드 초기화용)"""
+    try:
+        import jpype
+        if jpype.isJVMStarted() and not jpype.isThreadAttachedToJVM():
+            jpype.attachThreadToJVM()
+    except Exception as e:
+        print(f"JVM 스레드 연결 오류: {e}")
 
 # 품사 매핑
 POS_MAPPING = {
@@ -19,41 +42,50 @@ POS_MAPPING = {
     "감": "Exclamation"
 }
 
-def parse_pos_input(text: str) -> Dict[str, List[str]]:
-    """품사 정보가 포함된 입력을 파싱합니다."""
+# 품사 그룹 토큰 (예: "동. 사랑하다, 좋아하다"), 한 번의 스캔으로 모든 그룹을 찾음
+_POS_GROUP_RE = re.compile(r'(\w+)\.\s*([^/\n]+)')
+
+# 불완전한 품사 입력 (예: "동.", "동. /", "동. / 명.")
+_INCOMPLETE_POS_RE = re.compile(r'^(\w+)\.\s*(?:/\s*(?:\w+\.\s*)?)?$')
+
+class ParsedInput(NamedTuple):
+    """입력 파싱 결과 (요청 전체에서 재사용)"""
+    pos_info: Dict[str, List[str]]  # {품사: [단어]}
+    words: List[str]  # 품사 정보가 있으면 품사별 단어, 없으면 쉼표로 구분된 단어
+    incomplete: Dict  # check_incomplete_pos_input과 같은 형식
+
+def parse_input(text: str) -> ParsedInput:
+    """품사 태그 입력을 한 번에 파싱하여 품사 그룹, 단어 목록, 불완전 입력 여부를 반환합니다."""
     pos_info = {}
     
-    # 품사 태그 패턴 매칭
-    patterns = [
-        r'(\w+)\.\s*([^/\n]+)',  # 동. 사랑하다
-        r'(\w+)\.\s*([^/\n]+)\s*/\s*(\w+)\.\s*([^/\n]+)',  # 동. 사랑하다 / 명. 사랑
-    ]
+    for match in _POS_GROUP_RE.finditer(text):
+        pos = POS_MAPPING.get(match.group(1), match.group(1))
+        word_list = [word.strip() for word in match.group(2).split(',')]
+        if pos not in pos_info:
+            pos_info[pos] = []
+        pos_info[pos].extend(word_list)
+    
+    if pos_info:
+        words = [word for pos_words in pos_info.values() for word in pos_words]
+    else:
+        words = parse_comma_separated_input(text)
     
-    for pattern in patterns:
-        matches = re.findall(pattern, text)
-        for match in matches:
-            if len(match) == 2:  # 단일 품사
-                pos, words = match
-                pos = POS_MAPPING.get(pos, pos)
-                word_list = [word.strip() for word in words.split(',')]
-                if pos not in pos_info:
-                    pos_info[pos] = []
-                pos_info[pos].extend(word_list)
-            elif len(match) == 4:  # 다중 품사
-                pos1, words1, pos2, words2 = match
-                pos1, pos2 = POS_MAPPING.get(pos1, pos1), POS_MAPPING.get(pos2, pos2)
-                word_list1 = [word.strip() for word in words1.split(',')]
-                word_list2 = [word.strip() for word in words2.split(',')]
-                
-                if pos1 not in pos_info:
-                    pos_info[pos1] = []
-                if pos2 not in pos_info:
-                    pos_info[pos2] = []
-                    
-                pos_info[pos1].extend(word_list1)
-                pos_info[pos2].extend(word_list2)
+    incomplete_match = _INCOMPLETE_POS_RE.match(text.strip())
+    if incomplete_match:
+        pos_tag = incomplete_match.group(1)
+        incomplete = {
+            "is_incomplete": True,
+            "pos_tag": pos_tag,
+            "message": f"품사 태그 '{pos_tag}.' 뒤에 단어를 입력해주세요."
+        }
+    else:
+        incomplete = {"is_incomplete": False}
     
-    return pos_info
+    return ParsedInput(pos_info, words, incomplete)
+
+def parse_pos_input(text: str) -> Dict[str, List[str]]:
+    """품사 정보가 포함된 입력을 파싱합니다."""
+    return parse_input(text).pos_info
 
 def parse_comma_separated_input(text: str) -> List[str]:
     """쉼표로 구분된 입력을 파싱합니다. (콤마 기준 분리, 각 단어의 앞뒤 공백 제거)"""
@@ -66,61 +98,145 @@ def parse_comma_separated_input(text: str) -> List[str]:
 
 def extract_words_from_pos_input(text: str) -> List[str]:
     """품사 정보가 포함된 입력에서 단어만 추출합니다."""
-    pos_info = parse_pos_input(text)
     words = []
-    for pos_words in pos_info.values():
+    for pos_words in parse_pos_input(text).values():
         words.extend(pos_words)
     return words
 
 def check_incomplete_pos_input(text: str) -> Dict:
     """불완전한 품사 입력인지 확인합니다."""
-    incomplete_patterns = [
-        r'^\w+\.\s*$',  # 동.
-        r'^\w+\.\s*/\s*$',  # 동. /
-        r'^\w+\.\s*/\s*\w+\.\s*$',  # 동. / 명.
-    ]
+    return parse_input(text).incomplete
+
+# 키워드로 사용하는 품사
+KEYWORD_POS = ("Noun", "Verb", "Adjective")
+
+# 여러 텍스트를 한 번의 JVM 호출로 분석할 때 사용하는 구분 토큰
+BATCH_SEPARATOR = "\u241e"
+
+class MorphCache:
+    """형태소 분석 결과를 담는 크기 제한 LRU 캐시"""
+    
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries = OrderedDict()  # {text: ((word, pos), ...)}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
     
-    for pattern in incomplete_patterns:
-        if re.match(pattern, text.strip()):
-            pos_tag = re.match(r'^(\w+)\.', text.strip()).group(1)
+    def get(self, text: str):
+        with self._lock:
+            result = self._entries.get(text)
+            if result is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(text)
+            self.hits += 1
+            return result
+    
+    def put(self, text: str, result: Tuple[Tuple[str, str], ...]):
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[text] = result
+            self._entries.move_to_end(text)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+    
+    def get_stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
             return {
-                "is_incomplete": True,
-                "pos_tag": pos_tag,
-                "message": f"품사 태그 '{pos_tag}.' 뒤에 단어를 입력해주세요."
+                "entries": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0
             }
+
+morph_cache = MorphCache(config.MORPH_CACHE_SIZE)
+
+def _run_okt(text: str) -> Tuple[Tuple[str, str], ...]:
+    """Okt로 형태소 분석을 실행합니다."""
+    analyzer = okt or init_okt()
+    with _okt_lock:
+        return tuple(tuple(token) for token in analyzer.pos(text))
+
+def _run_okt_batch(texts: List[str]) -> List[Tuple[Tuple[str, str], ...]]:
+    """여러 텍스트를 구분 토큰으로 이어 붙여 한 번의 JVM 호출로 분석합니다.
+    
+    나눈 결과가 원래 텍스트와 맞지 않으면(앞뒤 텍스트와 섞여 토큰이 달라진 경우) 그 텍스트만 따로 분석합니다.
+    """
+    if len(texts) == 1:
+        return [_run_okt(texts[0])]
+    
+    tokens = _run_okt(f" {BATCH_SEPARATOR} ".join(texts))
+    results = [[]]
+    for token in tokens:
+        if token[0] == BATCH_SEPARATOR:
+            results.append([])
+        else:
+            results[-1].append(token)
+    
+    # 구분 토큰이 그대로 나뉘지 않은 경우 텍스트별로 다시 분석
+    if len(results) != len(texts):
+        return [_run_okt(text) for text in texts]
+    return [
+        tuple(result) if _tokens_match(text, result) else _run_okt(text)
+        for text, result in zip(texts, results)
+    ]
+
+def _tokens_match(text: str, tokens) -> bool:
+    """토큰을 이어 붙이면 공백을 뺀 원래 텍스트가 되는지 확인합니다. (정규화·어간 추출 없이 분석한 결과 기준)"""
+    return "".join(word for word, _ in tokens) == "".join(text.split())
+
+def analyze_morphs(text: str) -> Tuple[Tuple[str, str], ...]:
+    """형태소 분석 결과를 반환합니다. 같은 텍스트는 캐시에서 재사용합니다."""
+    return analyze_morphs_batch([text])[0]
+
+def analyze_morphs_batch(texts: List[str]) -> List[Tuple[Tuple[str, str], ...]]:
+    """여러 텍스트의 형태소 분석 결과를 반환합니다. 캐시에 없는 텍스트만 한 번의 JVM 호출로 분석합니다."""
+    results = {}
+    missing = []
+    for text in dict.fromkeys(texts):
+        cached = morph_cache.get(text)
+        if cached is None:
+            missing.append(text)
+        else:
+            results[text] = cached
+    
+    if missing:
+        try:
+            analyzed = _run_okt_batch(missing)
+        except Exception as e:
+            print(f"품사 분석 중 오류 발생: {e}")
+            analyzed = [tuple()] * len(missing)
+        else:
+            for text, result in zip(missing, analyzed):
+                morph_cache.put(text, result)
+        results.update(zip(missing, analyzed))
     
-    return {"is_incomplete": False}
+    return [results[text] for text in texts]
+
+def keywords_from_morphs(morphs: Tuple[Tuple[str, str], ...]) -> List[str]:
+    """형태소 분석 결과에서 키워드(명사, 동사, 형용사)를 추출합니다."""
+    return [word for word, pos in morphs if pos in KEYWORD_POS]
 
-@lru_cache(maxsize=500)
 def analyze_pos_cached(text: str) -> Tuple[Tuple[str, str], ...]:
     """캐시된 품사 분석"""
-    try:
-        pos_result = okt.pos(text)
-        return tuple(pos_result)  # 튜플로 변환하여 캐시 가능하게
-    except Exception as e:
-        print(f"품사 분석 중 오류 발생: {e}")
-        return tuple()
+    return analyze_morphs(text)
 
 def analyze_pos(text: str) -> List[Tuple[str, str]]:
     """한국어 텍스트의 품사를 분석합니다 (캐시 사용)"""
-    return list(analyze_pos_cached(text))
+    return list(analyze_morphs(text))
 
 def extract_keywords(text: str) -> List[str]:
-    """텍스트에서 키워드를 추출합니다"""
-    try:
-        pos_result = okt.pos(text)
-        keywords = []
-        
-        for word, pos in pos_result:
-            if pos in ['Noun', 'Verb', 'Adjective']:
-                keywords.append(word)
-        
-        return keywords
-    except Exception as e:
-        print(f"키워드 추출 중 오류 발생: {e}")
-        return []
+    """텍스트에서 키워드를 추출합니다 (캐시 사용)"""
+    return keywords_from_morphs(analyze_morphs(text))
 
-@lru_cache(maxsize=500)
 def extract_keywords_cached(text: str) -> Tuple[str, ...]:
     """캐시된 키워드 추출"""
-    return tuple(extract_keywords(text)) 
\ No newline at end of file
+    return tuple(extract_keywords(text))
+
+def get_morph_cache_stats() -> Dict:
+    """형태소 분석 캐시 통계를 반환합니다."""
+    return morph_cache.get_stats()
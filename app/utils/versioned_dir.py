@@ -0,0 +1,41 @@
+import glob
+import os
+import shutil
+import time
+
+def new_version(path: str) -> str:
+    """path 옆에 이 프로세스만 쓰는 새 버전 디렉터리를 만들어 반환합니다."""
+    version = f"{path}.v-{time.time_ns()}-{os.getpid()}"
+    os.makedirs(version)
+    return version
+
+def publish(path: str, version: str, keep: int = 2):
+    """path가 version 디렉터리를 가리키도록 심볼릭 링크를 원자적으로 교체합니다.
+
+    읽는 쪽은 항상 완성된 버전 하나만 보게 됩니다. 동시에 여러 프로세스가 교체하면 마지막 교체가 남습니다.
+    방금 교체되어 아직 읽히고 있을 수 있는 이전 버전을 포함해 최근 keep개 버전만 남기고 지웁니다.
+    """
+    if os.path.isdir(path) and not os.path.islink(path):
+        # 이전 형식(실제 디렉터리)은 버전 디렉터리로 옮긴 뒤 링크로 바꿈 (한 번만)
+        os.rename(path, f"{path}.v-0-{os.getpid()}")
+
+    link = f"{path}.link-{os.getpid()}"
+    if os.path.lexists(link):
+        os.remove(link)
+    os.symlink(os.path.basename(version), link)
+    os.replace(link, path)
+
+    versions = sorted(glob.glob(glob.escape(path) + ".v-*"), key=_version_time, reverse=True)
+    for old in versions[keep:]:
+        if os.path.realpath(old) != os.path.realpath(path):
+            shutil.rmtree(old, ignore_errors=True)
+
+def resolve(path: str) -> str:
+    """path가 가리키는 현재 버전 디렉터리를 반환합니다. (읽는 동안 교체되어도 같은 버전을 읽도록 한 번만 해석)"""
+    return os.path.realpath(path)
+
+def _version_time(version: str) -> int:
+    try:
+        return int(version.rsplit(".v-", 1)[1].split("-")[0])
+    except (IndexError, ValueError):
+        return 0
@@ -0,0 +1,121 @@
+"""인코더 백엔드 일치도/처리량 벤치마크
+
+fp32 torch 백엔드를 기준으로 각 백엔드의 임베딩 코사인 일치도, 인코딩 처리량,
+(의미, 사용자 입력) 쌍의 total_score 차이를 측정하고, 허용 오차 안에서 가장 빠른 백엔드를 추천합니다.
+total_score 계산에는 형태소 분석기(Okt)가 필요합니다.
+
+    python benchmarks/bench_encoder_backends.py --backends torch torch-int8 onnx --tolerance 0.02
+"""
+import argparse
+import json
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import config
+from app.services.embedding_cache import EmbeddingCache
+from app.services.encoder_backends import TorchEncoderBackend, create_encoder_backend
+from app.services.similarity_service import SimilarityService
+
+# 기본 비교 쌍 (--pairs로 JSONL {"meaning": ..., "user_input": ...} 파일을 줄 수 있음)
+DEFAULT_PAIRS = [
+    ("동. 사랑하다 / 명. 사랑", "동. 좋아하다 / 명. 애정"),
+    ("동. 먹다", "동. 섭취하다"),
+    ("명. 행복", "명. 기쁨, 즐거움"),
+    ("형. 아름답다", "형. 예쁘다"),
+    ("동. 달리다, 뛰다", "동. 걷다"),
+    ("명. 학교", "명. 학원"),
+    ("부. 빨리", "부. 천천히"),
+    ("명. 음식, 요리", "명. 밥"),
+    ("동. 공부하다 / 명. 학습", "동. 배우다"),
+    ("명. 친구", "명. 동료, 벗"),
+    ("형. 크다", "형. 거대하다"),
+    ("동. 만들다", "동. 제작하다 / 명. 창작"),
+]
+
+def load_pairs(path: str):
+    pairs = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                item = json.loads(line)
+                pairs.append((item["meaning"], item["user_input"]))
+    return pairs
+
+def corpus_texts(pairs):
+    """처리량/일치도 측정용 문장과 단어 목록을 만듭니다."""
+    texts = []
+    for meaning, user_input in pairs:
+        texts.extend([meaning, user_input])
+        for side in (meaning, user_input):
+            texts.extend(word.strip() for word in side.replace("/", ",").replace(".", ",").split(",") if word.strip())
+    return list(dict.fromkeys(texts))
+
+def total_scores(backend, pairs):
+    """백엔드별 전용 캐시로 각 쌍의 total_score를 계산합니다."""
+    service = SimilarityService(backend, embedding_cache=EmbeddingCache(max_memory_bytes=64 * 2 ** 20))
+    return np.array([analysis.get("total_score", 0.0) for analysis, _ in service.analyze_batch(pairs)])
+
+def main():
+    parser = argparse.ArgumentParser(description="인코더 백엔드 일치도/처리량 벤치마크")
+    parser.add_argument("--model", default=config.MODEL_NAME)
+    parser.add_argument("--backends", nargs="+", default=["torch", "torch-int8", "onnx"])
+    parser.add_argument("--pairs", help="비교 쌍 JSONL 경로")
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--tolerance", type=float, default=0.02, help="허용 total_score 최대 차이")
+    parser.add_argument("--no-scores", action="store_true", help="total_score 비교 생략 (Okt 없는 환경)")
+    parser.add_argument("--output", help="결과를 저장할 JSON 경로")
+    args = parser.parse_args()
+
+    pairs = load_pairs(args.pairs) if args.pairs else DEFAULT_PAIRS
+    texts = corpus_texts(pairs)
+    # 처리량은 충분한 양으로 측정
+    throughput_texts = (texts * (256 // len(texts) + 1))[:256]
+
+    reference = TorchEncoderBackend(args.model)
+    reference_scores = None if args.no_scores else total_scores(reference, pairs)
+
+    results = []
+    for name in args.backends:
+        try:
+            backend = reference if name == reference.name else create_encoder_backend(name, args.model)
+        except ImportError as e:
+            print(f"{name}: 건너뜀 ({e})")
+            continue
+
+        result = {"backend": name}
+        result.update(backend.check_agreement(reference, texts))
+        result.update(backend.measure_throughput(throughput_texts, args.batch_size, args.repeat))
+        if reference_scores is not None:
+            drift = np.abs(total_scores(backend, pairs) - reference_scores)
+            result["max_score_drift"] = float(drift.max())
+            result["mean_score_drift"] = float(drift.mean())
+            result["within_tolerance"] = bool(drift.max() <= args.tolerance)
+        results.append(result)
+
+        drift_text = ""
+        if "max_score_drift" in result:
+            drift_text = f", 점수 차이 최대 {result['max_score_drift']:.4f} / 평균 {result['mean_score_drift']:.4f}"
+        print(f"{name}: 코사인 최소 {result['min_cosine']:.4f} / 평균 {result['mean_cosine']:.4f}, "
+              f"{result['sentences_per_second']:.1f}문장/초{drift_text}")
+
+    eligible = [r for r in results if r.get("within_tolerance", True)]
+    best = max(eligible, key=lambda r: r["sentences_per_second"]) if eligible else None
+    if best:
+        print(f"추천 백엔드: {best['backend']} (GLASSCARD_ENCODER_BACKEND={best['backend']})")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({
+                "model": args.model,
+                "tolerance": args.tolerance,
+                "results": results,
+                "recommended": best["backend"] if best else None
+            }, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""품사 태그 입력 파서 마이크로벤치마크
+
+무작위로 생성한 입력에 대해 요청 하나가 입력을 파싱하는 데 걸리는 시간을
+기존 구현과 단일 패스 파서(parse_input)로 비교합니다.
+두 구현이 같은 결과를 내는지는 tests/test_text_processor.py에서 확인합니다.
+
+    python benchmarks/bench_pos_parser.py --cases 20000
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils.text_processor import parse_input
+from tests.test_text_processor import legacy_parse_request_side, random_input, structured_input
+
+def main():
+    parser = argparse.ArgumentParser(description="품사 태그 입력 파서 마이크로벤치마크")
+    parser.add_argument("--cases", type=int, default=20000, help="무작위 입력 수")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=5, help="벤치마크 반복 횟수")
+    parser.add_argument("--output", help="결과를 저장할 JSON 경로")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    cases = [random_input(rng) if i % 2 else structured_input(rng) for i in range(args.cases)]
+    cases += ["동. 사랑하다 / 명. 사랑", "동.", "동. /", "동. / 명.", "동 .", "사랑, 행복", "", "동. 먹다\n명. 음식"]
+
+    sample = cases[:2000]
+    legacy_time = min(timeit.repeat(lambda: [legacy_parse_request_side(t) for t in sample],
+                                    number=1, repeat=args.repeat))
+    new_time = min(timeit.repeat(lambda: [parse_input(t) for t in sample], number=1, repeat=args.repeat))
+    per_legacy = legacy_time / len(sample) * 1e6
+    per_new = new_time / len(sample) * 1e6
+    print(f"기존 구현: {per_legacy:.2f}us/입력, 단일 패스: {per_new:.2f}us/입력 ({per_legacy / per_new:.1f}x)")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({
+                "cases": len(cases),
+                "legacy_us": per_legacy,
+                "single_pass_us": per_new
+            }, f, indent=2)
+
+if __name__ == "__main__":
+    main()
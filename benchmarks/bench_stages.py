@@ -0,0 +1,152 @@
+"""점수 계산 파이프라인 단계별 마이크로벤치마크
+
+입력 파싱, Okt 키워드 추출, 동의어 점수, WordDatabase.find_best_match(단어장 크기별),
+analyze_similarity_with_pos 전체 경로, 응답 형식별 생성과 직렬화의 회당 시간(us)을 측정합니다.
+기본은 결정적인 스텁 인코더를 사용하므로 모델 다운로드 없이 실행됩니다. (Okt는 필요)
+
+    python benchmarks/bench_stages.py --output results/stages.json
+    python benchmarks/bench_stages.py --real-model --vocab 1000 100000
+"""
+import argparse
+import os
+import random
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models.vector_index import create_index
+from app.models.word_database import WordDatabase
+from app.services.embedding_cache import EmbeddingCache
+from app.services.response_format import ResponseFormat, dumps
+from app.services.similarity_service import SimilarityService
+from app.services.synonym_index import get_synonym_index
+from app.utils.text_processor import _run_okt, keywords_from_morphs, extract_keywords_cached, parse_input
+from benchmarks.common import create_model, measure, metric, print_metrics, write_results
+
+# 대표 입력 (품사 태그 / 쉼표 구분 / 문장형)
+PAIRS = [
+    ("동. 사랑하다 / 명. 사랑", "동. 좋아하다 / 명. 애정"),
+    ("명. 행복, 기쁨", "명. 즐거움"),
+    ("형. 아름답다, 예쁘다", "형. 곱다"),
+    ("동. 먹다, 섭취하다 / 명. 음식", "동. 먹다"),
+    ("사랑, 행복, 기쁨", "애정, 행복"),
+    ("부. 빨리", "부. 신속히"),
+    ("명. 학교에서 공부하는 학생", "명. 학생"),
+    ("동. 달리다, 뛰다, 걷다", "동. 뛰다"),
+]
+
+SYLLABLES = "가나다라마바사아자차카타파하사랑행복기쁨학교공부음식달리다"
+
+def random_words(count: int, rng: random.Random):
+    return [
+        "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 5))) + f"{i}"
+        for i in range(count)
+    ]
+
+def build_word_database(model, size: int, backend: str, rng: random.Random) -> WordDatabase:
+    """무작위 단어장을 만듭니다. (임베딩은 한 번에 계산해 인덱스에 직접 적재)"""
+    cache = EmbeddingCache(max_memory_bytes=64 * 2 ** 20)
+    database = WordDatabase(model, embedding_cache=cache, index=create_index(backend))
+    words = random_words(size, rng)
+    embeddings = np.asarray(model.encode(words, batch_size=256), dtype=np.float32)
+    embeddings /= np.maximum(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12)
+
+    word_ids = list(range(1, size + 1))
+    for word_id, word in zip(word_ids, words):
+        database.words[word_id] = {"word": word, "meaning": word, "pos": None, "keywords": []}
+        database.word_to_ids.setdefault(word, []).append(word_id)
+        database.meaning_to_ids.setdefault(word, []).append(word_id)
+    database.word_id_counter = size + 1
+    database.index.add(word_ids, embeddings)
+    return database
+
+def main():
+    parser = argparse.ArgumentParser(description="점수 계산 파이프라인 단계별 마이크로벤치마크")
+    parser.add_argument("--vocab", type=int, nargs="+", default=[1000, 100000], help="단어장 크기")
+    parser.add_argument("--index", default="exact", help="단어장 인덱스 백엔드 (exact/ivf)")
+    parser.add_argument("--number", type=int, default=200, help="측정당 실행 횟수")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--real-model", action="store_true", help="스텁 대신 설정의 실제 모델 사용")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="결과를 저장할 JSON 경로")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    model = create_model(args.real_model)
+    texts = [text for pair in PAIRS for text in pair]
+    metrics = {}
+
+    # 입력 파싱
+    metrics["parse_us"] = metric(measure(lambda: [parse_input(text) for text in texts], args.number, args.repeat)
+                                 / len(texts), "us")
+
+    # Okt 키워드 추출 (캐시 없이 / 캐시 적중)
+    okt_number = max(1, args.number // 10)
+    metrics["okt_keywords_cold_us"] = metric(
+        measure(lambda: [keywords_from_morphs(_run_okt(text)) for text in texts], okt_number, args.repeat)
+        / len(texts), "us")
+    metrics["okt_keywords_cached_us"] = metric(
+        measure(lambda: [extract_keywords_cached(text) for text in texts], args.number, args.repeat)
+        / len(texts), "us")
+
+    # 동의어 점수
+    synonym_index = get_synonym_index()
+    parsed_pairs = [(parse_input(meaning).words, parse_input(user_input).words) for meaning, user_input in PAIRS]
+    metrics["synonym_score_us"] = metric(
+        measure(lambda: [synonym_index.score(m, u) for m, u in parsed_pairs], args.number, args.repeat)
+        / len(parsed_pairs), "us")
+
+    # 단어장 검색 (질의 임베딩은 캐시 적중 상태로 검색 비용만 측정)
+    for size in args.vocab:
+        database = build_word_database(model, size, args.index, rng)
+        queries = [user_words for _, user_words in parsed_pairs]
+        for user_words in queries:
+            database.find_best_match(" ".join(user_words), user_words)
+        number = max(1, args.number // max(1, size // 1000))
+        metrics[f"find_best_match_{size}_us"] = metric(
+            measure(lambda: [database.find_best_match(" ".join(u), u) for u in queries], number, args.repeat)
+            / len(queries), "us")
+        del database
+
+    # 전체 경로 (임베딩 캐시 적중 / 요청마다 새 임베딩 캐시)
+    service = SimilarityService(model, embedding_cache=EmbeddingCache(max_memory_bytes=64 * 2 ** 20))
+    metrics["analyze_warm_us"] = metric(
+        measure(lambda: [service.analyze_similarity_with_pos(m, u) for m, u in PAIRS], args.number, args.repeat)
+        / len(PAIRS), "us")
+
+    def analyze_cold():
+        cold_service = SimilarityService(model, embedding_cache=EmbeddingCache(max_memory_bytes=64 * 2 ** 20))
+        for meaning, user_input in PAIRS:
+            cold_service.analyze_similarity_with_pos(meaning, user_input)
+
+    metrics["analyze_cold_embeddings_us"] = metric(
+        measure(analyze_cold, max(1, args.number // 10), args.repeat) / len(PAIRS), "us")
+
+    # 응답 생성 + 직렬화 (단어 10 x 10 카드, 기존 형식 / 상위 5개 / 열 형식)
+    words = random_words(10, rng)
+    analysis_result, similarity_matrix = service._analyze(", ".join(words), ", ".join(reversed(words)))
+    for view in ("full", "top_k", "columnar"):
+        response_format = ResponseFormat(view=view)
+
+        def respond():
+            comparisons = response_format.build_comparisons(service, analysis_result, similarity_matrix)
+            return dumps(response_format.format(analysis_result, comparisons))
+
+        metrics[f"response_{view}_us"] = metric(measure(respond, args.number, args.repeat), "us")
+
+    print(f"단계별 회당 시간 ({'실제 모델' if args.real_model else '스텁 인코더'}):")
+    print_metrics(metrics)
+
+    if args.output:
+        write_results(args.output, "stages", {
+            "real_model": args.real_model,
+            "vocab": args.vocab,
+            "index": args.index,
+            "number": args.number,
+            "repeat": args.repeat
+        }, metrics)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""단어장 인덱스 재현율/지연 시간 벤치마크
+
+합성 임베딩으로 정확 검색(ExactIndex)과 근사 검색(IVFIndex)을 비교합니다.
+
+    python benchmarks/bench_vector_index.py --size 100000 --n-probe 4 8 16 32
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models.vector_index import ExactIndex, IVFIndex
+
+def make_embeddings(size: int, dim: int, clusters: int, rng: np.random.Generator) -> np.ndarray:
+    """군집 구조를 가진 정규화된 합성 임베딩을 만듭니다. (실제 문장 임베딩과 비슷한 분포)"""
+    centers = rng.standard_normal((clusters, dim)).astype(np.float32)
+    labels = rng.integers(0, clusters, size)
+    vectors = centers[labels] + 0.6 * rng.standard_normal((size, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+def make_queries(base: np.ndarray, count: int, words_per_query: int, rng: np.random.Generator):
+    """기존 벡터 근처의 질의(사용자 단어 여러 개)를 만듭니다."""
+    queries = []
+    for _ in range(count):
+        picks = base[rng.integers(0, len(base), words_per_query)]
+        noisy = picks + 0.3 * rng.standard_normal(picks.shape).astype(np.float32)
+        queries.append(noisy / np.linalg.norm(noisy, axis=1, keepdims=True))
+    return queries
+
+def run_queries(index, queries, top_k: int):
+    """질의를 실행하고 결과와 지연 시간(ms)을 반환합니다."""
+    results, latencies = [], []
+    for query in queries:
+        started = time.perf_counter()
+        results.append([word_id for word_id, _ in index.search(query, top_k)])
+        latencies.append((time.perf_counter() - started) * 1000)
+    return results, np.array(latencies)
+
+def recall(results, truth) -> float:
+    hits = sum(len(set(r) & set(t)) for r, t in zip(results, truth))
+    return hits / sum(len(t) for t in truth)
+
+def main():
+    parser = argparse.ArgumentParser(description="단어장 인덱스 재현율/지연 시간 벤치마크")
+    parser.add_argument("--size", type=int, default=100000, help="단어 수")
+    parser.add_argument("--dim", type=int, default=384, help="임베딩 차원")
+    parser.add_argument("--clusters", type=int, default=2000, help="합성 데이터 군집 수")
+    parser.add_argument("--queries", type=int, default=200, help="질의 수")
+    parser.add_argument("--words-per-query", type=int, default=3, help="질의당 사용자 단어 수")
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--n-lists", type=int, default=0, help="IVF 리스트 수 (0이면 4*sqrt(N))")
+    parser.add_argument("--n-probe", type=int, nargs="+", default=[4, 8, 16, 32])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="결과를 저장할 JSON 경로")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    vectors = make_embeddings(args.size, args.dim, args.clusters, rng)
+    queries = make_queries(vectors, args.queries, args.words_per_query, rng)
+    word_ids = list(range(1, args.size + 1))
+
+    exact = ExactIndex()
+    exact.add(word_ids, vectors)
+    truth, exact_latencies = run_queries(exact, queries, args.top_k)
+
+    started = time.perf_counter()
+    ivf = IVFIndex(n_lists=args.n_lists, min_train_size=min(10000, args.size), seed=args.seed)
+    ivf.add(word_ids, vectors)
+    build_seconds = time.perf_counter() - started
+
+    report = {
+        "size": args.size,
+        "dim": args.dim,
+        "top_k": args.top_k,
+        "exact": {
+            "p50_ms": float(np.percentile(exact_latencies, 50)),
+            "p95_ms": float(np.percentile(exact_latencies, 95)),
+            "memory_mb": exact.store.vectors[:exact.store.size].nbytes / 2 ** 20
+        },
+        "ivf": {
+            "n_lists": len(ivf.centroids),
+            "build_seconds": build_seconds,
+            "memory_mb": ivf.store.vectors[:ivf.store.size].nbytes / 2 ** 20,
+            "runs": []
+        }
+    }
+
+    print(f"정확 검색: p50 {report['exact']['p50_ms']:.2f}ms, p95 {report['exact']['p95_ms']:.2f}ms, "
+          f"{report['exact']['memory_mb']:.1f}MB")
+    print(f"IVF 학습: 리스트 {len(ivf.centroids)}개, {build_seconds:.1f}초, {report['ivf']['memory_mb']:.1f}MB")
+    print(f"{'n_probe':>8} {'recall@k':>9} {'p50(ms)':>9} {'p95(ms)':>9} {'speedup':>8}")
+
+    for n_probe in args.n_probe:
+        ivf.n_probe = n_probe
+        results, latencies = run_queries(ivf, queries, args.top_k)
+        run = {
+            "n_probe": n_probe,
+            "recall": recall(results, truth),
+            "p50_ms": float(np.percentile(latencies, 50)),
+            "p95_ms": float(np.percentile(latencies, 95)),
+            "speedup": float(np.median(exact_latencies) / np.median(latencies))
+        }
+        report["ivf"]["runs"].append(run)
+        print(f"{n_probe:>8} {run['recall']:>9.3f} {run['p50_ms']:>9.2f} {run['p95_ms']:>9.2f} {run['speedup']:>7.1f}x")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    main()
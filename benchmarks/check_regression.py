@@ -0,0 +1,84 @@
+"""벤치마크 결과 회귀 검사
+
+기준 결과 JSON과 현재 결과 JSON의 지표를 비교하여, 지표의 방향(better)에 따라
+허용 비율보다 나빠진 항목이 있으면 종료 코드 1로 끝납니다. (CI에서 사용)
+
+    python benchmarks/check_regression.py baseline/stages.json results/stages.json
+    python benchmarks/check_regression.py base.json cur.json --max-regression 0.2 --threshold latency_p99_ms=0.5
+"""
+import argparse
+import json
+import sys
+from typing import Dict, List
+
+def load_metrics(path: str) -> Dict[str, Dict]:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f).get("metrics", {})
+
+def parse_thresholds(items: List[str]) -> Dict[str, float]:
+    """'지표=비율' 형식의 지표별 허용 비율을 읽습니다."""
+    thresholds = {}
+    for item in items:
+        name, _, value = item.partition("=")
+        thresholds[name] = float(value)
+    return thresholds
+
+def compare(baseline: Dict[str, Dict], current: Dict[str, Dict], max_regression: float,
+            thresholds: Dict[str, float], min_abs: float) -> List[Dict]:
+    """두 결과의 공통 지표를 비교합니다. change는 나빠진 방향이 양수인 상대 변화량입니다."""
+    rows = []
+    for name, base in baseline.items():
+        if name not in current:
+            continue
+        base_value, value = base["value"], current[name]["value"]
+        better = base.get("better", "lower")
+        limit = thresholds.get(name, max_regression)
+
+        worse = value - base_value if better == "lower" else base_value - value
+        if base_value:
+            change = worse / abs(base_value)
+        else:
+            change = float("inf") if worse > min_abs else 0.0
+        rows.append({
+            "name": name,
+            "unit": base.get("unit", ""),
+            "baseline": base_value,
+            "current": value,
+            "change": change,
+            "limit": limit,
+            "regressed": change > limit and worse > min_abs
+        })
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description="벤치마크 결과 회귀 검사")
+    parser.add_argument("baseline", help="기준 결과 JSON")
+    parser.add_argument("current", help="현재 결과 JSON")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="허용하는 최대 악화 비율 (기본 20%%)")
+    parser.add_argument("--threshold", action="append", default=[], metavar="지표=비율",
+                        help="지표별 허용 비율 (여러 번 지정 가능)")
+    parser.add_argument("--min-abs", type=float, default=0.0,
+                        help="이 값 이하의 절대 변화는 무시 (작은 값의 잡음 방지)")
+    args = parser.parse_args()
+
+    rows = compare(load_metrics(args.baseline), load_metrics(args.current), args.max_regression,
+                   parse_thresholds(args.threshold), args.min_abs)
+    if not rows:
+        print("비교할 공통 지표가 없습니다.")
+        sys.exit(2)
+
+    width = max(len(row["name"]) for row in rows)
+    print(f"  {'지표':<{width - 2}}  {'기준':>12}  {'현재':>12}  {'변화':>8}  허용")
+    for row in rows:
+        mark = "❌ 회귀" if row["regressed"] else "✅"
+        print(f"  {row['name']:<{width}}  {row['baseline']:>12.2f}  {row['current']:>12.2f}  "
+              f"{row['change']:>+8.1%}  {row['limit']:.0%} {mark}")
+
+    regressed = [row["name"] for row in rows if row["regressed"]]
+    if regressed:
+        print(f"성능 회귀 {len(regressed)}건: {', '.join(regressed)}")
+        sys.exit(1)
+    print("성능 회귀 없음")
+
+if __name__ == "__main__":
+    main()
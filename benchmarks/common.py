@@ -0,0 +1,108 @@
+"""벤치마크 공통 도구: 스텁 인코더, 측정 헬퍼, 결과 JSON 형식
+
+결과 파일 형식 (check_regression.py가 비교):
+
+    {"suite": "...", "created_at": ..., "config": {...},
+     "metrics": {"이름": {"value": 1.23, "unit": "us", "better": "lower"}}}
+"""
+import json
+import os
+import platform
+import sys
+import time
+import zlib
+from typing import Callable, Dict, List, Union
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.encoder_backends import EncoderBackend
+
+class StubEncoderBackend(EncoderBackend):
+    """모델 없이 결정적인 임베딩을 만드는 스텁 인코더
+
+    글자별 고정 난수 벡터의 합을 사용하므로 글자를 공유하는 단어끼리 유사도가 높게 나옵니다.
+    latency_ms를 주면 encode 호출마다 그만큼 대기해 모델 추론 시간을 흉내 냅니다. (GIL 해제)
+    """
+
+    name = "stub"
+
+    def __init__(self, dim: int = 384, latency_ms: float = 0.0):
+        self.dim = dim
+        self.latency = latency_ms / 1000.0
+        self._char_vectors = {}
+
+    def _char_vector(self, char: str) -> np.ndarray:
+        vector = self._char_vectors.get(char)
+        if vector is None:
+            rng = np.random.default_rng(zlib.crc32(char.encode("utf-8")))
+            vector = self._char_vectors[char] = rng.standard_normal(self.dim).astype(np.float32)
+        return vector
+
+    def encode(self, sentences: Union[str, List[str]], batch_size: int = 32, **kwargs) -> np.ndarray:
+        single = isinstance(sentences, str)
+        sentence_list = [sentences] if single else list(sentences)
+        embeddings = np.zeros((len(sentence_list), self.dim), dtype=np.float32)
+        for i, sentence in enumerate(sentence_list):
+            for char in sentence:
+                if not char.isspace():
+                    embeddings[i] += self._char_vector(char)
+        if self.latency:
+            time.sleep(self.latency)
+        return embeddings[0] if single else embeddings
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.dim
+
+def create_model(real_model: bool, stub_latency_ms: float = 0.0) -> EncoderBackend:
+    """스텁 인코더 또는 설정의 실제 모델 백엔드를 생성합니다."""
+    if not real_model:
+        return StubEncoderBackend(latency_ms=stub_latency_ms)
+    from app import config
+    from app.services.encoder_backends import create_encoder_backend
+    return create_encoder_backend(config.ENCODER_BACKEND, config.MODEL_NAME)
+
+def measure(func: Callable, number: int, repeat: int = 5) -> float:
+    """func를 number번 실행하는 측정을 repeat번 반복하여 가장 빠른 회당 시간(us)을 반환합니다."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, time.perf_counter() - started)
+    return best / number * 1e6
+
+def percentiles(samples_ms: List[float]) -> Dict[str, float]:
+    """지연 시간 표본의 p50/p95/p99/max(ms)를 계산합니다."""
+    if not samples_ms:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+    values = np.asarray(samples_ms)
+    return {
+        "p50": float(np.percentile(values, 50)),
+        "p95": float(np.percentile(values, 95)),
+        "p99": float(np.percentile(values, 99)),
+        "max": float(values.max())
+    }
+
+def metric(value: float, unit: str, better: str = "lower") -> Dict:
+    return {"value": float(value), "unit": unit, "better": better}
+
+def write_results(path: str, suite: str, run_config: Dict, metrics: Dict[str, Dict], details: Dict = None):
+    """결과를 JSON으로 저장합니다. (details는 비교 대상이 아닌 참고 정보)"""
+    report = {
+        "suite": suite,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "host": {"python": platform.python_version(), "machine": platform.machine(), "cpus": os.cpu_count()},
+        "config": run_config,
+        "metrics": metrics,
+        "details": details or {}
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"결과 저장: {path}")
+
+def print_metrics(metrics: Dict[str, Dict]):
+    width = max(len(name) for name in metrics)
+    for name, item in metrics.items():
+        print(f"  {name:<{width}}  {item['value']:>12.2f} {item['unit']}")
@@ -0,0 +1,142 @@
+"""프로세스 내 부하 테스트
+
+FastAPI 앱을 같은 프로세스에서 띄우고(시작 이벤트, 워밍업 포함) ASGI로 직접 요청을 보내
+처리량과 p50/p95/p99 지연 시간을 측정합니다. 네트워크와 uvicorn 비용은 포함하지 않습니다.
+기본은 스텁 인코더를 사용하므로 모델 다운로드 없이 실행됩니다. (Okt는 필요)
+
+    python benchmarks/load_test.py --requests 2000 --concurrency 32 --output results/load.json
+    python benchmarks/load_test.py --real-model --endpoint compare-batch
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_stages import PAIRS, random_words
+from benchmarks.common import create_model, metric, percentiles, print_metrics, write_results
+
+def make_payloads(count: int, cold_ratio: float, rng: random.Random):
+    """요청 본문 목록을 만듭니다. cold_ratio 비율은 캐시에 없는 새 단어를 섞습니다."""
+    payloads = []
+    for _ in range(count):
+        meaning, user_input = rng.choice(PAIRS)
+        if rng.random() < cold_ratio:
+            user_input = f"{user_input}, {random_words(1, rng)[0]}"
+        payloads.append({"meaning": meaning, "user_input": user_input})
+    return payloads
+
+async def send(client: httpx.AsyncClient, endpoint: str, payload, batch_size: int):
+    if endpoint == "compare":
+        return await client.post("/api/v1/compare", json=payload)
+    if endpoint == "compare-query":
+        return await client.post("/api/v1/compare-query", params=payload)
+    return await client.post("/api/v1/compare-batch", json={"items": [payload] * batch_size})
+
+async def run_load(app, endpoint: str, payloads, concurrency: int, batch_size: int):
+    """동시 사용자 concurrency명이 요청을 나눠 보내고 지연 시간과 상태 코드를 모읍니다."""
+    latencies, statuses = [], {}
+    next_index = iter(range(len(payloads)))
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench",
+                                 timeout=60) as client:
+        async def user():
+            for index in next_index:
+                started = time.perf_counter()
+                response = await send(client, endpoint, payloads[index], batch_size)
+                latencies.append((time.perf_counter() - started) * 1000)
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(user() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+        server_stats = (await client.get("/api/v1/stats")).json()
+
+    return latencies, statuses, elapsed, server_stats
+
+async def main_async(args):
+    import main
+    from app.services.startup import startup_tracker
+
+    rng = random.Random(args.seed)
+    # 시작 이벤트가 모델을 다시 로드하지 않도록 미리 만든 인코더를 넘김 (prefork 사전 로드와 같은 경로)
+    main.app.state.preloaded_model = create_model(args.real_model, args.stub_latency_ms)
+
+    await main.app.router.startup()
+    try:
+        while not startup_tracker.ready:
+            if startup_tracker.error:
+                raise RuntimeError(f"시작 실패: {startup_tracker.error}")
+            await asyncio.sleep(0.05)
+
+        # 워밍업 (측정 제외)
+        await run_load(main.app, args.endpoint, make_payloads(args.warmup, args.cold_ratio, rng),
+                       args.concurrency, args.batch_size)
+        latencies, statuses, elapsed, server_stats = await run_load(
+            main.app, args.endpoint, make_payloads(args.requests, args.cold_ratio, rng),
+            args.concurrency, args.batch_size)
+    finally:
+        await main.app.router.shutdown()
+
+    errors = sum(count for status, count in statuses.items() if status != 200)
+    latency = percentiles(latencies)
+    items_per_request = args.batch_size if args.endpoint == "compare-batch" else 1
+    metrics = {
+        "throughput_rps": metric(len(latencies) / elapsed, "req/s", "higher"),
+        "throughput_items_per_s": metric(len(latencies) * items_per_request / elapsed, "items/s", "higher"),
+        "latency_p50_ms": metric(latency["p50"], "ms"),
+        "latency_p95_ms": metric(latency["p95"], "ms"),
+        "latency_p99_ms": metric(latency["p99"], "ms"),
+        "error_rate": metric(errors / max(1, len(latencies)), "ratio")
+    }
+
+    print(f"부하 테스트 ({args.endpoint}, 동시 {args.concurrency}, {len(latencies)}건, "
+          f"{'실제 모델' if args.real_model else '스텁 인코더'}): 상태 코드 {statuses}")
+    print_metrics(metrics)
+
+    if args.output:
+        write_results(args.output, f"load-{args.endpoint}", {
+            "endpoint": args.endpoint,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "batch_size": args.batch_size,
+            "cold_ratio": args.cold_ratio,
+            "real_model": args.real_model,
+            "stub_latency_ms": args.stub_latency_ms
+        }, metrics, details={
+            "statuses": statuses,
+            "stages": server_stats.get("stages"),
+            "encoder": server_stats.get("encoder"),
+            "embedding_cache": server_stats.get("embedding_cache")
+        })
+
+def main():
+    parser = argparse.ArgumentParser(description="프로세스 내 부하 테스트")
+    parser.add_argument("--endpoint", choices=["compare", "compare-query", "compare-batch"], default="compare")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--warmup", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--batch-size", type=int, default=32, help="compare-batch 요청당 항목 수")
+    parser.add_argument("--cold-ratio", type=float, default=0.2, help="캐시에 없는 새 단어를 섞는 요청 비율")
+    parser.add_argument("--real-model", action="store_true", help="스텁 대신 설정의 실제 모델 사용")
+    parser.add_argument("--stub-latency-ms", type=float, default=0.0, help="스텁 인코더 호출당 지연 (모델 비용 흉내)")
+    parser.add_argument("--request-logs", action="store_true", help="설정값대로 요청 로그 출력")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="결과를 저장할 JSON 경로")
+    args = parser.parse_args()
+
+    if not args.request_logs:
+        # 측정 결과 출력과 섞이지 않도록 오류 외의 요청 로그는 끔
+        from app import config
+        config.LOG_SAMPLE_RATE = 0.0
+        config.LOG_LOW_SCORE_THRESHOLD = float("-inf")
+    asyncio.run(main_async(args))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""단계별 빠른 경로(tiered) 검증 보고서
+
+정답 여부가 표시된 표본(JSON Lines: meaning, user_input, correct)을 전체 계산과 tiered 모드로
+각각 채점하여, 단계(tier)별로 통과 판정이 얼마나 다른지와 총점 차이, 정답 레이블 대비 정확도를 보고합니다.
+임계값을 바꿔 보며 빠른 경로가 전체 계산과 어긋나는 비율을 확인하는 용도입니다.
+스텁 인코더의 의미 유사도는 실제 모델과 다르므로 실제 판단에는 --real-model 결과를 사용하세요.
+
+    python benchmarks/validate_fast_path.py --real-model
+    python benchmarks/validate_fast_path.py --real-model --pass-threshold 0.75 --synonym-similarity 0.85
+"""
+import argparse
+import json
+import os
+import sys
+from collections import Counter, defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import config
+from app.services.embedding_cache import EmbeddingCache
+from app.services.similarity_service import SimilarityService
+from benchmarks.common import create_model, metric, print_metrics, write_results
+
+DEFAULT_SAMPLE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "fast_path_sample.jsonl")
+
+def load_sample(path: str):
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def main():
+    parser = argparse.ArgumentParser(description="단계별 빠른 경로 검증 보고서")
+    parser.add_argument("--sample", default=DEFAULT_SAMPLE, help="정답 레이블 표본 (JSON Lines)")
+    parser.add_argument("--pass-threshold", type=float, default=config.FAST_PATH_PASS_THRESHOLD)
+    parser.add_argument("--synonym-similarity", type=float, default=config.FAST_PATH_SYNONYM_SIMILARITY,
+                        help="동의어 쌍에 가정하는 의미 유사도 (0이면 동의어 단계를 끔)")
+    parser.add_argument("--real-model", action="store_true", help="스텁 대신 설정의 실제 모델 사용")
+    parser.add_argument("--output", help="결과를 저장할 JSON 경로")
+    args = parser.parse_args()
+
+    model = create_model(args.real_model)
+    sample = load_sample(args.sample)
+    # 두 방식이 임베딩 캐시를 공유하면 tiered가 모두 cached로 답하므로 따로 둠
+    tiered = SimilarityService(model, embedding_cache=EmbeddingCache(max_memory_bytes=64 * 2 ** 20))
+    full = SimilarityService(model, embedding_cache=EmbeddingCache(max_memory_bytes=64 * 2 ** 20))
+
+    tiers = Counter()
+    disagreements = defaultdict(list)
+    score_diffs = defaultdict(list)
+    correct_full = correct_tiered = labelled = 0
+
+    for item in sample:
+        fast_result, _ = tiered.analyze_tiered(item["meaning"], item["user_input"],
+                                               pass_threshold=args.pass_threshold,
+                                               synonym_similarity=args.synonym_similarity)
+        full_result = full.analyze_similarity_with_pos(item["meaning"], item["user_input"])
+        if "error" in full_result:
+            continue
+
+        tier = fast_result["tier"]
+        tiers[tier] += 1
+        fast_pass = fast_result["total_score"] >= args.pass_threshold
+        full_pass = full_result["total_score"] >= args.pass_threshold
+        score_diffs[tier].append(abs(fast_result["total_score"] - full_result["total_score"]))
+        if fast_pass != full_pass:
+            disagreements[tier].append((item, fast_result["total_score"], full_result["total_score"]))
+
+        if "correct" in item:
+            labelled += 1
+            correct_full += full_pass == item["correct"]
+            correct_tiered += fast_pass == item["correct"]
+
+    total = sum(tiers.values())
+    fast_answers = tiers["exact"] + tiers["synonym"]
+    disagreement_count = sum(len(items) for items in disagreements.values())
+
+    print(f"표본 {total}건 (통과 임계값 {args.pass_threshold}, 동의어 가정 유사도 {args.synonym_similarity}, "
+          f"{'실제 모델' if args.real_model else '스텁 인코더'})")
+    print(f"  {'단계':<8} {'건수':>6} {'판정 불일치':>10} {'평균 총점 차':>12} {'최대 총점 차':>12}")
+    for tier in ("exact", "synonym", "cached", "model"):
+        diffs = score_diffs.get(tier, [])
+        print(f"  {tier:<8} {tiers[tier]:>6} {len(disagreements.get(tier, [])):>10} "
+              f"{(sum(diffs) / len(diffs) if diffs else 0.0):>12.4f} {max(diffs, default=0.0):>12.4f}")
+
+    for tier, items in disagreements.items():
+        for item, fast_score, full_score in items:
+            print(f"  ⚠️  [{tier}] '{item['meaning']}' vs '{item['user_input']}': "
+                  f"빠른 경로 {fast_score:.3f} / 전체 {full_score:.3f}")
+
+    metrics = {
+        "fast_path_ratio": metric(fast_answers / total if total else 0.0, "ratio", "higher"),
+        "model_call_ratio": metric(tiers["model"] / total if total else 0.0, "ratio"),
+        "disagreement_rate": metric(disagreement_count / total if total else 0.0, "ratio"),
+        "label_accuracy_full": metric(correct_full / labelled if labelled else 0.0, "ratio", "higher"),
+        "label_accuracy_tiered": metric(correct_tiered / labelled if labelled else 0.0, "ratio", "higher")
+    }
+    print_metrics(metrics)
+
+    if args.output:
+        write_results(args.output, "fast-path", {
+            "sample": args.sample,
+            "pass_threshold": args.pass_threshold,
+            "synonym_similarity": args.synonym_similarity,
+            "real_model": args.real_model
+        }, metrics, details={"tiers": dict(tiers)})
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,20 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
-from sentence_transformers import SentenceTransformer
 import uvicorn
 
-from app.api.routes import router, init_services
+from app import config
+from app.api.routes import router, init_services, warmup_services, shutdown_services, render_metrics
+from app.services.batch_encoder import BatchingEncoder
+from app.services.embedding_cache import get_embedding_cache
+from app.services.encoder_backends import ENCODER_BACKENDS, create_encoder_backend
+from app.services.prefork import PreforkServer, is_primary_process
+from app.services.request_log import close_request_logger
+from app.services.startup import startup_tracker, load_warmup_corpus
+from app.utils.text_processor import init_okt, attach_jvm_thread, analyze_morphs_batch
 
 # FastAPI 앱 생성
 app = FastAPI(
@@ -21,20 +32,79 @@ app.add_middleware(
     allow_headers=["*"],  # 모든 헤더 허용
 )
 
+def initialize_services():
+    """모델과 JVM을 병렬로 로드하고, 서비스 초기화와 워밍업을 마친 뒤 준비 상태로 전환합니다."""
+    try:
+        with ThreadPoolExecutor(max_workers=2, thread_name_prefix="startup") as pool:
+            def load_model():
+                # prefork 모드에서는 fork 전에 부모가 로드한 모델을 그대로 공유
+                preloaded = getattr(app.state, "preloaded_model", None)
+                if preloaded is not None:
+                    return preloaded
+                with startup_tracker.phase("model_load"):
+                    return create_encoder_backend(config.ENCODER_BACKEND, config.MODEL_NAME)
+            
+            def start_jvm():
+                with startup_tracker.phase("jvm_start"):
+                    init_okt()
+            
+            print(f"sentence-transformers 모델과 형태소 분석기를 로드하는 중... (백엔드: {config.ENCODER_BACKEND})")
+            model_future = pool.submit(load_model)
+            jvm_future = pool.submit(start_jvm)
+            model = model_future.result()
+            jvm_future.result()
+        
+        with startup_tracker.phase("services_init"):
+            # 동시 요청의 encode 호출을 모아 배치로 처리하는 앞단
+            encoder = BatchingEncoder(
+                model,
+                max_batch_size=config.ENCODER_MAX_BATCH_SIZE,
+                max_wait_ms=config.ENCODER_MAX_WAIT_MS
+            )
+            app.state.encoder = encoder
+            
+            print("서비스들을 초기화하는 중...")
+            init_services(encoder)
+        
+        # 첫 요청이 torch 지연 초기화, 첫 JVM 호출, 토크나이저 준비 비용을 떠안지 않도록 미리 실행
+        warmup_texts = load_warmup_corpus(config.WARMUP_FILE)
+        if warmup_texts:
+            attach_jvm_thread()
+            with startup_tracker.phase("warmup_encode"):
+                encoder.encode(warmup_texts)
+                encoder.encode(warmup_texts[0])
+            with startup_tracker.phase("warmup_morph"):
+                analyze_morphs_batch(warmup_texts)
+            with startup_tracker.phase("warmup_scoring"):
+                warmup_services(warmup_texts)
+        
+        startup_tracker.mark_ready()
+        print("GlassCard 시스템이 성공적으로 시작되었습니다!")
+    except Exception as e:
+        startup_tracker.mark_failed(e)
+
 @app.on_event("startup")
 async def startup_event():
     """앱 시작 시 초기화"""
     print("GlassCard 시스템을 시작합니다...")
     
-    # 모델 로드
-    print("sentence-transformers 모델을 로드하는 중...")
-    model = SentenceTransformer('sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2')
+    # 무거운 초기화는 백그라운드에서 진행 (그동안 /health는 응답하고 /ready는 503)
+    app.state.startup_thread = threading.Thread(target=initialize_services, name="startup", daemon=True)
+    app.state.startup_thread.start()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """앱 종료 시 정리"""
+    shutdown_services()
+    if getattr(app.state, "encoder", None):
+        app.state.encoder.close()
     
-    # 서비스 초기화
-    print("서비스들을 초기화하는 중...")
-    init_services(model)
+    # 임베딩 캐시 디스크 계층 저장 (재시작 시 웜 스타트, prefork 워커들이 서로 덮어쓰지 않도록 한 프로세스만)
+    if is_primary_process():
+        get_embedding_cache().save_disk()
     
-    print("GlassCard 시스템이 성공적으로 시작되었습니다!")
+    # 남은 요청 로그 기록
+    close_request_logger()
 
 # 라우터 등록
 app.include_router(router, prefix="/api/v1", tags=["word-analysis"])
@@ -53,6 +123,40 @@ async def health_check():
     """헬스 체크 엔드포인트"""
     return {"status": "healthy", "service": "GlassCard"}
 
+@app.get("/ready")
+async def readiness_check():
+    """준비 상태 엔드포인트 (모델 로드와 워밍업이 끝나기 전에는 503)"""
+    status = startup_tracker.get_status()
+    return JSONResponse(status_code=200 if status["status"] == "ready" else 503, content=status)
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus 형식 성능 지표 엔드포인트 (단계별 지연 시간, 배치 크기, 캐시 적중률, 처리 중 요청 수)"""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+def run_prefork(host: str, port: int):
+    """모델을 한 번 로드한 뒤 워커 프로세스들을 fork하여 실행합니다."""
+    backend_class = ENCODER_BACKENDS.get(config.ENCODER_BACKEND)
+    if backend_class is not None and backend_class.fork_safe:
+        print(f"워커들이 공유할 모델을 fork 전에 로드하는 중... (백엔드: {config.ENCODER_BACKEND})")
+        with startup_tracker.phase("model_load"):
+            app.state.preloaded_model = create_encoder_backend(config.ENCODER_BACKEND, config.MODEL_NAME)
+    else:
+        # fork 전에 만들면 안 되는 백엔드는 워커마다 로드
+        print(f"{config.ENCODER_BACKEND} 백엔드는 fork 전에 공유할 수 없어 워커마다 모델을 로드합니다.")
+    
+    PreforkServer(
+        app,
+        host=host,
+        port=port,
+        workers=config.WORKERS,
+        threads=config.WORKER_THREADS,
+        cpu_pinning=config.CPU_PINNING
+    ).run()
+
 if __name__ == "__main__":
     # 외부 접근을 위해 0.0.0.0으로 설정
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    if config.WORKERS > 1:
+        run_prefork(host="0.0.0.0", port=8000)
+    else:
+        uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
@@ -7,8 +7,15 @@ echo "FastAPI 서버를 시작합니다..."
 python main.py &
 FASTAPI_PID=$!
 
-# 잠시 대기
-sleep 3
+# 모델 로드와 워밍업이 끝날 때까지 대기 (준비되지 않은 워커로 트래픽이 가지 않도록)
+echo "FastAPI 서버 준비를 기다리는 중..."
+until curl -sf http://127.0.0.1:8000/ready > /dev/null; do
+    if ! kill -0 $FASTAPI_PID 2>/dev/null; then
+        echo "FastAPI 서버가 종료되었습니다."
+        exit 1
+    fi
+    sleep 1
+done
 
 # Nginx 시작
 echo "Nginx를 시작합니다..."
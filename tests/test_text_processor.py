@@ -0,0 +1,138 @@
+"""품사 태그 입력 파서(parse_input) 테스트
+
+단일 패스 파서가 기존 구현과 같은 결과를 내는지 확인합니다.
+기존 구현은 두 번째 패턴("동. A / 명. B")이 첫 번째 패턴이 이미 찾은 단어를 다시 추출했습니다.
+새 파서는 이 중복만 제거하므로, 기존 구현에서 두 번째 패턴을 뺀 결과와 정확히 같아야 합니다.
+"""
+import random
+import re
+
+import pytest
+
+from app.utils.text_processor import (
+    POS_MAPPING, check_incomplete_pos_input, extract_words_from_pos_input, parse_comma_separated_input,
+    parse_input, parse_pos_input
+)
+
+# ---- 기존 구현 (비교 기준, benchmarks/bench_pos_parser.py에서도 사용) ----
+
+def legacy_parse_pos_input(text: str, include_second_pattern: bool = True):
+    pos_info = {}
+    patterns = [
+        r'(\w+)\.\s*([^/\n]+)',
+        r'(\w+)\.\s*([^/\n]+)\s*/\s*(\w+)\.\s*([^/\n]+)',
+    ]
+    if not include_second_pattern:
+        patterns = patterns[:1]
+
+    for pattern in patterns:
+        for match in re.findall(pattern, text):
+            if len(match) == 2:
+                pos, words = match
+                pos = POS_MAPPING.get(pos, pos)
+                pos_info.setdefault(pos, []).extend(word.strip() for word in words.split(','))
+            elif len(match) == 4:
+                pos1, words1, pos2, words2 = match
+                pos1, pos2 = POS_MAPPING.get(pos1, pos1), POS_MAPPING.get(pos2, pos2)
+                pos_info.setdefault(pos1, [])
+                pos_info.setdefault(pos2, [])
+                pos_info[pos1].extend(word.strip() for word in words1.split(','))
+                pos_info[pos2].extend(word.strip() for word in words2.split(','))
+    return pos_info
+
+def legacy_extract_words(text: str, include_second_pattern: bool = True):
+    words = []
+    for pos_words in legacy_parse_pos_input(text, include_second_pattern).values():
+        words.extend(pos_words)
+    return words
+
+def legacy_check_incomplete(text: str):
+    for pattern in (r'^\w+\.\s*$', r'^\w+\.\s*/\s*$', r'^\w+\.\s*/\s*\w+\.\s*$'):
+        if re.match(pattern, text.strip()):
+            pos_tag = re.match(r'^(\w+)\.', text.strip()).group(1)
+            return {
+                "is_incomplete": True,
+                "pos_tag": pos_tag,
+                "message": f"품사 태그 '{pos_tag}.' 뒤에 단어를 입력해주세요."
+            }
+    return {"is_incomplete": False}
+
+def legacy_parse_request_side(text: str, include_second_pattern: bool = True):
+    """기존 SimilarityService가 입력 한쪽을 처리하던 방식 (파싱 3회 + 불완전 검사 패턴 3개)"""
+    incomplete = legacy_check_incomplete(text)
+    pos_info = legacy_parse_pos_input(text, include_second_pattern)
+    if not pos_info:
+        words = parse_comma_separated_input(text)
+    else:
+        words = legacy_extract_words(text, include_second_pattern)
+    return pos_info, words, incomplete
+
+# ---- 무작위 입력 생성 ----
+
+TAGS = ["동", "명", "형", "부", "감", "Noun", "Verb", "n", "v2", "_"]
+WORDS = ["사랑하다", "사랑", "좋아하다", "행복", "먹다", "음식", "apple", "3", "학구열적인", "뛰다"]
+SEPARATORS = [".", ". ", " . ", "/", " / ", ",", ", ", "\n", " ", "", "..", "./"]
+
+def random_input(rng: random.Random) -> str:
+    parts = []
+    for _ in range(rng.randint(0, 8)):
+        kind = rng.random()
+        if kind < 0.35:
+            parts.append(rng.choice(TAGS))
+        elif kind < 0.7:
+            parts.append(rng.choice(WORDS))
+        else:
+            parts.append(rng.choice(SEPARATORS))
+    text = "".join(parts)
+    if rng.random() < 0.1:
+        text = f"  {text}  "
+    return text
+
+def structured_input(rng: random.Random) -> str:
+    groups = []
+    for _ in range(rng.randint(1, 4)):
+        words = ", ".join(rng.choice(WORDS) for _ in range(rng.randint(0, 3)))
+        groups.append(f"{rng.choice(TAGS)}.{rng.choice(['', ' '])}{words}")
+    return rng.choice(["/", " / ", "\n"]).join(groups)
+
+# ---- 테스트 ----
+
+FIXED_CASES = [
+    "동. 사랑하다 / 명. 사랑", "동.", "동. /", "동. / 명.", "동 .", "사랑, 행복", "", "동. 먹다\n명. 음식",
+    "  사랑 ,  행복  ", "명. 사랑, 행복, / 동. 사랑하다", "Noun. apple/Verb. 3"
+]
+
+def _expected(text: str):
+    return legacy_parse_request_side(text, include_second_pattern=False)
+
+@pytest.mark.parametrize("text", FIXED_CASES)
+def test_parse_input_matches_legacy(text):
+    parsed = parse_input(text)
+    assert (parsed.pos_info, parsed.words, parsed.incomplete) == _expected(text)
+
+@pytest.mark.parametrize("make_input", [random_input, structured_input])
+def test_parse_input_matches_legacy_on_random_inputs(make_input):
+    rng = random.Random(0)
+    for _ in range(5000):
+        text = make_input(rng)
+        parsed = parse_input(text)
+        assert (parsed.pos_info, parsed.words, parsed.incomplete) == _expected(text), text
+
+def test_parse_input_drops_legacy_duplicates():
+    text = "동. 사랑하다 / 명. 사랑"
+    assert legacy_parse_request_side(text)[1] == ["사랑하다", "사랑하다", "사랑", "사랑"]
+    assert parse_input(text).words == ["사랑하다", "사랑"]
+    assert parse_input(text).pos_info == {"동": ["사랑하다"], "명": ["사랑"]}
+
+@pytest.mark.parametrize("text", ["동.", " 동. ", "동. /", "동. / 명."])
+def test_incomplete_pos_input(text):
+    incomplete = parse_input(text).incomplete
+    assert incomplete["is_incomplete"]
+    assert incomplete["pos_tag"] == "동"
+
+def test_wrappers_use_single_pass_parser():
+    text = "동. 먹다, 마시다 / 명. 음식"
+    parsed = parse_input(text)
+    assert parse_pos_input(text) == parsed.pos_info
+    assert extract_words_from_pos_input(text) == parsed.words
+    assert check_incomplete_pos_input(text) == parsed.incomplete